@@ -0,0 +1,103 @@
+"""
+Benchmark: Clients tab list loading, full SELECT vs. the paged ClientListModel.
+
+Builds a synthetic client table (default 100k clients), then times what the tab does on
+startup / "clear search", while scrolling, and when a column header is clicked.
+(Treeview insert cost is not measured here; the old path also inserted every row.)
+
+Usage (from the repo root):
+    python -m benchmarks.bench_client_list
+    python -m benchmarks.bench_client_list --clients 20000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_client_search import build_clients
+from class_elements.client_list_model import ClientListModel
+from class_elements.database import run_migrations
+
+
+VISIBLE_ROWS = 20
+
+
+def time_ms(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Clients tab list loading.")
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        print(f"Building {args.clients:,} synthetic clients...")
+        conn = build_clients(db_path, args.clients)
+        run_migrations(conn)
+
+        def full_load():
+            conn.execute(
+                "SELECT id, full_name, gender, birthdate, primary_phone, email, address1 || ' ' || address2 FROM clients"
+            ).fetchall()
+
+        def full_load_sorted():
+            rows = conn.execute(
+                "SELECT id, full_name, gender, birthdate, primary_phone, email, address1 || ' ' || address2 FROM clients"
+            ).fetchall()
+            rows.sort(key=lambda row: row[1].lower())
+
+        model = ClientListModel(db_path)
+
+        def first_window():
+            model.reset()
+            model.get_rows(0, VISIBLE_ROWS)
+
+        def first_window_sorted():
+            model.reset(sort_column="Name")
+            model.get_rows(0, VISIBLE_ROWS)
+
+        def scroll_through(sort_column):
+            """Scroll row by row through the first 5,000 rows; returns the median ms per step."""
+            model.reset(sort_column=sort_column)
+            timings = []
+            for offset in range(5_000):
+                start = time.perf_counter()
+                model.get_rows(offset, VISIBLE_ROWS)
+                timings.append((time.perf_counter() - start) * 1000)
+            return statistics.median(timings), max(timings)
+
+        def jump_to_middle():
+            model.reset(sort_column="Name")
+            model.get_rows(args.clients // 2, VISIBLE_ROWS)
+
+        print()
+        print(f"{'Case':<52}{'Median (ms)':>14}")
+        print("-" * 66)
+        print(f"{'Load all clients (old)':<52}{time_ms(full_load, args.repeats):>14.3f}")
+        print(f"{'Load all + sort by Name in Python (old)':<52}{time_ms(full_load_sorted, args.repeats):>14.3f}")
+        print(f"{'First window, id order (paged)':<52}{time_ms(first_window, args.repeats):>14.3f}")
+        print(f"{'First window, sorted by Name (paged)':<52}{time_ms(first_window_sorted, args.repeats):>14.3f}")
+        print(f"{'Jump to middle, sorted by Name (paged)':<52}{time_ms(jump_to_middle, args.repeats):>14.3f}")
+
+        for sort_column in (None, "Name", "Gender"):
+            median_ms, max_ms = scroll_through(sort_column)
+            label = f"Scroll 1 row, {sort_column or 'id'} order (paged, max {max_ms:.2f})"
+            print(f"{label:<52}{median_ms:>14.3f}")
+
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
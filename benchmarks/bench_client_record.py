@@ -0,0 +1,107 @@
+"""
+Benchmark: loading everything the tabs show for a selected client.
+
+Compares the old per-tab queries (profile card, Info x2, Appointments + notes, Photos,
+Prescriptions, alert lookup: 8 queries in 7 connection blocks) with one fetch_client_record()
+read transaction, and with a ClientDataLoader cache hit (revisiting a recently viewed client).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_client_record
+    python -m benchmarks.bench_client_record --clients 50000 --photos 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_db_indexes import build_synthetic_db
+from class_elements.client_data_loader import ClientDataLoader
+from class_elements.database import get_connection, run_migrations, fetch_client_record, close_all_pools
+
+
+PER_TAB_QUERIES = [
+    "SELECT c.full_name, c.profile_picture, COALESCE(ci.zoom, 100), COALESCE(ci.shift, 0) "
+    "FROM clients c LEFT JOIN client_images ci ON c.id = ci.client_id WHERE c.id = ?",
+    "SELECT full_name, gender, birthdate, address1, address2, city, state, zip, primary_phone, secondary_phone, email, referred_by "
+    "FROM clients WHERE id = ?",
+    "SELECT allergies, health_conditions, health_risks, medications, treatment_areas, current_products, skin_conditions, other_notes, desired_improvement "
+    "FROM client_health_info WHERE client_id = ?",
+    "SELECT id, date, type, treatment, price, photos_taken, treatment_notes FROM appointments WHERE client_id = ? ORDER BY date DESC",
+    "SELECT date, treatment, treatment_notes FROM appointments "
+    "WHERE client_id = ? AND treatment_notes IS NOT NULL AND treatment_notes != '' ORDER BY date DESC",
+    "SELECT id, appt_date, type, file_path FROM photos WHERE client_id = ? ORDER BY appt_date DESC",
+    "SELECT id, form_type, file_path, start_date FROM prescriptions WHERE client_id = ? ORDER BY start_date DESC",
+    "SELECT full_name, primary_phone FROM clients WHERE id = ?",
+]
+
+
+def load_per_tab(db_path, client_id):
+    """The old fan-out: Info ran its two queries in one block, every other query in its own."""
+    with get_connection(db_path) as conn:
+        conn.execute(PER_TAB_QUERIES[0], (client_id,)).fetchall()
+    with get_connection(db_path) as conn:
+        conn.execute(PER_TAB_QUERIES[1], (client_id,)).fetchall()
+        conn.execute(PER_TAB_QUERIES[2], (client_id,)).fetchall()
+    for sql in PER_TAB_QUERIES[3:]:
+        with get_connection(db_path) as conn:
+            conn.execute(sql, (client_id,)).fetchall()
+
+
+def load_record(db_path, client_id):
+    with get_connection(db_path) as conn:
+        fetch_client_record(conn, client_id)
+
+
+def median_ms(func, client_ids):
+    timings = []
+    for client_id in client_ids:
+        start = time.perf_counter()
+        func(client_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client selection loading.")
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--photos", type=int, default=200_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        print(f"Building synthetic database: {args.clients:,} clients / {args.photos:,} photos...")
+        build_synthetic_db(db_path, args.clients, args.photos)
+        conn = sqlite3.connect(db_path)
+        run_migrations(conn)
+        conn.close()
+
+        rng = random.Random(7)
+        client_ids = [rng.randint(1, args.clients) for _ in range(args.iterations)]
+
+        loader = ClientDataLoader(None, db_path, max_clients=len(client_ids))  # No widget: only fetch() is used
+        for client_id in client_ids:
+            loader.fetch(client_id)  # Warm the cache (the "recently viewed" case)
+
+        results = {
+            "Per-tab queries (8 queries, 7 blocks)": median_ms(lambda cid: load_per_tab(db_path, cid), client_ids),
+            "fetch_client_record (1 transaction)": median_ms(lambda cid: load_record(db_path, cid), client_ids),
+            "ClientDataLoader.fetch, cached": median_ms(loader.fetch, client_ids),
+        }
+        close_all_pools()
+
+    print()
+    print(f"{'Case':<42}{'Median (ms/client)':>20}")
+    print("-" * 62)
+    for name, ms in results.items():
+        print(f"{name:<42}{ms:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
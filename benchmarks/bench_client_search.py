@@ -0,0 +1,121 @@
+"""
+Benchmark: client type-ahead search, LIKE '%q%' scan vs. the ranked clients_fts prefix index.
+
+Builds a synthetic client table (default 100k clients), runs the migrations, then times
+each keystroke of a few typed queries through the old LIKE queries, search_clients() (name
+pickers) and ClientListModel (Clients tab: match count + first visible window, ranked).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_client_search
+    python -m benchmarks.bench_client_search --clients 20000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from class_elements.client_list_model import ClientListModel
+from class_elements.database import create_tables, run_migrations, search_clients
+
+
+FIRST_NAMES = ["Amelia", "Olivia", "Emma", "Ava", "Sophia", "Isabella", "Mia", "Harper", "Evelyn", "Abigail",
+               "Emily", "Ella", "Elizabeth", "Camila", "Luna", "Sofia", "Avery", "Mila", "Aria", "Scarlett",
+               "James", "Liam", "Noah", "William", "Benjamin", "Lucas", "Henry", "Alexander", "Brian", "Daniel"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+              "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson"]
+STREETS = ["Main St.", "Oak Ave.", "Pine Rd.", "Maple Dr.", "Cedar Ln.", "Elm St.", "Sonoma Ave.", "Mendocino Ave."]
+
+TYPED_QUERIES = ["amelia", "rodriguez", "emma lee", "707-55", "oak ave"]
+VISIBLE_ROWS = 30           # Clients tab rows on screen
+
+
+def build_clients(db_path, num_clients, seed=42):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous=OFF;")
+    create_tables(conn.cursor())
+
+    rows = []
+    for i in range(1, num_clients + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        rows.append((
+            i, f"{first} {last}", f"707-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            f"{first.lower()}.{last.lower()}{i}@example.com", f"{rng.randint(1, 9999)} {rng.choice(STREETS)}", "", "Santa Rosa"
+        ))
+    conn.executemany(
+        "INSERT INTO clients (id, full_name, primary_phone, email, address1, address2, city) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    return conn
+
+
+def time_keystrokes(run_query, queries, repeats):
+    """Median / max milliseconds per keystroke over every prefix of every query."""
+    timings = []
+    for query in queries:
+        for end in range(1, len(query) + 1):
+            prefix = query[:end]
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run_query(prefix)
+                timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark client type-ahead search.")
+    parser.add_argument("--clients", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        print(f"Building {args.clients:,} synthetic clients...")
+        conn = build_clients(db_path, args.clients)
+        run_migrations(conn)
+
+        def like_suggestions(q):
+            conn.execute("SELECT full_name FROM clients WHERE full_name LIKE ? LIMIT 10", (f"%{q}%",)).fetchall()
+
+        def fts_suggestions(q):
+            search_clients(conn, q, fields="c.full_name", name_only=True, limit=10)
+
+        def like_full_search(q):
+            conn.execute("""
+                SELECT id, full_name, gender, birthdate, primary_phone, email, address1 || ' ' || address2
+                FROM clients WHERE full_name LIKE ?
+            """, (f"%{q}%",)).fetchall()
+
+        model = ClientListModel(db_path)
+
+        def fts_window_search(q):
+            model.reset(q)
+            model.get_rows(0, VISIBLE_ROWS)
+
+        cases = [
+            ("Name suggestions (LIMIT 10), LIKE", like_suggestions),
+            ("Name suggestions (LIMIT 10), FTS5 ranked", fts_suggestions),
+            ("Clients tab search (all rows), LIKE", like_full_search),
+            ("Clients tab search (window), FTS5 ranked", fts_window_search),
+        ]
+
+        print()
+        print(f"{'Case':<42}{'Median (ms)':>14}{'Max (ms)':>12}")
+        print("-" * 68)
+        for name, run_query in cases:
+            median_ms, max_ms = time_keystrokes(run_query, TYPED_QUERIES, args.repeats)
+            print(f"{name:<42}{median_ms:>14.3f}{max_ms:>12.3f}")
+
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: per-client query time before and after the schema migrations (indexes).
+
+Builds a synthetic database (default 50k clients / 1M photos), times the queries the
+tabs run on every client click, applies run_migrations(), and times them again.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_db_indexes
+    python -m benchmarks.bench_db_indexes --clients 5000 --photos 100000 --keep bench.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from class_elements.database import create_tables, run_migrations, get_schema_version
+
+
+def build_synthetic_db(db_path, num_clients, num_photos, seed=42):
+    """Populate an un-migrated (version 0) database with synthetic rows."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=OFF;")
+    create_tables(conn.cursor())
+
+    def random_date():
+        return f"{rng.randint(1, 12):02}/{rng.randint(1, 28):02}/{rng.randint(2018, 2025)}"
+
+    conn.executemany(
+        "INSERT INTO clients (id, full_name, gender, primary_phone, email, address1, address2) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((i, f"Client {i}", "Female", f"555-{i:07}", f"client{i}@example.com", f"{i} Main St.", "") for i in range(1, num_clients + 1))
+    )
+
+    appointments_per_client = 4
+    conn.executemany(
+        "INSERT INTO appointments (id, client_id, date, type, treatment, price) VALUES (?, ?, ?, ?, ?, ?)",
+        ((i, (i - 1) // appointments_per_client + 1, random_date(), "Facial", "Peel", "$100.00")
+         for i in range(1, num_clients * appointments_per_client + 1))
+    )
+
+    num_appointments = num_clients * appointments_per_client
+    conn.executemany(
+        "INSERT INTO photos (client_id, appointment_id, appt_date, file_path, type) VALUES (?, ?, ?, ?, ?)",
+        ((rng.randint(1, num_clients), rng.randint(1, num_appointments), random_date(), f"/photos/{i}.jpg", "Facial")
+         for i in range(1, num_photos + 1))
+    )
+
+    conn.executemany(
+        "INSERT INTO prescriptions (client_id, start_date, form_type, file_path, data_json) VALUES (?, ?, ?, ?, ?)",
+        ((rng.randint(1, num_clients), random_date(), "2-column", f"/rx/{i}.pdf", "{}") for i in range(num_clients))
+    )
+
+    conn.executemany(
+        "INSERT INTO alerts (client_id, deadline, notes) VALUES (?, ?, ?)",
+        ((rng.randint(1, num_clients), random_date(), "Follow up") for _ in range(num_clients // 10))
+    )
+
+    conn.commit()
+    conn.close()
+
+
+def benchmark_queries(conn, num_clients, num_photos, iterations, seed=7):
+    """Return {query_name: median_ms} for the hot per-click queries."""
+    rng = random.Random(seed)
+    client_ids = [rng.randint(1, num_clients) for _ in range(iterations)]
+    photo_paths = [f"/photos/{rng.randint(1, num_photos)}.jpg" for _ in range(iterations)]
+
+    queries = {
+        "photos by client ORDER BY appt_date": (
+            "SELECT id, appt_date, type, file_path FROM photos WHERE client_id = ? ORDER BY appt_date DESC",
+            [(cid,) for cid in client_ids],
+        ),
+        "appointments by client": (
+            "SELECT id, date, type, treatment, price, photos_taken, treatment_notes FROM appointments WHERE client_id = ? ORDER BY date DESC",
+            [(cid,) for cid in client_ids],
+        ),
+        "prescriptions by client": (
+            "SELECT id, form_type, file_path, start_date FROM prescriptions WHERE client_id = ? ORDER BY start_date DESC",
+            [(cid,) for cid in client_ids],
+        ),
+        "photo by file_path": (
+            "SELECT appt_date, description FROM photos WHERE file_path = ?",
+            [(path,) for path in photo_paths],
+        ),
+        "alerts ORDER BY deadline": (
+            "SELECT a.id, a.client_id, c.full_name, c.primary_phone, a.deadline, a.notes "
+            "FROM alerts a JOIN clients c ON a.client_id = c.id ORDER BY a.deadline ASC",
+            [()] * max(1, iterations // 10),
+        ),
+    }
+
+    results = {}
+    for name, (sql, params_list) in queries.items():
+        timings = []
+        for params in params_list:
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SkinPro queries before/after index migrations.")
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--photos", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--keep", metavar="DB_PATH", help="Write the synthetic database here and keep it")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.keep:
+        db_path = args.keep
+        if os.path.exists(db_path):
+            os.remove(db_path)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, "bench.db")
+
+    print(f"Building synthetic database: {args.clients:,} clients / {args.photos:,} photos...")
+    start = time.perf_counter()
+    build_synthetic_db(db_path, args.clients, args.photos)
+    print(f"Built in {time.perf_counter() - start:.1f}s")
+
+    conn = sqlite3.connect(db_path)
+    print(f"Schema version before: {get_schema_version(conn)}")
+    before = benchmark_queries(conn, args.clients, args.photos, args.iterations)
+
+    start = time.perf_counter()
+    run_migrations(conn)
+    print(f"Migrations applied in {time.perf_counter() - start:.1f}s (schema version {get_schema_version(conn)})")
+    after = benchmark_queries(conn, args.clients, args.photos, args.iterations)
+    conn.close()
+
+    print()
+    print(f"{'Query':<40}{'Before (ms)':>14}{'After (ms)':>14}{'Speedup':>10}")
+    print("-" * 78)
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<40}{before[name]:>14.3f}{after[name]:>14.3f}{speedup:>9.0f}x")
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: full decode vs. reduced (JPEG draft + reduce) decode for thumbnails and display images.
+
+Runs each case over a folder of 12MP JPEGs (4032x3024, synthesized unless --folder is given)
+in a fresh process, and reports the median time per image and the peak RSS above the
+process baseline (Linux/macOS; RSS is "n/a" where the `resource` module is missing).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_image_decode
+    python -m benchmarks.bench_image_decode --folder "D:/SkinProData/images/Jane_Doe_id_12" --images 20
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+from utils.image_utils import make_square_thumbnail, make_display_image
+
+
+def full_decode_thumbnail(file_path, size=(100, 100)):
+    """The pre-draft thumbnail path: full decode, crop, single LANCZOS resize."""
+    with Image.open(file_path) as img:
+        img = img.convert("RGB")
+    width, height = img.size
+    min_side = min(width, height)
+    left, top = (width - min_side) / 2, (height - min_side) / 2
+    return img.crop((left, top, left + min_side, top + min_side)).resize(size, Image.LANCZOS)
+
+
+def full_decode_display(file_path, box=(300, 400)):
+    """The pre-draft display path: full decode, single LANCZOS resize to fit."""
+    with Image.open(file_path) as img:
+        img = img.convert("RGB")
+    fit = min(box[0] / img.width, box[1] / img.height)
+    return img.resize((int(img.width * fit), int(img.height * fit)), Image.LANCZOS)
+
+
+CASES = {
+    "Thumbnail 100x100, full decode": full_decode_thumbnail,
+    "Thumbnail 100x100, reduced decode": make_square_thumbnail,
+    "Display 300x400, full decode": full_decode_display,
+    "Display 300x400, reduced decode": make_display_image,
+}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def run_case(case_name, paths, results):
+    """Child process: decode every image with one case, report median ms and peak RSS growth."""
+    func = CASES[case_name]
+    baseline = peak_rss_mb()  # Before any decode: a warm-up image would already set the peak
+
+    timings = []
+    for path in paths:
+        start = time.perf_counter()
+        func(path)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    peak = peak_rss_mb()
+    results.put((statistics.median(timings), None if peak is None else peak - baseline))
+
+
+def write_test_images(folder, count, size=(4032, 3024)):
+    base = Image.effect_noise(size, 48).convert("RGB")
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"test_{i:03}.jpg")
+        Image.merge("RGB", [base.point(lambda v, s=shift: (v + s) % 256) for shift in (i * 7, i * 13, i * 29)]).save(path, "JPEG", quality=92)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-scale image decoding.")
+    parser.add_argument("--folder", help="Folder of JPEGs to use instead of synthetic 12MP images")
+    parser.add_argument("--images", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.folder:
+            paths = sorted(glob.glob(os.path.join(args.folder, "*.jp*g")))[:args.images]
+        else:
+            print(f"Writing {args.images} synthetic 12MP JPEGs...")
+            paths = write_test_images(tmp_dir, args.images)
+
+        if not paths:
+            print("No JPEGs found.")
+            return
+
+        print()
+        print(f"{'Case':<40}{'Median (ms/image)':>20}{'Peak RSS (+MB)':>16}")
+        print("-" * 76)
+        for case_name in CASES:
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_case, args=(case_name, paths, results))
+            process.start()
+            median_ms, rss_mb = results.get()
+            process.join()
+            rss = "n/a" if rss_mb is None else f"{rss_mb:.1f}"
+            print(f"{case_name:<40}{median_ms:>20.1f}{rss:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Benchmark: prescription PDF table layout with the old per-generator draw_product_block
+(regex tokenising and a stringWidth() call per appended word, run as a dry-run pass and
+then again as a draw pass) vs. the shared pdf_layout engine (tokenise once, memoised glyph
+widths, one layout reused for measuring and drawing).
+
+Builds N synthetic prescriptions (random 2/3/4-column forms, catalog products, directions
+with [[highlight]] markup) and reports the total and per-prescription time of the table
+blocks alone, then the full Pdf2/3/4ColGenerator.generate() run writing every PDF, with the
+static page furniture drawn directly and as a compiled template (form XObject), and the
+average output size of each.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_prescription_pdf
+    python -m benchmarks.bench_prescription_pdf --prescriptions 200 --skip-generate
+"""
+import argparse
+import io
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from class_elements.pdf_generators.pdf_2col import Pdf2ColGenerator
+from class_elements.pdf_generators.pdf_3col import Pdf3ColGenerator
+from class_elements.pdf_generators.pdf_4col import Pdf4ColGenerator
+from class_elements.pdf_generators.pdf_layout import layout_product_block
+from class_elements.products import PRODUCT_CATALOG
+
+
+GENERATORS = {2: Pdf2ColGenerator, 3: Pdf3ColGenerator, 4: Pdf4ColGenerator}
+WRAP_WIDTHS = {2: 241.0, 3: 154.0, 4: 110.5}    # wrap_width each generator computes for letter paper
+
+PHRASES = [
+    "Apply a pea-sized amount to clean, dry skin",
+    "massage gently in upward circular motions",
+    "avoid the eye area",
+    "use every morning after cleansing",
+    "follow with SPF 30 or higher",
+    "rinse thoroughly with lukewarm water",
+    "start every other night and increase as tolerated",
+    "pat dry, do not rub",
+    "discontinue if irritation persists",
+    "layer under moisturizer",
+]
+
+
+def legacy_draw_product_block(c, x, y, product, directions, max_width, font_size=10, line_height=12, dry_run=False):
+    """The block function each generator used to define inline (unchanged apart from the name)."""
+    c.setFont("Helvetica", font_size)
+    lines_above = 0
+    chunks_per_line = []
+
+    tokens = re.split(r"(\[\[highlight\]\]|\[\[/highlight\]\])", directions)
+    is_highlight = False
+    chunks = []
+
+    for token in tokens:
+        if token == "[[highlight]]":
+            is_highlight = True
+        elif token == "[[/highlight]]":
+            is_highlight = False
+        elif token:
+            chunks.append((token, is_highlight))
+
+    current_line = ""
+    current_chunks = []
+
+    for text, hl in chunks:
+        parts = re.split(r"(\n)", text)
+        for part in parts:
+            if part == "\n":
+                if current_chunks:
+                    chunks_per_line.append(current_chunks)
+                    current_chunks = []
+                    current_line = ""
+            elif part:
+                sub_parts = re.split(r"(\s+)", part)
+                for sub in sub_parts:
+                    trial = current_line + sub
+                    if c.stringWidth(trial.strip(), "Helvetica", font_size) <= max_width:
+                        current_line += sub
+                        current_chunks.append((sub, hl))
+                    else:
+                        if current_chunks:
+                            chunks_per_line.append(current_chunks)
+                        current_line = sub
+                        current_chunks = [(sub, hl)]
+
+    if current_chunks:
+        chunks_per_line.append(current_chunks)
+
+    if not dry_run:
+        if product.strip():
+            product_text = f"{product.strip()}:"
+            product_width = c.stringWidth(product_text, "Helvetica", font_size)
+            c.drawString(x, y, product_text)
+            c.setLineWidth(0.6)
+            c.line(x, y - 2, x + product_width, y - 2)
+            lines_above = 1
+
+        for idx, chunk_line in enumerate(chunks_per_line):
+            line_y = y - ((idx + lines_above) * line_height)
+            draw_x = x
+
+            for text, hl in chunk_line:
+                if hl:
+                    c.saveState()
+                    c.setFillAlpha(0.6)
+                    c.setFillColorRGB(1, 1, 0)
+                    text_width = c.stringWidth(text, "Helvetica", font_size)
+                    c.rect(draw_x - 1, line_y - 3, text_width + 1, line_height, fill=True, stroke=0)
+                    c.restoreState()
+                c.drawString(draw_x, line_y, text)
+                draw_x += c.stringWidth(text, "Helvetica", font_size)
+
+    return lines_above + len(chunks_per_line)
+
+
+class BenchDataManager:
+    """Just enough of DataManager for the generators: get_path() under a temp folder."""
+    def __init__(self, root):
+        self.root = root
+
+    def get_path(self, name):
+        return os.path.join(self.root, name)
+
+
+def make_directions(rng):
+    sentences = []
+    for _ in range(rng.randint(1, 4)):
+        words = " ".join(rng.sample(PHRASES, rng.randint(1, 3))).split(" ")
+        if rng.random() < 0.5:
+            start = rng.randrange(len(words))
+            end = min(len(words), start + rng.randint(1, 4))
+            words[start] = "[[highlight]]" + words[start]
+            words[end - 1] += "[[/highlight]]"
+        sentences.append(" ".join(words).capitalize() + ".")
+    return ("\n" if rng.random() < 0.3 else " ").join(sentences)
+
+
+def make_prescriptions(count, seed=21):
+    rng = random.Random(seed)
+    prescriptions = []
+    for i in range(count):
+        columns = rng.choice(list(GENERATORS))
+        steps = rng.randint(3, 8)
+        steps_dict = {}
+        for col in range(1, columns + 1):
+            steps_dict[f"Col{col}_Header"] = rng.choice(["Morning", "Evening", "Week 1", "Week 2"])
+            steps_dict[f"Col{col}"] = [
+                {"product": rng.choice(PRODUCT_CATALOG).name, "directions": make_directions(rng)}
+                for _ in range(steps)
+            ]
+        prescriptions.append((i + 1, f"Client {i + 1}", f"01/{i % 28 + 1:02}/2026", columns, steps_dict))
+    return prescriptions
+
+
+def table_blocks(steps_dict, columns):
+    for col in range(1, columns + 1):
+        for step in steps_dict[f"Col{col}"]:
+            yield step["product"], step["directions"]
+
+
+def run_legacy(prescriptions):
+    """Dry-run pass for the row heights, then the draw pass, as the generators used to."""
+    timings = []
+    for _, _, _, columns, steps_dict in prescriptions:
+        c = canvas.Canvas(io.BytesIO(), pagesize=letter)
+        start = time.perf_counter()
+        blocks = list(table_blocks(steps_dict, columns))
+        for product, directions in blocks:
+            legacy_draw_product_block(c, 80, 500, product, directions, WRAP_WIDTHS[columns], dry_run=True)
+        for product, directions in blocks:
+            legacy_draw_product_block(c, 80, 500, product, directions, WRAP_WIDTHS[columns])
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_shared(prescriptions):
+    """One layout per block: line_count for the row heights, draw() for the page."""
+    timings = []
+    for _, _, _, columns, steps_dict in prescriptions:
+        c = canvas.Canvas(io.BytesIO(), pagesize=letter)
+        start = time.perf_counter()
+        layouts = [layout_product_block(product, directions, WRAP_WIDTHS[columns])
+                   for product, directions in table_blocks(steps_dict, columns)]
+        max(layout.line_count for layout in layouts)
+        for layout in layouts:
+            layout.draw(c, 80, 500)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def check_same_wrapping(prescriptions):
+    """The shared engine must break lines exactly where the old function did."""
+    c = canvas.Canvas(io.BytesIO(), pagesize=letter)
+    mismatches = 0
+    for _, _, _, columns, steps_dict in prescriptions:
+        for product, directions in table_blocks(steps_dict, columns):
+            old = legacy_draw_product_block(c, 0, 0, product, directions, WRAP_WIDTHS[columns], dry_run=True)
+            if old != layout_product_block(product, directions, WRAP_WIDTHS[columns]).line_count:
+                mismatches += 1
+    return mismatches
+
+
+def run_generate(prescriptions, output_root, compiled_template):
+    data_manager = BenchDataManager(output_root)
+    generators = {columns: cls(data_manager, compiled_template=compiled_template) for columns, cls in GENERATORS.items()}
+    timings = []
+    for client_id, client_name, start_date, columns, steps_dict in prescriptions:
+        start = time.perf_counter()
+        generators[columns].generate(client_id, client_name, start_date, steps_dict)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def average_pdf_kb(folder):
+    sizes = [os.path.getsize(os.path.join(root, name))
+             for root, _, names in os.walk(folder) for name in names if name.endswith(".pdf")]
+    return sum(sizes) / len(sizes) / 1024 if sizes else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prescription PDF layout.")
+    parser.add_argument("--prescriptions", type=int, default=1000)
+    parser.add_argument("--skip-generate", action="store_true", help="Only time the table layout, don't write PDFs")
+    args = parser.parse_args()
+
+    prescriptions = make_prescriptions(args.prescriptions)
+    blocks = sum(sum(1 for _ in table_blocks(steps, columns)) for _, _, _, columns, steps in prescriptions)
+    print(f"{len(prescriptions)} prescriptions, {blocks} product blocks")
+
+    mismatches = check_same_wrapping(prescriptions)
+    print(f"Line count mismatches vs. old wrapping: {mismatches}")
+
+    cases = [
+        ("Table blocks, old dry run + draw", lambda: run_legacy(prescriptions)),
+        ("Table blocks, shared layout", lambda: run_shared(prescriptions)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if not args.skip_generate:
+            direct_dir, compiled_dir = os.path.join(tmp_dir, "direct"), os.path.join(tmp_dir, "compiled")
+            cases.append(("generate(), furniture drawn", lambda: run_generate(prescriptions, direct_dir, False), direct_dir))
+            cases.append(("generate(), compiled template", lambda: run_generate(prescriptions, compiled_dir, True), compiled_dir))
+
+        print()
+        print(f"{'Case':<36}{'Total (s)':>12}{'Median (ms/rx)':>18}{'Avg PDF (KB)':>16}")
+        print("-" * 82)
+        for name, run, *output_dir in cases:
+            timings = run()
+            size_kb = average_pdf_kb(output_dir[0]) if output_dir else None
+            size = "" if size_kb is None else f"{size_kb:.1f}"
+            print(f"{name:<36}{sum(timings) / 1000:>12.2f}{statistics.median(timings):>18.2f}{size:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: Photos tab thumbnail generation, one worker thread vs. the ThumbnailPipeline pool.
+
+Writes a folder of synthetic camera-sized JPEGs (default 60 x 4032x3024), then times
+thumbnail generation over all of them serially (the old ImageLoaderThread) and across
+THUMBNAIL_WORKERS threads (make_square_thumbnail decode/resize only; PhotoImage creation needs a Tk root).
+
+Usage (from the repo root):
+    python -m benchmarks.bench_thumbnails
+    python -m benchmarks.bench_thumbnails --photos 300 --width 2000 --height 1500
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image, ImageFilter
+from class_elements.thumbnail_pipeline import THUMBNAIL_WORKERS
+from utils.image_utils import make_square_thumbnail
+
+
+def write_photos(folder, count, size, seed=42):
+    """Write `count` noisy JPEGs (noise keeps decode cost realistic) and return their paths."""
+    rng = random.Random(seed)
+    base = Image.effect_noise(size, 64).convert("RGB").filter(ImageFilter.GaussianBlur(2))
+    paths = []
+    for i in range(count):
+        tint = Image.new("RGB", size, (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+        path = os.path.join(folder, f"photo_{i:04}.jpg")
+        Image.blend(base, tint, 0.3).save(path, "JPEG", quality=90)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thumbnail generation.")
+    parser.add_argument("--photos", type=int, default=60)
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--workers", type=int, default=THUMBNAIL_WORKERS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"Writing {args.photos} synthetic {args.width}x{args.height} JPEGs...")
+        paths = write_photos(tmp_dir, args.photos, (args.width, args.height))
+
+        start = time.perf_counter()
+        for path in paths:
+            make_square_thumbnail(path)
+        serial_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(make_square_thumbnail, paths))
+        pooled_s = time.perf_counter() - start
+
+    print()
+    print(f"{'Case':<40}{'Total (s)':>12}{'Per photo (ms)':>16}")
+    print("-" * 68)
+    print(f"{'1 worker (old ImageLoaderThread)':<40}{serial_s:>12.2f}{serial_s / args.photos * 1000:>16.1f}")
+    print(f"{f'{args.workers} workers (ThumbnailPipeline)':<40}{pooled_s:>12.2f}{pooled_s / args.photos * 1000:>16.1f}")
+    print(f"Speedup: {serial_s / pooled_s:.1f}x on {os.cpu_count()} CPUs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,112 @@
+import collections
+import statistics
 import threading
-from PIL import Image
+import time
+from class_elements.pdf_preview_cache import PDF_PREVIEW_WIDTH, render_pdf_preview
+
+
+RENDER_TIMINGS_KEPT = 50    # Recent render durations kept for stats()
+
 
 class PdfRenderWorker:
-    def __init__(self, callback):
-        self.callback = callback  # Function to call with rendered image
+    """
+    One persistent thread rendering PDF previews, fed through a one-slot "latest request wins"
+    mailbox: a new render_async() replaces a request that hasn't started yet, so arrowing through
+    the prescription list only renders where the selection lands. A render already running can't
+    be interrupted (poppler); its result is dropped if a newer request came in meanwhile.
+
+    Every request gets an id, passed to callback(image, request_id) from the worker thread.
+    The UI checks is_current(request_id) on the Tk thread before showing a result, since a newer
+    request may have been made after the result was posted.
+    """
+    def __init__(self, callback, preview_cache=None):
+        self.callback = callback  # Function to call with (rendered image, request id)
+        self.preview_cache = preview_cache  # Optional PdfPreviewCache (memory + stored previews)
         self.thread = None
 
-    def render_async(self, pdf_path, display_width=650):
-        if self.thread and self.thread.is_alive():
-            return  # Avoid overlapping renders
+        self._condition = threading.Condition()
+        self._request = None                # (request_id, pdf_path, display_width) waiting to start
+        self._latest_id = 0
 
-        def task():
-            try:
-                from pdf2image import convert_from_path
-                pages = convert_from_path(pdf_path, dpi=150, first_page=1, last_page=1)
+        # Instrumentation (see stats())
+        self.render_times_ms = collections.deque(maxlen=RENDER_TIMINGS_KEPT)
+        self.completed = 0
+        self.skipped = 0                    # Replaced in the mailbox before they started
+        self.discarded = 0                  # Rendered, but a newer request had come in
 
-                if not pages:
-                    print("No pages found in PDF.")
-                    return
 
-                image = pages[0]
-                aspect_ratio = image.height / image.width
-                display_height = int(display_width * aspect_ratio)
-                resized = image.resize((display_width, display_height), Image.LANCZOS)
+    def render_async(self, pdf_path, display_width=PDF_PREVIEW_WIDTH):
+        """Request a render (replacing any request not started yet). Returns the request id."""
+        with self._condition:
+            self._latest_id += 1
+            if self._request is not None:
+                self.skipped += 1
+            self._request = (self._latest_id, pdf_path, display_width)
+            self._condition.notify()
 
-                # Pass to UI callback
-                self.callback(resized)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._work, daemon=True, name="PdfRenderWorker")
+                self.thread.start()
+            return self._latest_id
+
+
+    def cancel_pending(self):
+        """Supersede every earlier request (e.g. the preview was shown from memory). Returns the new latest id."""
+        with self._condition:
+            self._latest_id += 1
+            if self._request is not None:
+                self.skipped += 1
+                self._request = None
+            return self._latest_id
+
+
+    def is_current(self, request_id):
+        return request_id == self._latest_id
 
+
+    def stats(self):
+        """Render counters and timings (ms) for instrumentation."""
+        timings = list(self.render_times_ms)
+        return {
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "discarded": self.discarded,
+            "last_ms": round(timings[-1], 1) if timings else None,
+            "median_ms": round(statistics.median(timings), 1) if timings else None,
+            "max_ms": round(max(timings), 1) if timings else None,
+        }
+
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._request is None:
+                    self._condition.wait()
+                request_id, pdf_path, display_width = self._request
+                self._request = None
+
+            start = time.perf_counter()
+            try:
+                if self.preview_cache and display_width == PDF_PREVIEW_WIDTH:
+                    image = self.preview_cache.get(pdf_path)  # Poppler only runs on a miss
+                else:
+                    image = render_pdf_preview(pdf_path, display_width)
             except Exception as e:
                 print(f"Error rendering PDF: {e}")
+                continue
 
-        self.thread = threading.Thread(target=task)
-        self.thread.start()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.render_times_ms.append(elapsed_ms)
+            self.completed += 1
+
+            if image is None:
+                continue
+            if not self.is_current(request_id):
+                self.discarded += 1  # Still cached, in case the user comes back to it
+                continue
+
+            try:
+                # Pass to UI callback
+                self.callback(image, request_id)
+            except Exception as e:
+                print(f"Error delivering rendered PDF: {e}")
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from class_elements.database import get_connection, fetch_client_record
+from class_elements.search_executor import SearchExecutor
+
+
+MAX_CACHED_CLIENTS = 20     # Recently viewed clients kept in memory (a record is a few KB of rows)
+
+
+class ClientDataLoader:
+    """
+    Per-client cache of fetch_client_record() results, shared by every tab.
+
+    load_async() reads a client on the background search worker (latest request wins) and
+    calls back on the Tk thread; fetch() is the synchronous path for tabs refreshing after an edit.
+    Any write to the database drops the whole cache: writes made on the Tk thread show up in
+    its connection's total_changes, writes from other connections (e.g. the upload server)
+    in PRAGMA data_version. All methods must be called on the Tk thread.
+    """
+    def __init__(self, widget, db_path, max_clients=MAX_CACHED_CLIENTS):
+        self.db_path = db_path
+        self.max_clients = max_clients
+        self._records = OrderedDict()       # {client_id: record}, least recently used first
+        self._version = None                # write_version() the cached records were read at
+        self._on_loaded = None
+        self._executor = SearchExecutor(widget, self._deliver, debounce_ms=0)
+
+
+    def write_version(self):
+        """A token that changes whenever anything is committed to the database."""
+        conn = get_connection(self.db_path)
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        return id(conn), data_version, conn.total_changes
+
+
+    def fetch(self, client_id):
+        """Return the client's record (None if the client doesn't exist), reading it now if not cached."""
+        self._check_version()
+        record = self._records.get(client_id)
+        if record is not None:
+            self._records.move_to_end(client_id)
+            return record
+
+        try:
+            with get_connection(self.db_path) as conn:
+                record = fetch_client_record(conn, client_id)
+        except Exception as e:
+            print(f"Error loading client {client_id}: {e}")
+            return None
+
+        self._store(client_id, record)
+        return record
+
+
+    def load_async(self, client_id, on_loaded):
+        """
+        Call on_loaded(client_id, record) on the Tk thread once the client is loaded:
+        immediately when cached, otherwise after a background read. Supersedes any load in flight.
+        """
+        self._check_version()
+        self._on_loaded = on_loaded
+
+        if client_id in self._records:
+            self._executor.cancel()
+            self._records.move_to_end(client_id)
+            on_loaded(client_id, self._records[client_id])
+            return
+
+        version = self._version
+        db_path = self.db_path
+
+        def load():
+            with get_connection(db_path) as conn:
+                return client_id, version, fetch_client_record(conn, client_id)
+
+        self._executor.submit(load)
+
+
+    def cancel(self):
+        """Drop any load in flight (e.g. the selection was cleared)."""
+        self._executor.cancel()
+
+
+    def invalidate(self, client_id=None):
+        """Forget one client's record, or every record."""
+        if client_id is None:
+            self._records.clear()
+        else:
+            self._records.pop(client_id, None)
+
+
+    def _check_version(self):
+        version = self.write_version()
+        if version != self._version:
+            self._records.clear()  # Something was written since these were read
+            self._version = version
+
+
+    def _deliver(self, result):
+        client_id, version, record = result
+        self._check_version()
+        if version == self._version:
+            self._store(client_id, record)  # Nothing written since the load was dispatched
+        self._on_loaded(client_id, record)
+
+
+    def _store(self, client_id, record):
+        if record is None:
+            return
+
+        self._records[client_id] = record
+        self._records.move_to_end(client_id)
+        while len(self._records) > self.max_clients:
+            self._records.popitem(last=False)
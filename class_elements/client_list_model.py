@@ -0,0 +1,226 @@
+from class_elements.database import get_connection, search_client_ids, count_client_matches, client_search_filter, CLIENT_SORT_KEYS
+
+
+# Treeview columns (Name, Gender, Birthdate, Primary #, Email, Address), preceded by the client id
+CLIENT_LIST_FIELDS = "id, full_name, gender, birthdate, primary_phone, email, IFNULL(address1, '') || ' ' || IFNULL(address2, '')"
+
+
+class ClientListModel:
+    """
+    Windowed, paged view of the clients table for the Clients tab.
+
+    Rows are fetched a page at a time by keyset — (sort key, id) after/before the cached
+    edge rows — as the visible window moves, and only a few pages are kept in memory.
+    Far jumps (dragging the scrollbar, Home/End) re-anchor with a single OFFSET query.
+
+    Listing modes:
+        - All clients, in id order or by a column sort key (CLIENT_SORT_KEYS)
+        - Search results sorted by a column (same keyset paging, filtered by clients_fts)
+        - Search results in ranked order (no column sort): each page is a ranked
+          LIMIT/OFFSET query on clients_fts, and rows are fetched for its ids only
+    """
+    def __init__(self, db_path, page_size=100, max_cached_pages=5):
+        self.db_path = db_path
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+
+        self.search_text = None
+        self.sort_column = None         # Key into CLIENT_SORT_KEYS, or None for the default order
+        self.descending = False
+        self.total = 0
+
+        self._filter = ("1", [])        # (where_sql, params) for the current search
+        self._ranked = False            # Listing search results in ranked order
+        self._rows = []                 # Cached contiguous rows: CLIENT_LIST_FIELDS + sort key
+        self._start = 0                 # List position of self._rows[0]
+
+
+    def reset(self, search_text=None, sort_column=None, descending=False):
+        """Start a new listing (all clients, or search results) and return its row count."""
+        self.search_text = search_text or None
+        self.sort_column = sort_column if sort_column in CLIENT_SORT_KEYS else None
+        self.descending = descending
+        self._rows, self._start = [], 0
+        self._ranked = bool(self.search_text) and self.sort_column is None
+
+        with get_connection(self.db_path) as conn:
+            if self.search_text:
+                self._filter = client_search_filter(conn, self.search_text)
+            else:
+                self._filter = ("1", [])
+
+            if self._ranked:
+                # Ranked results: counted here, ranked a page at a time as the window moves
+                self.total = count_client_matches(conn, self.search_text)
+            else:
+                where, params = self._filter
+                self.total = conn.execute(f"SELECT COUNT(*) FROM clients WHERE {where}", params).fetchone()[0]
+
+        return self.total
+
+
+    def get_rows(self, offset, count):
+        """Return the rows at list positions [offset, offset + count), fetching pages as needed."""
+        end = min(offset + count, self.total)
+        offset = max(0, offset)
+        if offset >= end:
+            return []
+
+        page = max(self.page_size, count)
+        cache_end = self._start + len(self._rows)
+
+        if not self._rows or end < self._start - page or offset > cache_end + page:
+            # Far from the cached rows: re-anchor at the window
+            self._rows, self._start = self._fetch_at(offset, page), offset
+
+        while end > self._start + len(self._rows):
+            rows = self._fetch_next(page)
+            if not rows:
+                break
+            self._rows.extend(rows)
+
+        while offset < self._start:
+            rows = self._fetch_previous(min(page, self._start))
+            if not rows:
+                break
+            self._rows[:0] = rows
+            self._start -= len(rows)
+
+        self._trim_cache(offset, end)
+        return self._rows[offset - self._start:end - self._start]
+
+
+    def position_of(self, client_id):
+        """Return the list position of a client, or None if it isn't in the current listing."""
+        if self._ranked:
+            client_id = int(client_id)
+            for index, row in enumerate(self._rows):
+                if row[0] == client_id:
+                    return self._start + index
+            with get_connection(self.db_path) as conn:  # Not cached: rank the whole result set once
+                ranked_ids = search_client_ids(conn, self.search_text)
+            return ranked_ids.index(client_id) if client_id in ranked_ids else None
+
+        sort_key = self._sort_key()
+        where, params = self._filter
+        with get_connection(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT {sort_key} FROM clients WHERE id = ? AND {where}", [client_id] + params
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Rows before it in ascending order: smaller key, or same key and smaller id
+            before = conn.execute(
+                f"SELECT COUNT(*) FROM clients WHERE {sort_key} < ? AND {where}", [row[0]] + params
+            ).fetchone()[0]
+            if sort_key != "id":
+                before += conn.execute(
+                    f"SELECT COUNT(*) FROM clients WHERE {sort_key} = ? AND id < ? AND {where}", [row[0], client_id] + params
+                ).fetchone()[0]
+
+        return self.total - 1 - before if self.descending else before
+
+
+    ### --- Page Fetching --- ###
+    def _sort_key(self):
+        return CLIENT_SORT_KEYS[self.sort_column] if self.sort_column else "id"
+
+
+    def _fetch_at(self, position, count):
+        """Fetch `count` rows starting at a list position (OFFSET, also for ranked results)."""
+        if self._ranked:
+            with get_connection(self.db_path) as conn:
+                client_ids = search_client_ids(conn, self.search_text, limit=count, offset=position)
+            return self._fetch_ranked(client_ids)
+
+        sort_key = self._sort_key()
+        order = "DESC" if self.descending else "ASC"
+        where, params = self._filter
+        order_sql = f"{sort_key} {order}" if sort_key == "id" else f"{sort_key} {order}, id {order}"
+        with get_connection(self.db_path) as conn:
+            return conn.execute(f"""
+                SELECT {CLIENT_LIST_FIELDS}, {sort_key} FROM clients
+                WHERE {where}
+                ORDER BY {order_sql}
+                LIMIT ? OFFSET ?
+            """, params + [count, position]).fetchall()
+
+
+    def _fetch_next(self, count):
+        """Fetch the page after the last cached row."""
+        if self._ranked:
+            return self._fetch_at(self._start + len(self._rows), count)
+        return self._fetch_keyset(self._rows[-1], count, forward=True)
+
+
+    def _fetch_previous(self, count):
+        """Fetch the page before the first cached row (returned in list order)."""
+        if self._ranked:
+            return self._fetch_at(self._start - count, count)
+        return self._fetch_keyset(self._rows[0], count, forward=False)[::-1]
+
+
+    def _fetch_keyset(self, edge_row, count, forward):
+        """
+        Fetch up to `count` rows after (forward) or before `edge_row` in list order.
+        The two halves (same key with a later id, then later keys) are each an index seek;
+        a single `(key, id) > (?, ?)` row-value comparison would scan instead.
+        """
+        ascending = forward != self.descending
+        op = ">" if ascending else "<"
+        order = "ASC" if ascending else "DESC"
+        sort_key = self._sort_key()
+        edge_id, edge_key = edge_row[0], edge_row[-1]
+        where, params = self._filter
+
+        with get_connection(self.db_path) as conn:
+            if sort_key == "id":
+                return conn.execute(f"""
+                    SELECT {CLIENT_LIST_FIELDS}, id FROM clients
+                    WHERE id {op} ? AND {where}
+                    ORDER BY id {order}
+                    LIMIT ?
+                """, [edge_id] + params + [count]).fetchall()
+
+            return conn.execute(f"""
+                SELECT * FROM (
+                    SELECT {CLIENT_LIST_FIELDS}, {sort_key} FROM clients
+                    WHERE {sort_key} = ? AND id {op} ? AND {where}
+                    ORDER BY id {order} LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT {CLIENT_LIST_FIELDS}, {sort_key} FROM clients
+                    WHERE {sort_key} {op} ? AND {where}
+                    ORDER BY {sort_key} {order}, id {order} LIMIT ?
+                )
+                LIMIT ?
+            """, [edge_key, edge_id] + params + [count, edge_key] + params + [count, count]).fetchall()
+
+
+    def _fetch_ranked(self, client_ids):
+        """Fetch rows for a slice of ranked ids, keeping the ranked order."""
+        if not client_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in client_ids)
+        with get_connection(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT {CLIENT_LIST_FIELDS}, id FROM clients WHERE id IN ({placeholders})", client_ids
+            ).fetchall()
+
+        rows_by_id = {row[0]: row for row in rows}
+        return [rows_by_id[client_id] for client_id in client_ids if client_id in rows_by_id]
+
+
+    def _trim_cache(self, offset, end):
+        """Drop cached rows far from the window once more than max_cached_pages are held."""
+        limit = self.max_cached_pages * max(self.page_size, end - offset)
+        if len(self._rows) <= limit:
+            return
+
+        center = (offset + end) // 2
+        new_start = min(max(self._start, center - limit // 2), self._start + len(self._rows) - limit)
+        self._rows = self._rows[new_start - self._start:new_start - self._start + limit]
+        self._start = new_start
@@ -1,26 +1,182 @@
 import sqlite3
 import datetime
 import os
-import shutil
+import re
+import threading
+import time
+from utils.date_utils import to_iso_date
+
+
+# Per-connection tuning (applied once when a pooled connection is opened)
+CACHE_SIZE_KB = 8192                # Page cache per connection (~8 MB)
+MMAP_SIZE = 64 * 1024 * 1024        # Memory-map up to 64 MB of the database file
+MAX_POOL_CONNECTIONS = 32           # Upper bound on live connections per database (see below)
+
+# Connection budget per database. Long-lived threads keep their connection for life:
+#   the Tk thread, the upload server's worker threads (upload_server SERVER_THREADS = 6),
+#   4 ThumbnailWorker threads, the PdfRenderWorker and the client search worker: ~13 at most.
+# Short-lived work (photo ingest, image preload, PDF pre-render, store pruning, upload
+# rendition tasks on the UploadWorker threads) release()s its connection when done, and a dead thread's slot is reclaimed automatically. The cap is well
+# above the budget; reaching it means a thread is leaking connections.
+POOL_WAIT_WARNING_S = 1             # Say so when a thread has waited this long for a slot
+
+# Columns indexed by clients_fts, in FTS column order
+CLIENT_SEARCH_COLUMNS = ("full_name", "primary_phone", "secondary_phone", "email", "address1", "address2", "city")
+
+# bm25 weights per column: name matches rank well above phone/email/address matches
+CLIENT_SEARCH_WEIGHTS = (10.0, 2.0, 2.0, 2.0, 1.0, 1.0, 1.0)
+
+# clients_fts's default rank (migration 5), so searches rank with a plain ORDER BY rank
+CLIENT_SEARCH_RANK = f"bm25({', '.join(str(w) for w in CLIENT_SEARCH_WEIGHTS)})"
+
+# Clients tab sort keys (Treeview heading -> SQL expression). Each one has a matching index
+# (migration 4), so the list can be paged by keyset in any column order.
+CLIENT_SORT_KEYS = {
+    "Name": "full_name COLLATE NOCASE",
+    "Gender": "IFNULL(gender, '') COLLATE NOCASE",
+    "Birthdate": "IFNULL(birthdate, '') COLLATE NOCASE",
+    "Primary #": "IFNULL(primary_phone, '') COLLATE NOCASE",
+    "Email": "IFNULL(email, '') COLLATE NOCASE",
+    "Address": "(IFNULL(address1, '') || ' ' || IFNULL(address2, '')) COLLATE NOCASE",
+}
+
+
+def apply_connection_pragmas(conn):
+    """Apply WAL + performance pragmas to a freshly opened connection."""
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+    except sqlite3.OperationalError as e:
+        print(f"Could not apply WAL mode: {e}")
+
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB};")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE};")
+    conn.commit()
+
+
+class ConnectionPool:
+    """
+    Small bounded pool of long-lived SQLite connections, one per thread.
+    Connections are opened lazily and reused for every query made on that thread,
+    so a click no longer costs a file open + lock handshake on the data folder.
+    """
+    def __init__(self, db_path, max_connections=MAX_POOL_CONNECTIONS, timeout=10):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._connections = {}              # {threading.Thread: sqlite3.Connection}
+        self._condition = threading.Condition()
+
+
+    def get_connection(self):
+        """Return the calling thread's connection, opening one if needed."""
+        thread = threading.current_thread()
+
+        with self._condition:
+            conn = self._connections.get(thread)
+            if conn is not None:
+                return conn
+
+            start = time.monotonic()
+            warned = False
+            while len(self._connections) >= self.max_connections:
+                self._close_dead_thread_connections()
+                if len(self._connections) < self.max_connections:
+                    break
+
+                waited = time.monotonic() - start
+                if waited >= self.timeout:
+                    raise sqlite3.OperationalError(
+                        f"Connection pool exhausted for {self.db_path} ({self.max_connections} connections held by: "
+                        f"{self._holder_names()})"
+                    )
+                if not warned and waited >= POOL_WAIT_WARNING_S:
+                    print(f"⚠️ {thread.name} is waiting for a connection to {os.path.basename(self.db_path)} "
+                          f"(all {self.max_connections} in use by: {self._holder_names()})")
+                    warned = True
+                self._condition.wait(min(self.timeout - waited, 0.5))
+
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            apply_connection_pragmas(conn)
+            self._connections[thread] = conn
+            return conn
+
+
+    def release(self):
+        """Close the calling thread's connection (e.g. at the end of a worker thread)."""
+        with self._condition:
+            conn = self._connections.pop(threading.current_thread(), None)
+            if conn is not None:
+                conn.close()
+            self._condition.notify()
+
+
+    def close_all(self):
+        """Close every pooled connection (used on application shutdown)."""
+        with self._condition:
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    print(f"Error closing pooled connection: {e}")
+            self._connections.clear()
+            self._condition.notify_all()
+
+
+    def _holder_names(self):
+        return ", ".join(sorted(thread.name for thread in self._connections))
+
+
+    def _close_dead_thread_connections(self):
+        """Free slots held by threads that have already exited."""
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            try:
+                self._connections.pop(thread).close()
+            except sqlite3.Error as e:
+                print(f"Error closing stale connection: {e}")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path):
+    """Return the shared ConnectionPool for `db_path`, creating it on first use."""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[key] = pool
+        return pool
+
+
+def get_connection(db_path):
+    """
+    Return the calling thread's pooled connection for `db_path`.
+    Use it exactly like sqlite3.connect(): `with get_connection(path) as conn:`
+    commits on success and rolls back on error, but does NOT close the connection.
+    """
+    return get_pool(db_path).get_connection()
+
+
+def close_all_pools():
+    """Close all pooled connections for every database."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
 
 
 def init_database(db_path, backup_dir):
     """
     Initialize or reuse the existing database.
-    Weekly backups are made with a timestamped filename.
+    Weekly backups are made with a timestamped filename, before any pending schema migration runs.
     """
     is_new = not os.path.exists(db_path)
 
-    # Apply WAL mode only during initial connection
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    
-    try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-    except sqlite3.OperationalError as e:
-        print(f"Could not apply WAL mode: {e}")
-    finally:
-        conn.commit()
-        
+    # Connection pragmas (WAL, synchronous, cache/mmap) are applied by the pool
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     if is_new:
@@ -28,9 +184,9 @@ def init_database(db_path, backup_dir):
         create_tables(cursor)
         conn.commit()
     else:
-        print("Reusing existing database: {db_path}")
+        print(f"Reusing existing database: {db_path}")
 
-    # Weekly backup logic
+    # Weekly backup logic (before any migration touches the data)
     os.makedirs(backup_dir, exist_ok=True)
 
     today = datetime.date.today()
@@ -43,13 +199,44 @@ def init_database(db_path, backup_dir):
 
     if not os.path.exists(backup_path):
         print(f"Creating weekly backup: {backup_name}")
-        shutil.copyfile(db_path, backup_path)
+        backup_database(conn, backup_path)
     else:
         print(f"Weekly backup already exists: {backup_name}")
 
+        # This week's backup may be days old: keep the exact pre-migration state too
+        if not is_new and get_schema_version(conn) < len(MIGRATIONS):
+            pre_migration_name = f"{db_name}_pre_v{len(MIGRATIONS)}_{today.isoformat()}.db"
+            print(f"Creating pre-migration backup: {pre_migration_name}")
+            backup_database(conn, os.path.join(backup_dir, pre_migration_name))
+
+    # Bring new and existing databases up to the current schema version
+    run_migrations(conn)
+
     print(f"Database ready: {db_path}")
     return conn
 
+
+def backup_database(conn, backup_path):
+    """
+    Write a consistent snapshot of `conn`'s database to `backup_path` with SQLite's online backup
+    API. Unlike copying the file, this includes commits still in the -wal file and can't tear
+    while another thread writes or checkpoints. Written to a .part file first, so an interrupted
+    backup never passes for a finished one.
+    """
+    partial_path = backup_path + ".part"
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+
+    conn.commit()  # Nothing of ours left uncommitted in the snapshot
+    target = sqlite3.connect(partial_path)
+    try:
+        conn.backup(target)
+        target.execute("PRAGMA journal_mode=DELETE")  # Standalone file: no -wal/-shm next to the backup
+    finally:
+        target.close()
+    os.replace(partial_path, backup_path)
+
+
 def create_tables(cursor):
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS clients (
@@ -148,3 +335,305 @@ def create_tables(cursor):
         FOREIGN KEY (client_id) REFERENCES clients (id) ON DELETE CASCADE
     )
     """)
+
+
+#################################
+### --- Schema Migrations --- ###
+#################################
+def migration_1_add_indexes(cursor):
+    """Add covering indexes for per-client lookups, alert deadlines and photo paths."""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_photos_client_date
+        ON photos (client_id, appt_date, type, file_path)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_file_path ON photos (file_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_appointment ON photos (appointment_id)")
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_appointments_client_date
+        ON appointments (client_id, date)
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_prescriptions_client_date
+        ON prescriptions (client_id, start_date, form_type, file_path)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_deadline ON alerts (deadline, client_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_health_info_client ON client_health_info (client_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_client_images_client ON client_images (client_id)")
+
+
+def migration_2_iso_dates(cursor):
+    """Rewrite MM/DD/YYYY appointment, photo, prescription and alert dates as ISO YYYY-MM-DD."""
+    cursor.connection.create_function("to_iso_date", 1, to_iso_date, deterministic=True)
+
+    for table, column in (
+        ("appointments", "date"),
+        ("photos", "appt_date"),
+        ("prescriptions", "start_date"),
+        ("alerts", "deadline"),
+    ):
+        cursor.execute(f"""
+            UPDATE {table}
+            SET {column} = to_iso_date({column})
+            WHERE {column} IS NOT NULL
+              AND {column} NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+        """)
+        print(f"Normalized {cursor.rowcount} {table}.{column} value(s) to ISO format.")
+
+
+def migration_3_client_search_index(cursor):
+    """Add the clients_fts full-text index (name, phone, email, address) with sync triggers."""
+    columns = ", ".join(CLIENT_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{col}" for col in CLIENT_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{col}" for col in CLIENT_SEARCH_COLUMNS)
+
+    try:
+        cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+            {columns},
+            content='clients', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+        )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 unavailable, client search will fall back to LIKE: {e}")
+        return
+
+    # External-content FTS table: keep it in sync with `clients` on every write
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN
+        INSERT INTO clients_fts (rowid, {columns}) VALUES (new.id, {new_values});
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN
+        INSERT INTO clients_fts (clients_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE ON clients BEGIN
+        INSERT INTO clients_fts (clients_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        INSERT INTO clients_fts (rowid, {columns}) VALUES (new.id, {new_values});
+    END
+    """)
+
+    # Index every existing client
+    cursor.execute("INSERT INTO clients_fts (clients_fts) VALUES ('rebuild')")
+
+
+def migration_4_client_sort_indexes(cursor):
+    """Index each Clients tab sort key so the client list can be paged in any column order."""
+    for column, sort_key in CLIENT_SORT_KEYS.items():
+        index_name = "idx_clients_sort_" + re.sub(r"\W+", "_", column.lower()).strip("_")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON clients ({sort_key})")
+
+
+def migration_5_client_search_rank(cursor):
+    """Make the weighted bm25 score clients_fts's rank, so searches order by rank without joining clients."""
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clients_fts'").fetchone() is None:
+        return  # No FTS5 on this build: client search uses LIKE
+
+    cursor.execute("INSERT INTO clients_fts (clients_fts, rank) VALUES ('rank', ?)", (CLIENT_SEARCH_RANK,))
+
+
+# Ordered list of schema migrations. Migration N (1-based) moves PRAGMA user_version to N.
+# Never reorder or edit a released migration — append a new one instead.
+MIGRATIONS = [
+    migration_1_add_indexes,
+    migration_2_iso_dates,
+    migration_3_client_search_index,
+    migration_4_client_sort_indexes,
+    migration_5_client_search_rank,
+]
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in the database header (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(conn):
+    """Apply every pending migration, each in its own transaction."""
+    current_version = get_schema_version(conn)
+
+    if current_version > len(MIGRATIONS):
+        print(f"Database schema version {current_version} is newer than this app ({len(MIGRATIONS)}).")
+        return current_version
+
+    for version, migration in enumerate(MIGRATIONS[current_version:], start=current_version + 1):
+        print(f"Applying schema migration {version}: {migration.__doc__}")
+        conn.commit()  # Make sure no implicit transaction is open before BEGIN
+        try:
+            conn.execute("BEGIN")
+            migration(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Schema migration {version} failed: {e}")
+            raise
+
+    return get_schema_version(conn)
+
+
+#############################
+### --- Client Search --- ###
+#############################
+def build_fts_query(text, name_only=False):
+    """
+    Turn free-form user input into an FTS5 prefix query ("jan do" -> "jan"* "do"*).
+    Returns None when the input has no searchable characters.
+    """
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return None
+
+    terms = " ".join(f'"{token}"*' for token in tokens)
+    return f"full_name : ({terms})" if name_only else terms
+
+
+def has_client_search_index(conn):
+    """True if the clients_fts table exists (FTS5 may be missing on some SQLite builds)."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'clients_fts'").fetchone()
+    return row is not None
+
+
+def search_clients(conn, text, fields="c.id, c.full_name", name_only=False, limit=None):
+    """
+    Ranked prefix search over clients (best match first).
+    `fields` is a select list over the `clients` table aliased as `c`.
+    With `name_only`, only full_name is matched (used by the name pickers).
+    The ranking runs on clients_fts alone; only the `limit` rows kept are joined to clients.
+    """
+    fts_query = build_fts_query(text, name_only=name_only)
+    if fts_query is None:
+        return []
+
+    limit_sql = "LIMIT ?" if limit else ""
+    params = [fts_query] + ([limit] if limit else [])
+
+    if has_client_search_index(conn):
+        sql = f"""
+            SELECT {fields}
+            FROM (
+                SELECT rowid, rank FROM clients_fts
+                WHERE clients_fts MATCH ?
+                ORDER BY rank
+                {limit_sql}
+            ) AS matches
+            JOIN clients c ON c.id = matches.rowid
+            ORDER BY matches.rank
+        """
+        return conn.execute(sql, params).fetchall()
+
+    # Fallback for SQLite builds without FTS5
+    where, params = client_search_filter(conn, text, name_only=name_only)
+    params += [limit] if limit else []
+    sql = f"SELECT {fields} FROM clients c WHERE {where} ORDER BY c.full_name {limit_sql}"
+    return conn.execute(sql, params).fetchall()
+
+
+def search_client_ids(conn, text, name_only=False, limit=None, offset=0):
+    """
+    Ids of the clients matching `text`, ranked like search_clients(); with `limit`, only the
+    page at `offset`. Reads clients_fts alone (row data is fetched for the ids shown).
+    """
+    fts_query = build_fts_query(text, name_only=name_only)
+    if fts_query is None:
+        return []
+
+    page_sql = "LIMIT ? OFFSET ?" if limit else ""
+    page_params = [limit, offset] if limit else []
+
+    if has_client_search_index(conn):
+        sql = f"SELECT rowid FROM clients_fts WHERE clients_fts MATCH ? ORDER BY rank {page_sql}"
+        return [row[0] for row in conn.execute(sql, [fts_query] + page_params)]
+
+    # Fallback for SQLite builds without FTS5
+    where, params = client_search_filter(conn, text, name_only=name_only)
+    sql = f"SELECT id FROM clients WHERE {where} ORDER BY full_name {page_sql}"
+    return [row[0] for row in conn.execute(sql, params + page_params)]
+
+
+def count_client_matches(conn, text, name_only=False):
+    """Number of clients matching `text` (counted on clients_fts, without ranking)."""
+    if has_client_search_index(conn):
+        fts_query = build_fts_query(text, name_only=name_only)
+        if fts_query is None:
+            return 0
+        return conn.execute("SELECT COUNT(*) FROM clients_fts WHERE clients_fts MATCH ?", (fts_query,)).fetchone()[0]
+
+    where, params = client_search_filter(conn, text, name_only=name_only)
+    return conn.execute(f"SELECT COUNT(*) FROM clients WHERE {where}", params).fetchone()[0]
+
+
+def client_search_filter(conn, text, name_only=False):
+    """
+    Return (where_sql, params) restricting `clients` to the rows matching `text`, for queries
+    that need their own ordering. Uses clients_fts when available, LIKE otherwise.
+    """
+    if has_client_search_index(conn):
+        fts_query = build_fts_query(text, name_only=name_only)
+        if fts_query is None:
+            return "0", []
+        return "id IN (SELECT rowid FROM clients_fts WHERE clients_fts MATCH ?)", [fts_query]
+
+    like_columns = ["full_name"] if name_only else list(CLIENT_SEARCH_COLUMNS)
+    where = " OR ".join(f"{col} LIKE ?" for col in like_columns)
+    return f"({where})", [f"%{text.strip()}%"] * len(like_columns)
+
+
+#############################
+### --- Client Record --- ###
+#############################
+def fetch_client_record(conn, client_id):
+    """
+    Read everything the tabs show for one client in a single read transaction (one consistent snapshot).
+    Returns None if the client doesn't exist, otherwise a dict of rows shaped like each tab's old query:
+        client        (full_name, gender, birthdate, address1, address2, city, state, zip,
+                       primary_phone, secondary_phone, email, referred_by)
+        profile       (full_name, profile_picture, zoom, shift)
+        health        (allergies, ..., desired_improvement) or None
+        appointments  [(id, date, type, treatment, price, photos_taken, treatment_notes)], newest first
+        photos        [(id, appt_date, type, file_path)], newest first
+        prescriptions [(id, form_type, file_path, start_date)], newest first
+    """
+    owns_transaction = not conn.in_transaction
+    if owns_transaction:
+        conn.execute("BEGIN")
+    try:
+        row = conn.execute("""
+            SELECT c.full_name, c.gender, c.birthdate, c.address1, c.address2, c.city, c.state, c.zip,
+                   c.primary_phone, c.secondary_phone, c.email, c.referred_by,
+                   c.profile_picture, COALESCE(ci.zoom, 100), COALESCE(ci.shift, 0)
+            FROM clients c
+            LEFT JOIN client_images ci ON c.id = ci.client_id
+            WHERE c.id = ?
+        """, (client_id,)).fetchone()
+        if row is None:
+            return None
+
+        return {
+            "client_id": client_id,
+            "client": row[:12],
+            "profile": (row[0],) + row[12:],
+            "health": conn.execute("""
+                SELECT allergies, health_conditions, health_risks, medications, treatment_areas,
+                       current_products, skin_conditions, other_notes, desired_improvement
+                FROM client_health_info WHERE client_id = ?
+            """, (client_id,)).fetchone(),
+            "appointments": conn.execute("""
+                SELECT id, date, type, treatment, price, photos_taken, treatment_notes
+                FROM appointments WHERE client_id = ? ORDER BY date DESC
+            """, (client_id,)).fetchall(),
+            "photos": conn.execute("""
+                SELECT id, appt_date, type, file_path
+                FROM photos WHERE client_id = ? ORDER BY appt_date DESC
+            """, (client_id,)).fetchall(),
+            "prescriptions": conn.execute("""
+                SELECT id, form_type, file_path, start_date
+                FROM prescriptions WHERE client_id = ? ORDER BY start_date DESC
+            """, (client_id,)).fetchall(),
+        }
+    finally:
+        if owns_transaction:
+            conn.commit()
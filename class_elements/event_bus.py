@@ -0,0 +1,82 @@
+import queue
+import threading
+
+
+# Event names (payloads are keyword arguments passed to every subscriber)
+PHOTO_UPLOADED = "photo_uploaded"       # client_id, appointment_id, file_paths
+PROFILE_UPDATED = "profile_updated"     # client_id, file_path
+
+
+class EventBus:
+    """
+    In-process publish/subscribe from worker threads (the upload server) to the Tk thread.
+
+    publish() is thread-safe and never blocks: the event goes on a queue and, if no drain is
+    pending, one is scheduled on the attached widget with after(0). Subscribers always run on
+    the Tk thread, in subscription order. Events published before attach() wait in the queue.
+    subscribe()/unsubscribe() must be called on the Tk thread.
+    """
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._subscribers = {}              # {event_name: [callback, ...]}
+        self._widget = None
+        self._drain_pending = False
+        self._lock = threading.Lock()
+
+
+    def attach(self, widget):
+        """Deliver events through `widget`'s main loop (call once, on the Tk thread, after the root exists)."""
+        with self._lock:
+            self._widget = widget
+            self._drain_pending = False
+        self._schedule_drain()
+
+
+    def publish(self, name, **payload):
+        """Queue an event for the Tk thread (any thread)."""
+        self._queue.put((name, payload))
+        self._schedule_drain()
+
+
+    def subscribe(self, name, callback):
+        self._subscribers.setdefault(name, []).append(callback)
+
+
+    def unsubscribe(self, name, callback):
+        callbacks = self._subscribers.get(name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+
+    def _schedule_drain(self):
+        with self._lock:
+            if self._widget is None or self._drain_pending:
+                return
+            self._drain_pending = True
+            widget = self._widget
+
+        try:
+            widget.after(0, self._drain)
+        except RuntimeError:
+            pass  # Main loop is gone (app closing)
+
+
+    def _drain(self):
+        """Tk thread: deliver everything queued so far."""
+        with self._lock:
+            self._drain_pending = False  # Anything published from here on schedules another drain
+
+        while True:
+            try:
+                name, payload = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            for callback in list(self._subscribers.get(name, [])):  # Copy: callbacks may unsubscribe
+                try:
+                    callback(**payload)
+                except Exception as e:
+                    print(f"Error handling '{name}' event: {e}")
+
+
+event_bus = EventBus()  # Shared by the upload server and the UI (same process)
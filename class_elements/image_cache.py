@@ -1,23 +1,120 @@
 import json
 import os
+import threading
 from collections import OrderedDict
 from PIL import Image, ImageTk
 from customtkinter import CTkImage
 from tkinter import PhotoImage
+from class_elements.thumbnail_store import DISPLAY, DISPLAY_SIZE
 from utils.path_utils import resource_path
+from utils.image_utils import make_display_image
+
+
+# Default memory budgets (MB). A 300x400 display image costs ~0.8 MB, a 100x100 thumbnail ~40 KB.
+DEFAULT_IMAGE_CACHE_MB = 128
+DEFAULT_THUMBNAIL_CACHE_MB = 32
+
+
+def estimate_image_bytes(image):
+    """Approximate pixel memory held by a cached CTkImage / PhotoImage / PIL image."""
+    if isinstance(image, CTkImage):
+        # Source PIL image + the Tk photo CTk renders at the display size
+        source = image.cget("light_image")
+        width, height = image.cget("size")
+        source_bytes = source.width * source.height * len(source.getbands()) if source else 0
+        return source_bytes + width * height * 4
+
+    if isinstance(image, (ImageTk.PhotoImage, PhotoImage)):
+        return image.width() * image.height() * 4  # Tk stores 32-bit pixels
+
+    if isinstance(image, Image.Image):
+        return image.width * image.height * len(image.getbands())
+
+    return 0
+
+
+class ByteBudgetLRU:
+    """
+    LRU mapping bounded by the approximate bytes of its values rather than an entry count.
+    put() is the single insertion/eviction point; get() counts hits and misses.
+    """
+    def __init__(self, budget_mb, name="cache"):
+        self.name = name
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()       # {key: (value, size_bytes)}, least recently used first
+
+
+    def get(self, key):
+        """Return the cached value (marking it most recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+
+    def put(self, key, value):
+        """Insert or replace a value, then evict least recently used entries until within budget."""
+        size_bytes = estimate_image_bytes(value)
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+
+        self._entries[key] = (value, size_bytes)
+        self.current_bytes += size_bytes
+
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.current_bytes > self.budget_bytes and len(self._entries) > 1:
+            evicted_key, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_bytes
+            self.evictions += 1
+            print(f"LRU Removed ({self.name}): {evicted_key}")
+
+
+    def keys(self):
+        return list(self._entries.keys())
+
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "mb_used": round(self.current_bytes / (1024 * 1024), 1),
+            "mb_budget": round(self.budget_bytes / (1024 * 1024), 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+    def __len__(self):
+        return len(self._entries)
 
 
 class ImageCache:
-    def __init__(self, data_manager, cache_size=500, thumbnail_cache_size=500):
+    def __init__(self, data_manager, store=None, image_cache_mb=DEFAULT_IMAGE_CACHE_MB, thumbnail_cache_mb=DEFAULT_THUMBNAIL_CACHE_MB):
         self.data_manager = data_manager
-        self.cache_size = cache_size
-        self.thumbnail_cache_size = thumbnail_cache_size
+        self.store = store                  # Optional ThumbnailStore holding pre-rendered display renditions
 
         self.cache_file = os.path.join(data_manager.backups_dir, "image_cache.json")
-        self.image_cache = OrderedDict()
-        self.thumbnail_cache = OrderedDict()
+        self.image_cache = ByteBudgetLRU(image_cache_mb, "images")
+        self.thumbnail_cache = ByteBudgetLRU(thumbnail_cache_mb, "thumbnails")
+        self.startup_thumbnail_paths = []   # Thumbnails to warm up in the background at startup (load_thumbnail_cache)
 
-        print(f"ImageCache initialized. Cache file at {self.cache_file}")
+        print(f"ImageCache initialized ({image_cache_mb} MB images / {thumbnail_cache_mb} MB thumbnails). Cache file at {self.cache_file}")
 
 
     #######################################
@@ -25,27 +122,20 @@ class ImageCache:
     #######################################
     def get_image(self, file_path):
         """Retrieve the cached image or process it if not cached."""
-        if file_path in self.image_cache:
-            # print(f"Instant Load: Using cached image for {file_path}")
-            return self.image_cache[file_path]
-        else:
-            print(f"Processing and caching new image → {file_path}")
-            image = self.preload_image(file_path)
-            self.add_image_to_cache(file_path, image)
+        image = self.image_cache.get(file_path)
+        if image is not None:
             return image
 
+        print(f"Processing and caching new image → {file_path}")
+        return self.preload_image(file_path)
+
 
     def add_image_to_cache(self, file_path, img):
-        """Add an image to the cache, ensuring it doesn't exceed max size."""
+        """Add an image to the cache (the only insertion point; evicts by memory budget)."""
         if not img:
             return  # Don't cache None values
-        
-        if file_path in self.image_cache:
-            self.image_cache.move_to_end(file_path)  # Move to end (LRU priority)
-        else:
-            if len(self.image_cache) >= self.cache_size:
-                self.image_cache.popitem(last=False)  # Remove least recently used item
-            self.image_cache[file_path] = img  # Add new image properly
+
+        self.image_cache.put(file_path, img)
 
 
     #################################
@@ -53,120 +143,137 @@ class ImageCache:
     #################################
     def get_thumbnail(self, file_path):
         """Retrieve the cached thumbnail as a Tkinter-compatible PhotoImage (non-blocking)."""
-        if file_path in self.thumbnail_cache:
-            thumbnail = self.thumbnail_cache[file_path]
-            if isinstance(thumbnail, ImageTk.PhotoImage):  # Must be PhotoImage for ttk.Treeview
-                print(f"Instant Load: Using cached thumbnail for {file_path}")
-                return thumbnail
-        
+        thumbnail = self.thumbnail_cache.get(file_path)
+        if isinstance(thumbnail, ImageTk.PhotoImage):  # Must be PhotoImage for ttk.Treeview
+            print(f"Instant Load: Using cached thumbnail for {file_path}")
+            return thumbnail
+
         # DO NOT generate the thumbnail here! Let the worker thread handle it!
         return None  # If it's not in the cache, return None and let the worker generate it
 
 
     def add_thumbnail_to_cache(self, file_path, thumbnail):
-        """Add a thumbnail to the cache with LRU handling."""
+        """Add a thumbnail to the cache (the only insertion point; evicts by memory budget)."""
         if not thumbnail or not isinstance(thumbnail, ImageTk.PhotoImage):  # Extra safeguard
             print(f"Warning: Not caching invalid thumbnail for {file_path}")
-            return  
+            return
+
+        self.thumbnail_cache.put(file_path, thumbnail)
+        print(f"Cached Thumbnail: {file_path}")
 
-        if file_path in self.thumbnail_cache:
-            self.thumbnail_cache.move_to_end(file_path)
-        else:
-            if len(self.thumbnail_cache) >= self.thumbnail_cache_size:
-                removed = self.thumbnail_cache.popitem(last=False)
-                print(f"LRU Removed Oldest Thumbnail: {removed[0]}")
 
-            self.thumbnail_cache[file_path] = thumbnail
-            print(f"Cached Thumbnail: {file_path}")
+    def log_stats(self):
+        """Print hit/miss/eviction counters for both caches (used to size the budgets)."""
+        for cache in (self.image_cache, self.thumbnail_cache):
+            print(f"ImageCache {cache.name}: {cache.stats()}")
 
 
-    ########################################    
+    ########################################
     ### --- Cache Saving and Loading --- ###
     ########################################
-    def load_image_cache(self, splash_screen=None):
-        """Load full-size image cache from disk and update splash screen dynamically."""
-        print("Entering load_cache_from_disk()...")  # Debug: Confirm function entry
-
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, "r") as f:
-                    data = json.load(f)
-
-                cached_paths = data.get("cached_paths", [])  # Get all cached paths
-                total_images = len(cached_paths)
-                print(f"Loading {total_images} startup images...")  
-
-                if splash_screen:
-                    step = 0.5 / total_images if total_images > 0 else 1
-
-                for i, file_path in enumerate(cached_paths):
-
-                    if os.path.exists(file_path):
-                        img = self.preload_image(file_path)  # Load image
-                        self.image_cache[file_path] = img  # Store image in cache
-
-                        if splash_screen:
-                            progress = (i + 1) * step
-                            splash_screen.update_progress(progress, f"Loading images... ({i+1}/{total_images})")
-                            splash_screen.update_idletasks()  # Force UI update
-                            splash_screen.after(10)  # Allow Tkinter to refresh
-                    else:
-                        print(f"Warning: Image file does NOT exist - {file_path}")  # Debug: Missing file
-
-                print("Loaded all 25 startup images.")
-
-            except Exception as e:
-                print(f"Error loading full-size image cache: {e}")
-        
-        print("Exiting load_cache_from_disk()...")  # Debug: Ensure function fully executed
-
+    def read_startup_paths(self):
+        """Return the full-size image paths saved on the last exit."""
+        if not os.path.exists(self.cache_file):
+            return []
 
-    def save_cache_to_disk(self):
-        """Save only the most recent 25 images to disk on exit."""
         try:
-            cache_data = list(self.image_cache.keys())[-25:]
-            with open(self.cache_file, "w") as f:
-                json.dump({"cached_paths": cache_data}, f, indent=4)
-            print(f"Saved {len(cache_data)} cached full-size images to disk.")
+            with open(self.cache_file, "r") as f:
+                return json.load(f).get("cached_paths", [])
         except Exception as e:
-            print(f"Error saving cache: {e}")
+            print(f"Error reading image cache file: {e}")
+            return []
 
 
     def load_thumbnail_cache(self):
-        """Load up to 25 thumbnails from disk, but allow cache to hold up to 500 thumbnails during runtime."""
+        """Load up to 25 thumbnail paths from disk to warm up at startup (the cache itself is bounded by memory)."""
         if os.path.exists(self.cache_file):
             try:
                 with open(self.cache_file, "r") as f:
                     data = json.load(f)
 
-                cached_paths = data.get("cached_paths", [])
-                print(f"Found {len(cached_paths)} cached thumbnails from disk.")  
+                # Older cache files only have one list, shared with the full-size images
+                cached_paths = data.get("thumbnail_paths", data.get("cached_paths", []))
+                print(f"Found {len(cached_paths)} cached thumbnails from disk.")
 
-                self.thumbnail_cache = OrderedDict((path, None) for path in cached_paths)
+                self.startup_thumbnail_paths = list(cached_paths)
 
             except Exception as e:
                 print(f"Error loading thumbnail cache: {e}")
 
 
-    def save_thumbnail_cache(self):
-        """Save up to 100 thumbnails to disk."""
+    def save_cache_to_disk(self):
+        """Save the 25 most recent full-size image and thumbnail paths to disk on exit."""
         try:
-            cache_data = list(self.thumbnail_cache.keys())[-25:]
+            cache_data = {
+                "cached_paths": self.image_cache.keys()[-25:],
+                "thumbnail_paths": self.thumbnail_cache.keys()[-25:],
+            }
             with open(self.cache_file, "w") as f:
-                json.dump({"cached_paths": cache_data}, f, indent=4)
-            print(f"Saved {len(cache_data)} cached thumbnails to disk.")
+                json.dump(cache_data, f, indent=4)
+            print(f"Saved {len(cache_data['cached_paths'])} image / {len(cache_data['thumbnail_paths'])} thumbnail paths to disk.")
         except Exception as e:
-            print(f"Error saving thumbnail cache: {e}")
+            print(f"Error saving cache: {e}")
 
 
-    ########################################    
+    ########################################
     ### --- Cache Loading on Startup --- ###
     ########################################
+    def preload_images_async(self, tk_root, file_paths):
+        """
+        Decode startup images on a background thread. Each one is wrapped in a CTkImage and
+        cached on the Tk thread as it arrives, so the UI never waits for the preload.
+        """
+        def work():
+            try:
+                for file_path in file_paths:
+                    if file_path in self.image_cache or not os.path.exists(file_path):
+                        continue
+                    try:
+                        img = self.load_display_image(file_path)
+                    except Exception as e:
+                        print(f"Error preloading image {file_path}: {e}")
+                        continue
+
+                    try:
+                        tk_root.after(0, self.cache_display_image, file_path, img)
+                    except RuntimeError:
+                        return  # Main loop is gone (app closing)
+                print(f"Background preload finished ({len(file_paths)} startup images).")
+            finally:
+                if self.store:
+                    self.store.release_thread()
+
+        threading.Thread(target=work, daemon=True, name="ImagePreload").start()
+
+
+    def load_display_image(self, file_path):
+        """
+        Display-size PIL image for a photo: the stored rendition when there is one, otherwise
+        rendered from the original and stored for next time. Safe to call from any thread.
+        """
+        key = self.store.source_key(file_path) if self.store else None
+        if key:
+            img = self.store.load(key, DISPLAY_SIZE, kind=DISPLAY)
+            if img is not None:
+                return img
+
+        img = make_display_image(file_path, DISPLAY_SIZE)
+        if key:
+            self.store.save(key, img, DISPLAY_SIZE, kind=DISPLAY)
+        return img
+
+
+    def cache_display_image(self, file_path, img):
+        """Cache a display-size PIL image decoded off the Tk thread (call on the Tk thread)."""
+        if file_path not in self.image_cache:  # May have been loaded on demand meanwhile
+            self.add_image_to_cache(file_path, CTkImage(img, size=DISPLAY_SIZE))
+
+
     def preload_image(self, file_paths):
         """Preload image(s) and return the last one (if any)."""
         if isinstance(file_paths, str):
             file_paths = [file_paths]
-        
+
         if not isinstance(file_paths, list):
             print(f"Unexpected input type: {type(file_paths)}. Expected a list or a string.")
             return None
@@ -180,14 +287,14 @@ class ImageCache:
 
             if file_path in self.image_cache:
                 print(f"Skipping {file_path}, already cached.")
-                last_image = self.image_cache[file_path]
+                last_image = self.image_cache.get(file_path)
                 continue
 
             if os.path.exists(file_path):
                 print(f"Preloading {file_path} into cache...")
                 image = self.crop_image(file_path)
                 if image:
-                    self.image_cache[file_path] = image
+                    self.add_image_to_cache(file_path, image)
                     last_image = image
             else:
                 print(f"Skipping {file_path}, file does not exist.")
@@ -198,24 +305,10 @@ class ImageCache:
     def crop_image(self, file_path):
         """Load and resize a single image for caching."""
         try:
-            img = Image.open(file_path)
-            img = img.convert("RGB")  # Ensure consistent color mode
-
-            # Resize for display.
-            fixed_width, fixed_height = 300, 400
-            img_ratio = img.width / img.height
-            target_ratio = fixed_width / fixed_height
-
-            if img_ratio > target_ratio:
-                new_width = fixed_width
-                new_height = int(fixed_width / img_ratio)
-            else:
-                new_height = fixed_height
-                new_width = int(fixed_height * img_ratio)
-
-            img = img.resize((new_width, new_height), Image.LANCZOS)
+            # Stored rendition, or a reduced-scale decode of the original (see utils/image_utils.py)
+            img = self.load_display_image(file_path)
 
-            return CTkImage(img, size=(fixed_width, fixed_height))
+            return CTkImage(img, size=DISPLAY_SIZE)
 
         except Exception as e:
             print(f"Error preloading image {file_path}: {e}")
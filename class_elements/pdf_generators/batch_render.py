@@ -0,0 +1,183 @@
+"""
+Headless batch re-render of stored prescriptions (e.g. after a logo or layout change).
+
+Streams the `prescriptions` rows, rebuilds each PDF from its data_json with the regular
+Pdf2/3/4ColGenerator classes across a process pool, and replaces each stored file atomically
+(rendered to a temp file next to it, then renamed over it), so a failed or interrupted run
+never leaves a half-written prescription behind. Reports throughput when done.
+
+Imports no Tk modules: safe to run without a display, and alongside the app.
+
+Usage (from the repo root):
+    python -m class_elements.pdf_generators.batch_render
+    python -m class_elements.pdf_generators.batch_render --client-id 42 --workers 4
+    python -m class_elements.pdf_generators.batch_render --data-dir "D:/SkinProData"
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from class_elements.database import get_connection, get_pool
+from utils.date_utils import to_display_date
+
+
+BATCH_WORKERS = max(1, min(8, os.cpu_count() or 1))
+IN_FLIGHT_PER_WORKER = 4    # Rows queued ahead per worker (rows are streamed, never all loaded)
+PROGRESS_EVERY = 100        # Print progress every N finished prescriptions
+
+_generators = None          # Worker process: {column count: generator}
+
+
+class BatchDataManager:
+    """The part of DataDirectoryManager the generators use, without its Tk dialogs."""
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+
+    def get_path(self, subfolder, filename=None):
+        path = os.path.join(self.data_dir, subfolder)
+        if filename:
+            path = os.path.join(path, filename)
+        return path
+
+    @property
+    def db_path(self):
+        return os.path.join(self.data_dir, "skinpro.db")
+
+
+def load_data_dir():
+    """The SkinProData folder chosen in the app (from the pointer file in the user's home directory)."""
+    pointer_path = os.path.join(os.path.expanduser("~"), ".skinpro_config_location.json")
+    if not os.path.exists(pointer_path):
+        raise FileNotFoundError("Global SkinPro pointer not found. Run main SkinPro app first, or pass --data-dir.")
+
+    with open(pointer_path, "r") as f:
+        data_dir = json.load(f).get("data_dir")
+
+    if not data_dir or not os.path.exists(data_dir):
+        raise FileNotFoundError(f"data_dir missing or invalid in pointer config: {data_dir}")
+    return data_dir
+
+
+def column_count(data):
+    return sum(1 for key in data if key.startswith("Col") and key.endswith("_Header"))
+
+
+def stream_prescriptions(db_path, client_id=None):
+    """Yield (id, client_id, full_name, file_path, iso_start_date, data_json) one row at a time."""
+    query = """
+        SELECT p.id, p.client_id, c.full_name, p.file_path, p.start_date, p.data_json
+        FROM prescriptions p JOIN clients c ON c.id = p.client_id
+        WHERE p.data_json IS NOT NULL AND p.data_json != ''
+    """
+    params = ()
+    if client_id is not None:
+        query += " AND p.client_id = ?"
+        params = (client_id,)
+
+    with get_connection(db_path) as conn:
+        yield from conn.execute(query + " ORDER BY p.id", params)
+
+
+### --- Worker Process --- ###
+##############################
+def init_worker(data_dir):
+    """Build the generators once per worker process (reportlab, fonts and the logo load here)."""
+    global _generators
+    from class_elements.pdf_generators.pdf_2col import Pdf2ColGenerator
+    from class_elements.pdf_generators.pdf_3col import Pdf3ColGenerator
+    from class_elements.pdf_generators.pdf_4col import Pdf4ColGenerator
+
+    data_manager = BatchDataManager(data_dir)
+    _generators = {2: Pdf2ColGenerator(data_manager), 3: Pdf3ColGenerator(data_manager), 4: Pdf4ColGenerator(data_manager)}
+
+
+def render_prescription(row):
+    """Re-render one prescription over its stored file. Returns (prescription id, bytes written)."""
+    prescription_id, client_id, client_name, file_path, iso_start_date, data_json = row
+    data = json.loads(data_json)
+
+    generator = _generators.get(column_count(data))
+    if generator is None:
+        raise ValueError(f"Unsupported column count: {column_count(data)}")
+
+    start_date = data.get("start_date") or to_display_date(iso_start_date)
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        generator.generate(client_id, client_name, start_date, data, output_path=temp_path)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, file_path)  # Atomic: viewers see the old PDF or the new one, never a partial file
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return prescription_id, size
+
+
+### --- Batch Run --- ###
+#########################
+def rerender_all(data_dir, client_id=None, workers=BATCH_WORKERS):
+    """Re-render every stored prescription (or one client's). Returns (rendered, failed_ids, seconds)."""
+    db_path = BatchDataManager(data_dir).db_path
+    rendered = 0
+    total_bytes = 0
+    failed = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data_dir,)) as pool:
+        pending = {}
+
+        def collect(done):
+            nonlocal rendered, total_bytes
+            for future in done:
+                row_id = pending.pop(future)
+                try:
+                    _, size = future.result()
+                    rendered += 1
+                    total_bytes += size
+                except Exception as e:
+                    print(f"Failed to re-render prescription {row_id}: {e}")
+                    failed.append(row_id)
+
+                finished = rendered + len(failed)
+                if finished % PROGRESS_EVERY == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {finished} done ({finished / elapsed:.1f} PDFs/s)")
+
+        try:
+            for row in stream_prescriptions(db_path, client_id):
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending[pool.submit(render_prescription, tuple(row))] = row[0]
+
+            collect(wait(pending)[0])
+        finally:
+            get_pool(db_path).release()
+
+    elapsed = time.perf_counter() - start
+    if not rendered and not failed:
+        print("No stored prescriptions to re-render.")
+    if rendered:
+        print(f"Re-rendered {rendered} prescription(s) in {elapsed:.1f}s: "
+              f"{rendered / elapsed:.1f} PDFs/s, {total_bytes / (1024 * 1024) / elapsed:.1f} MB/s written")
+    if failed:
+        print(f"{len(failed)} prescription(s) failed: {', '.join(map(str, sorted(failed)))}")
+    return rendered, failed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render stored prescription PDFs from their saved data.")
+    parser.add_argument("--data-dir", help="SkinProData folder (default: the one chosen in the app)")
+    parser.add_argument("--client-id", type=int, help="Only re-render this client's prescriptions")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or load_data_dir()
+    _, failed, _ = rerender_all(data_dir, client_id=args.client_id, workers=max(1, args.workers))
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,30 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from utils.path_utils import resource_path
 import os
-import re
+from class_elements.pdf_generators.pdf_layout import layout_product_block
+from class_elements.pdf_generators.pdf_template import page_furniture
 
 class Pdf4ColGenerator:
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, compiled_template=True):
         self.data_manager = data_manager
+        self.compiled_template = compiled_template  # Static page content as one shared form XObject (see pdf_template.py)
 
         self.output_dir = self.data_manager.get_path("prescriptions")
         os.makedirs(self.output_dir, exist_ok=True)
 
 
-    def generate(self, client_id, client_name, start_date, steps_dict):
+    def generate(self, client_id, client_name, start_date, steps_dict, output_path=None):
         # === Build subfolder path based on client and form type ===
         form_type = "4-col"
         safe_client_name = client_name.replace(" ", "_")
         folder_name = f"{safe_client_name}_{client_id}"
         client_dir = os.path.join(self.output_dir, folder_name)
-        os.makedirs(client_dir, exist_ok=True)
 
         # === Generate PDF file path ===
         safe_date = start_date.replace("/", "-")  # or "_" if you prefer
         filename = f"{safe_date}_{form_type}.pdf"
-        file_path = os.path.join(client_dir, filename)
+        file_path = output_path or os.path.join(client_dir, filename)  # output_path: render somewhere else (batch re-render)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
         # === Create PDF canvas ===
         c = canvas.Canvas(file_path, pagesize=letter)
@@ -33,60 +34,9 @@ class Pdf4ColGenerator:
         left_margin = 20
         top_margin = 730
 
-        # === Logo ===
-        logo_path = resource_path("icons/corium_logo.webp")
-        c.drawImage(logo_path, 20, top_margin - 60, width=142, height=110, mask='auto')
-
-        # === Title ===
-        c.setFont("Helvetica-Bold", 26)
-        title_1 = "CORIUM CORRECTIVE 360°"
-        title_2 = "SKIN CARE SCRIPT"
-        max_title_width = max(c.stringWidth(title_1, "Helvetica-Bold", 26), c.stringWidth(title_2, "Helvetica-Bold", 26))
-        title_x = width - 20 - max_title_width
-        c.drawString(title_x - 50, top_margin, title_1)
-        c.drawString(title_x, top_margin - 35, title_2)
-
-        # === Header Box Lines ===
-        header_top_y = top_margin - 65
-        header_bottom_y = top_margin - 145
-        c.setLineWidth(0.5)
-        c.line(0, header_top_y, width, header_top_y)
-        c.line(0, header_bottom_y, width, header_bottom_y)
-
-        # === Header Text ===
-        line_spacing = 23
-        header_text_y = header_top_y - 25
-        c.setFont("Helvetica", 10)
-        x = left_margin
-        c.drawString(x, header_text_y, "TRANSFORMING ")
-        x += c.stringWidth("TRANSFORMING ", "Helvetica", 10)
-        c.setFont("Helvetica-Bold", 10)
-        client_text = client_name.upper()
-        c.drawString(x, header_text_y, client_text)
-        x += c.stringWidth(client_text, "Helvetica-Bold", 10)
-        c.setFont("Helvetica", 10)
-        c.drawString(x, header_text_y, " SKIN TO A BETTER DEGREE OF HEALTH.")
-
-        # === Start Date ===
-        y2 = header_text_y - line_spacing
-        c.drawString(left_margin, y2, "START TREATMENT DATE: ")
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(left_margin + c.stringWidth("START TREATMENT DATE: ", "Helvetica", 10), y2, start_date)
-
-        # === Disclaimer ===
-        y3 = y2 - line_spacing
-        c.setFont("Helvetica-Oblique", 10)
-        c.drawString(left_margin, y3, "*CORIUM CORRECTIVE 360° CANNOT BE COMBINED WITH ANY OTHER SKIN CARE PRODUCTS")
-
-        # === Section Title ===
-        section_text = "SKIN CARE ROUTINE & PRODUCTS"
-        y = top_margin - 170
-        c.setFont("Helvetica-Bold", 16)
-        text_width = c.stringWidth(section_text, "Helvetica-Bold", 16)
-        center_x = (width - text_width) / 2
-        c.drawString(center_x, y, section_text)
-        c.setLineWidth(1)
-        c.line(center_x, y - 2, center_x + text_width, y - 2)
+        # === Logo, Title, Header & Section Title (shared page furniture) ===
+        furniture = page_furniture(letter)
+        furniture.draw_header(c, client_name, start_date, compiled=self.compiled_template)
 
         # === Columns ===
         c.setFont("Helvetica", 10)
@@ -117,80 +67,6 @@ class Pdf4ColGenerator:
         c.drawString(col3_x + (col_width - col3_header_width) / 2 - 20, header_y, col3_header)
         c.drawString(col4_x + (col_width - col4_header_width) / 2 - 20, header_y, col4_header)
 
-        def draw_product_block(c, x, y, product, directions, max_width, font_size=10, line_height=12, dry_run=False):
-            c.setFont("Helvetica", font_size)
-            lines_above = 0
-            chunks_per_line = []  # Each line will contain a list of (text, is_highlight)
-
-            # === Step 1: Extract highlight chunks across whole string ===
-            tokens = re.split(r"(\[\[highlight\]\]|\[\[/highlight\]\])", directions)
-            is_highlight = False
-            chunks = []
-
-            for token in tokens:
-                if token == "[[highlight]]":
-                    is_highlight = True
-                elif token == "[[/highlight]]":
-                    is_highlight = False
-                elif token:
-                    chunks.append((token, is_highlight))
-
-            # === Step 2: Wrap chunks into lines (respecting max width) ===
-            current_line = ""
-            current_chunks = []
-
-            for text, hl in chunks:
-                # Split each chunk by newline and re-add newlines as their own chunks
-                parts = re.split(r"(\n)", text)
-                for part in parts:
-                    if part == "\n":
-                        # Force a new line
-                        if current_chunks:
-                            chunks_per_line.append(current_chunks)
-                            current_chunks = []
-                            current_line = ""
-                    elif part:
-                        sub_parts = re.split(r"(\s+)", part)
-                        for sub in sub_parts:
-                            trial = current_line + sub
-                            if c.stringWidth(trial.strip(), "Helvetica", font_size) <= max_width:
-                                current_line += sub
-                                current_chunks.append((sub, hl))
-                            else:
-                                if current_chunks:
-                                    chunks_per_line.append(current_chunks)
-                                current_line = sub
-                                current_chunks = [(sub, hl)]
-
-            if current_chunks:
-                chunks_per_line.append(current_chunks)
-
-            # === Step 3: Draw product title ===
-            if not dry_run:
-                if product.strip():
-                    product_text = f"{product.strip()}:"
-                    product_width = c.stringWidth(product_text, "Helvetica", font_size)
-                    c.drawString(x, y, product_text)
-                    c.setLineWidth(0.6)
-                    c.line(x, y - 2, x + product_width, y - 2)
-                    lines_above = 1
-
-                for idx, chunk_line in enumerate(chunks_per_line):
-                    line_y = y - ((idx + lines_above) * line_height)
-                    draw_x = x
-
-                    for text, hl in chunk_line:
-                        if hl:
-                            c.saveState()
-                            c.setFillAlpha(0.6)
-                            c.setFillColorRGB(1, 1, 0)
-                            text_width = c.stringWidth(text, "Helvetica", font_size)
-                            c.rect(draw_x - 1, line_y - 3, text_width + 1, line_height, fill=True, stroke=0)
-                            c.restoreState()
-                        c.drawString(draw_x, line_y, text)
-                        draw_x += c.stringWidth(text, "Helvetica", font_size)
-
-            return lines_above + len(chunks_per_line)
 
         # === Table Rows ===
         row_height = 12
@@ -203,33 +79,25 @@ class Pdf4ColGenerator:
         col4_data = steps_dict.get("Col4", [])
         max_steps = max(len(col1_data), len(col2_data), len(col3_data), len(col4_data))
         row_heights = []
+        row_blocks = []     # Each block is laid out once, then drawn
 
         for i in range(max_steps):
             col1 = col1_data[i] if i < len(col1_data) else {"product": "", "directions": ""}
             col2 = col2_data[i] if i < len(col2_data) else {"product": "", "directions": ""}
             col3 = col3_data[i] if i < len(col3_data) else {"product": "", "directions": ""}
             col4 = col4_data[i] if i < len(col4_data) else {"product": "", "directions": ""}
-            h1 = draw_product_block(c, col1_x, current_y, col1["product"], col1["directions"], wrap_width, dry_run=True)
-            h2 = draw_product_block(c, col2_x, current_y, col2["product"], col2["directions"], wrap_width, dry_run=True)
-            h3 = draw_product_block(c, col3_x, current_y, col3["product"], col3["directions"], wrap_width, dry_run=True)
-            h4 = draw_product_block(c, col4_x, current_y, col4["product"], col4["directions"], wrap_width, dry_run=True)
-            cell_height = (max(max(h1, h2, h3, h4), min_lines) + 1) * row_height + 5
+            blocks = (
+                layout_product_block(col1["product"], col1["directions"], wrap_width),
+                layout_product_block(col2["product"], col2["directions"], wrap_width),
+                layout_product_block(col3["product"], col3["directions"], wrap_width),
+                layout_product_block(col4["product"], col4["directions"], wrap_width),
+            )
+            cell_height = (max(max(block.line_count for block in blocks), min_lines) + 1) * row_height + 5
             row_heights.append(cell_height)
+            row_blocks.append(blocks)
 
         # === Watermark at Fixed Position ===
-        watermark_path = resource_path("icons/corium_logo.webp")
-        aspect_ratio = 1200 / 930
-        watermark_width = 500
-        watermark_height = watermark_width / aspect_ratio
-
-        # Option 1: Centered on full page
-        watermark_x = (width - watermark_width) / 2
-        watermark_y = 125
-
-        c.saveState()
-        c.setFillAlpha(0.10)
-        c.drawImage(watermark_path, watermark_x, watermark_y, width=watermark_width, height=watermark_height, mask='auto')
-        c.restoreState()
+        furniture.draw_watermark(c, compiled=self.compiled_template)
 
         # === Draw table content ===
         current_y = table_top
@@ -264,10 +132,8 @@ class Pdf4ColGenerator:
             c.drawString(left_margin, current_y, f"STEP {i + 1}")
 
             # Text content
-            draw_product_block(c, col1_x, current_y, col1["product"], col1["directions"], wrap_width)
-            draw_product_block(c, col2_x, current_y, col2["product"], col2["directions"], wrap_width)
-            draw_product_block(c, col3_x, current_y, col3["product"], col3["directions"], wrap_width)
-            draw_product_block(c, col4_x, current_y, col4["product"], col4["directions"], wrap_width)
+            for block, block_x in zip(row_blocks[i], (col1_x, col2_x, col3_x, col4_x)):
+                block.draw(c, block_x, current_y)
 
             current_y -= cell_height
 
@@ -287,11 +153,6 @@ class Pdf4ColGenerator:
         line_y -= final_row_height
         c.line(col1_x - 65, line_y + 10, col4_x + wrap_width + 10, line_y + 10)
 
-        # === Footer ===
-        c.setFont("Helvetica", 10)
-        footer_text = "©2020 CORIUM CORRECTIVE 360° - ALL RIGHTS RESERVED"
-        center_x = (width - c.stringWidth(footer_text, "Helvetica", 10)) / 2
-        c.drawString(center_x, 15, footer_text)
         c.save()
 
         return file_path
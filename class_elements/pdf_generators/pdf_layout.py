@@ -0,0 +1,158 @@
+import re
+from functools import lru_cache
+from reportlab.pdfbase import pdfmetrics
+
+
+BLOCK_FONT = "Helvetica"
+BLOCK_FONT_SIZE = 10
+BLOCK_LINE_HEIGHT = 12
+
+HIGHLIGHT_OPEN = "[[highlight]]"
+HIGHLIGHT_CLOSE = "[[/highlight]]"
+_MARKUP = re.compile(r"(\[\[highlight\]\]|\[\[/highlight\]\])")
+_LINES = re.compile(r"(\n)")
+_WORDS = re.compile(r"(\s+)")
+
+
+class GlyphWidths(dict):
+    """Per-font glyph advance widths in 1/1000 em, measured once per character on first use."""
+    def __init__(self, font_name):
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, char):
+        width = self[char] = pdfmetrics.stringWidth(char, self.font_name, 1000)
+        return width
+
+    def units(self, text):
+        """Width of `text` in 1/1000 em (an exact integer sum for the standard fonts)."""
+        return sum(map(self.__getitem__, text))
+
+
+@lru_cache(maxsize=None)
+def glyph_widths(font_name):
+    return GlyphWidths(font_name)
+
+
+def text_width(text, font_name, font_size):
+    """Same result as canvas.stringWidth() (the standard fonts have no kerning), from the memoised table."""
+    return 0.001 * font_size * glyph_widths(font_name).units(text)
+
+
+def tokenize_directions(directions):
+    """
+    Split directions with [[highlight]] markup into (token, highlighted) pairs: runs of
+    whitespace, words, and "\\n" for forced line breaks. Markup is parsed once, here.
+    """
+    tokens = []
+    highlighted = False
+    for piece in _MARKUP.split(directions):
+        if piece == HIGHLIGHT_OPEN:
+            highlighted = True
+        elif piece == HIGHLIGHT_CLOSE:
+            highlighted = False
+        elif piece:
+            for part in _LINES.split(piece):
+                if part == "\n":
+                    tokens.append(("\n", highlighted))
+                elif part:
+                    tokens.extend((word, highlighted) for word in _WORDS.split(part))
+    return tokens
+
+
+class BlockLayout:
+    """
+    A product block wrapped to a column width: the underlined product title (if any) and the
+    directions as lines of (text, highlighted, width) runs. Built once by layout_product_block();
+    line_count sizes the table row and draw() renders it, without measuring anything again.
+    """
+    def __init__(self, product_text, product_width, lines, font_name, font_size):
+        self.product_text = product_text    # "Product:" or "" (no title line)
+        self.product_width = product_width
+        self.lines = lines                  # [[(text, highlighted, width), ...], ...]
+        self.font_name = font_name
+        self.font_size = font_size
+
+
+    @property
+    def line_count(self):
+        """Wrapped direction lines. The title isn't counted: row heights already add one line for it."""
+        return len(self.lines)
+
+
+    def draw(self, c, x, y, line_height=BLOCK_LINE_HEIGHT):
+        c.setFont(self.font_name, self.font_size)
+        lines_above = 0
+
+        if self.product_text:
+            c.drawString(x, y, self.product_text)
+            c.setLineWidth(0.6)
+            c.line(x, y - 2, x + self.product_width, y - 2)
+            lines_above = 1
+
+        for index, line in enumerate(self.lines):
+            line_y = y - ((index + lines_above) * line_height)
+            draw_x = x
+
+            for text, highlighted, width in line:
+                if highlighted:
+                    c.saveState()
+                    c.setFillAlpha(0.6)
+                    c.setFillColorRGB(1, 1, 0)
+                    c.rect(draw_x - 1, line_y - 3, width + 1, line_height, fill=True, stroke=0)
+                    c.restoreState()
+                c.drawString(draw_x, line_y, text)
+                draw_x += width
+
+
+def layout_product_block(product, directions, max_width, font_name=BLOCK_FONT, font_size=BLOCK_FONT_SIZE):
+    """
+    Wrap a product's directions to `max_width` points. A word moves to the next line when the
+    line, trimmed of surrounding whitespace, would no longer fit (a word wider than the column
+    gets a line of its own). Widths are tracked incrementally in glyph units, so each token is
+    measured once instead of re-measuring the whole line per appended word.
+    """
+    widths = glyph_widths(font_name)
+    scale = 0.001 * font_size
+    lines = []
+    line = []
+    content_units = 0           # Trimmed line width so far (first to last word)
+    trailing_units = 0          # Whitespace after the last word (counts once another word follows)
+    has_content = False
+
+    for text, highlighted in tokenize_directions(directions):
+        if text == "\n":
+            if line:
+                lines.append(line)
+                line, content_units, trailing_units, has_content = [], 0, 0, False
+            continue
+
+        units = widths.units(text)
+        is_space = not text or text.isspace()
+        if is_space:
+            trial_units = content_units
+        elif has_content:
+            trial_units = content_units + trailing_units + units
+        else:
+            trial_units = units
+
+        if scale * trial_units > max_width:
+            if line:
+                lines.append(line)
+            line, content_units, trailing_units, has_content = [], 0, 0, False
+
+        line.append((text, highlighted, scale * units))
+        if is_space:
+            if has_content:
+                trailing_units += units
+        else:
+            content_units = content_units + trailing_units + units if has_content else units
+            trailing_units = 0
+            has_content = True
+
+    if line:
+        lines.append(line)
+
+    product_text = f"{product.strip()}:" if product.strip() else ""
+    product_width = text_width(product_text, font_name, font_size)
+    return BlockLayout(product_text, product_width, lines, font_name, font_size)
@@ -0,0 +1,145 @@
+from functools import lru_cache
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from utils.path_utils import resource_path
+from class_elements.pdf_generators.pdf_layout import text_width
+
+
+LOGO_PATH = "icons/corium_logo.webp"
+LOGO_ASPECT_RATIO = 1200 / 930
+FURNITURE_FORM = "PageFurniture"    # Form XObject name within each prescription PDF
+
+LEFT_MARGIN = 20
+RIGHT_MARGIN = 20
+TOP_MARGIN = 730
+
+TITLE_1 = "CORIUM CORRECTIVE 360°"
+TITLE_2 = "SKIN CARE SCRIPT"
+TRANSFORMING_TEXT = "TRANSFORMING "
+HEALTH_TEXT = " SKIN TO A BETTER DEGREE OF HEALTH."
+START_DATE_LABEL = "START TREATMENT DATE: "
+DISCLAIMER_TEXT = "*CORIUM CORRECTIVE 360° CANNOT BE COMBINED WITH ANY OTHER SKIN CARE PRODUCTS"
+SECTION_TEXT = "SKIN CARE ROUTINE & PRODUCTS"
+FOOTER_TEXT = "©2020 CORIUM CORRECTIVE 360° - ALL RIGHTS RESERVED"
+
+
+@lru_cache(maxsize=None)
+def logo_image():
+    """The logo decoded once per process (ImageReader keeps the pixels and alpha after the first read)."""
+    reader = ImageReader(resource_path(LOGO_PATH))
+    reader.getRGBData()
+    return reader
+
+
+class PageFurniture:
+    """
+    The static content every prescription page shares (2, 3 and 4 columns alike): logo, title
+    block, header rules, the fixed header labels, disclaimer, section title, footer and the
+    watermark. Positions and text widths are worked out once, here.
+
+    Compiled mode (the default) records the furniture once per PDF as a form XObject and places
+    it with doForm(), drawing the logo from the process-wide decoded image, so a prescription
+    only draws its own content. Otherwise it's drawn directly, reading the logo file each time.
+    """
+    def __init__(self, page_size=letter):
+        self.width, self.height = page_size
+
+        self.logo_box = (LEFT_MARGIN, TOP_MARGIN - 60, 142, 110)
+
+        title_width = max(text_width(TITLE_1, "Helvetica-Bold", 26), text_width(TITLE_2, "Helvetica-Bold", 26))
+        title_x = self.width - RIGHT_MARGIN - title_width
+        self.title_1_pos = (title_x - 50, TOP_MARGIN)
+        self.title_2_pos = (title_x, TOP_MARGIN - 35)
+
+        self.header_top_y = TOP_MARGIN - 65
+        self.header_bottom_y = TOP_MARGIN - 145
+
+        line_spacing = 23
+        self.client_line_y = self.header_top_y - 25     # First line padding from top line
+        self.start_date_y = self.client_line_y - line_spacing
+        self.disclaimer_y = self.start_date_y - line_spacing
+        self.client_name_x = LEFT_MARGIN + text_width(TRANSFORMING_TEXT, "Helvetica", 10)
+        self.start_date_x = LEFT_MARGIN + text_width(START_DATE_LABEL, "Helvetica", 10)
+
+        self.section_y = TOP_MARGIN - 170
+        self.section_width = text_width(SECTION_TEXT, "Helvetica-Bold", 16)
+        self.section_x = (self.width - self.section_width) / 2
+
+        self.footer_x = (self.width - text_width(FOOTER_TEXT, "Helvetica", 10)) / 2
+
+        watermark_width = 500
+        watermark_height = watermark_width / LOGO_ASPECT_RATIO
+        self.watermark_box = ((self.width - watermark_width) / 2, 125, watermark_width, watermark_height)
+
+
+    def draw_header(self, c, client_name, start_date, compiled=True):
+        """Draw the page header: the shared furniture, then the client's name and start date."""
+        if compiled:
+            if not c.hasForm(FURNITURE_FORM):
+                c.beginForm(FURNITURE_FORM)
+                self._draw_static(c, logo_image())
+                c.endForm()
+            c.doForm(FURNITURE_FORM)
+        else:
+            self._draw_static(c, resource_path(LOGO_PATH))
+
+        # === Transforming Line (Mixed Weight) ===
+        c.setFont("Helvetica-Bold", 10)
+        client_text = client_name.upper()
+        c.drawString(self.client_name_x, self.client_line_y, client_text)
+        c.setFont("Helvetica", 10)
+        c.drawString(self.client_name_x + text_width(client_text, "Helvetica-Bold", 10), self.client_line_y, HEALTH_TEXT)
+
+        # === Start Date Line ===
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(self.start_date_x, self.start_date_y, start_date)
+
+
+    def draw_watermark(self, c, compiled=True):
+        """Faint logo behind the table (call before the table shading so it stays underneath)."""
+        x, y, width, height = self.watermark_box
+        c.saveState()
+        c.setFillAlpha(0.10)
+        c.drawImage(logo_image() if compiled else resource_path(LOGO_PATH), x, y, width=width, height=height, mask='auto')
+        c.restoreState()
+
+
+    def _draw_static(self, c, logo):
+        # === Logo ===
+        x, y, width, height = self.logo_box
+        c.drawImage(logo, x, y, width=width, height=height, mask='auto')
+
+        # === Title Block (Top Right-Aligned) ===
+        c.setFont("Helvetica-Bold", 26)
+        c.drawString(*self.title_1_pos, TITLE_1)
+        c.drawString(*self.title_2_pos, TITLE_2)
+
+        # === Header Box Lines ===
+        c.setStrokeColorRGB(0, 0, 0)
+        c.setLineWidth(0.5)
+        c.line(0, self.header_top_y, self.width, self.header_top_y)
+        c.line(0, self.header_bottom_y, self.width, self.header_bottom_y)
+
+        # === Header Labels ===
+        c.setFont("Helvetica", 10)
+        c.drawString(LEFT_MARGIN, self.client_line_y, TRANSFORMING_TEXT)
+        c.drawString(LEFT_MARGIN, self.start_date_y, START_DATE_LABEL)
+
+        # === Disclaimer ===
+        c.setFont("Helvetica-Oblique", 10)
+        c.drawString(LEFT_MARGIN, self.disclaimer_y, DISCLAIMER_TEXT)
+
+        # === Section Title + Underline ===
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(self.section_x, self.section_y, SECTION_TEXT)
+        c.setLineWidth(1)
+        c.line(self.section_x, self.section_y - 2, self.section_x + self.section_width, self.section_y - 2)
+
+        # === Footer ===
+        c.setFont("Helvetica", 10)
+        c.drawString(self.footer_x, 15, FOOTER_TEXT)
+
+
+@lru_cache(maxsize=None)
+def page_furniture(page_size=letter):
+    return PageFurniture(page_size)
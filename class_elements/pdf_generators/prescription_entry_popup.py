@@ -1,14 +1,11 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox, Text
 from utils.path_utils import resource_path
-from class_elements.pdf_generators.pdf_2col import Pdf2ColGenerator
-from class_elements.pdf_generators.pdf_3col import Pdf3ColGenerator
-from class_elements.pdf_generators.pdf_4col import Pdf4ColGenerator
 from datetime import datetime
 from PIL import Image, ImageTk
 import pprint
 import re
-import sqlite3
+from class_elements.database import get_connection
 
 
 class PrescriptionEntryPopup(ctk.CTkToplevel):
@@ -38,7 +35,7 @@ class PrescriptionEntryPopup(ctk.CTkToplevel):
 
         # Fetch the client's name
         try:
-            with sqlite3.connect(self.data_manager.db_path) as conn:
+            with get_connection(self.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT full_name FROM clients WHERE id = ?", (self.client_id,))
                 result = cursor.fetchone()
@@ -503,6 +500,11 @@ class PrescriptionEntryPopup(ctk.CTkToplevel):
             messagebox.showerror("Invalid Date", "Please enter the date in MM/DD/YYYY format.")
             return
 
+        # Generators pull in reportlab, so they're imported when a prescription is first generated
+        from class_elements.pdf_generators.pdf_2col import Pdf2ColGenerator
+        from class_elements.pdf_generators.pdf_3col import Pdf3ColGenerator
+        from class_elements.pdf_generators.pdf_4col import Pdf4ColGenerator
+
         if self.num_cols == 2:
             generator = Pdf2ColGenerator(self.data_manager)
         elif self.num_cols == 3:
@@ -0,0 +1,120 @@
+import threading
+from PIL import Image
+from class_elements.database import get_pool
+from class_elements.image_cache import ByteBudgetLRU
+from class_elements.thumbnail_store import ThumbnailStore, PDF_PREVIEW, PDF_PAGE
+
+
+PDF_PREVIEW_DPI = 150       # Poppler render resolution (then downscaled, for smooth text)
+PDF_PREVIEW_WIDTH = 650     # Prescriptions tab preview width
+
+# Raster width per kind. The popup gets the page at full render resolution (1275 px wide for
+# letter), so it downsamples once to its own size (sharper on scaled displays) instead of
+# stretching the tab preview.
+PDF_RENDITION_WIDTHS = {PDF_PREVIEW: PDF_PREVIEW_WIDTH, PDF_PAGE: None}
+DEFAULT_PDF_PREVIEW_CACHE_MB = 48   # A 650x841 preview costs ~1.6 MB, a full 1275x1650 page ~6.3 MB
+
+
+class PdfPreviewCache:
+    """
+    First-page preview rasters of prescription PDFs, so selecting a prescription doesn't spawn
+    poppler every time.
+
+    Previews are keyed by the PDF's path + mtime + size (a regenerated or edited PDF simply
+    misses): a memory LRU in front of the persistent ThumbnailStore, where a render is saved the
+    first time a PDF is previewed (normally right after it's generated). peek() only checks
+    memory and is meant for the Tk thread; get() and prerender_async() may hit the disk or
+    poppler and run off it. Each takes the kind of raster wanted: PDF_PREVIEW (tab preview
+    width, the default) or PDF_PAGE (full render resolution). Safe to use from several threads.
+    """
+    def __init__(self, store=None, budget_mb=DEFAULT_PDF_PREVIEW_CACHE_MB):
+        self.store = store                  # Optional ThumbnailStore for persistence
+        self.previews = ByteBudgetLRU(budget_mb, "pdf previews")
+        self._lock = threading.Lock()
+
+
+    def peek(self, pdf_path, kind=PDF_PREVIEW):
+        """The preview if it's in memory (no disk I/O), else None."""
+        key = ThumbnailStore.source_key(pdf_path)
+        if key is None:
+            return None
+        with self._lock:
+            return self.previews.get((key, kind))
+
+
+    def get(self, pdf_path, kind=PDF_PREVIEW):
+        """The preview from memory, the store, or a fresh render (stored for next time). None if the PDF is gone."""
+        key = ThumbnailStore.source_key(pdf_path)
+        if key is None:
+            return None
+
+        with self._lock:
+            image = self.previews.get((key, kind))
+        if image is not None:
+            return image
+
+        width = PDF_RENDITION_WIDTHS[kind]
+        if self.store:
+            image = self.store.load(key, (width, None), kind=kind)
+
+        if image is None:
+            image = render_pdf_preview(pdf_path, width)
+            if image is None:
+                return None
+            if self.store:
+                self.store.save(key, image, kind=kind)
+
+        with self._lock:
+            self.previews.put((key, kind), image)
+        return image
+
+
+    def prerender_async(self, pdf_path, callback=None, kind=PDF_PREVIEW):
+        """
+        Get a preview in the background (e.g. a just-generated PDF's), then call callback(image) from
+        that thread; image is None if the PDF is gone or couldn't be rendered.
+        """
+        def work():
+            image = None
+            try:
+                image = self.get(pdf_path, kind)
+            except Exception as e:
+                print(f"Error pre-rendering PDF preview for {pdf_path}: {e}")
+            finally:
+                self.release_thread()
+
+            if callback:
+                callback(image)
+
+        threading.Thread(target=work, daemon=True, name="PdfPreviewPrerender").start()
+
+
+    def release_thread(self):
+        """Close the calling thread's store connection (call at the end of a short-lived worker thread)."""
+        if self.store:
+            get_pool(self.store.db_path).release()
+
+
+    def discard(self, pdf_path):
+        """Forget a deleted PDF's stored preview (memory entries expire on their own: the key includes the mtime)."""
+        if self.store:
+            self.store.discard(pdf_path)
+
+
+def render_pdf_preview(pdf_path, width=PDF_PREVIEW_WIDTH):
+    """
+    Render the first page with poppler and scale it to `width` (aspect ratio kept; None keeps the
+    render resolution). None if the PDF has no pages.
+    """
+    from pdf2image import convert_from_path
+    pages = convert_from_path(pdf_path, dpi=PDF_PREVIEW_DPI, first_page=1, last_page=1)
+
+    if not pages:
+        print("No pages found in PDF.")
+        return None
+
+    image = pages[0]
+    if width is None:
+        return image
+    height = int(width * image.height / image.width)
+    return image.resize((width, height), Image.LANCZOS)
@@ -0,0 +1,128 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from class_elements.database import get_connection, get_pool
+from class_elements.thumbnail_store import THUMBNAIL, DISPLAY, THUMBNAIL_SIZE, DISPLAY_SIZE
+from utils.image_utils import make_renditions
+from utils.path_utils import unique_destinations
+
+
+INGEST_WORKERS = max(2, min(8, (os.cpu_count() or 2)))  # Copies are mostly I/O; decodes release the GIL
+DISPLAY_PREWARM = 12    # Display renditions cached in memory for the first N photos (the cache is bounded anyway)
+
+
+class PhotoIngestJob:
+    """
+    Imports a batch of photos off the Tk thread.
+
+    Files are copied by a small thread pool; as each one lands its thumbnail and display renditions
+    are rendered from one decode and saved to the ThumbnailStore (so browsing never decodes the
+    original again), and for the first few the display rendition is also handed to the ImageCache.
+    All photo rows are then inserted in one transaction. on_progress(done, total) and on_done(imported_paths, failures) run on the Tk thread.
+    """
+    def __init__(self, widget, file_paths, folder, db_path, photo_row, thumbnail_store=None, image_cache=None,
+                 on_progress=None, on_done=None, max_workers=INGEST_WORKERS):
+        self.widget = widget                    # Any Tk widget (used for after())
+        self.file_paths = list(file_paths)
+        self.folder = folder
+        self.db_path = db_path
+        self.photo_row = photo_row              # (client_id, appointment_id, iso_appt_date, type) for every photo
+        self.thumbnail_store = thumbnail_store
+        self.image_cache = image_cache
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.max_workers = max_workers
+
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="PhotoIngest").start()
+
+
+    def _run(self):
+        total = len(self.file_paths)
+        imported = [None] * total               # Destination per source, kept in selection order
+        failures = []
+
+        try:
+            destinations = unique_destinations(self.file_paths, self.folder)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="PhotoIngestWorker") as pool:
+                futures = {
+                    pool.submit(self._ingest_one, source, destination, index < DISPLAY_PREWARM): index
+                    for index, (source, destination) in enumerate(zip(self.file_paths, destinations))
+                }
+
+                for done, future in enumerate(as_completed(futures), start=1):
+                    index = futures[future]
+                    try:
+                        destination, renditions = future.result()
+                        imported[index] = destination
+                        if renditions and self.thumbnail_store:
+                            key = self.thumbnail_store.source_key(destination)
+                            if key:
+                                self.thumbnail_store.save_all(key, renditions)
+                    except Exception as e:
+                        print(f"Failed to import {self.file_paths[index]}: {e}")
+                        failures.append(self.file_paths[index])
+
+                    self._post(self.on_progress, done, total)
+
+            imported = [path for path in imported if path]
+            self._insert_rows(imported)
+
+        except Exception as e:
+            print(f"Photo import failed: {e}")
+            for path in imported:
+                if path and os.path.exists(path):
+                    os.remove(path)  # No photo rows point at these copies
+            imported, failures = [], list(self.file_paths)
+
+        finally:
+            get_pool(self.db_path).release()
+            if self.thumbnail_store:
+                get_pool(self.thumbnail_store.db_path).release()
+
+        self._post(self.on_done, imported, failures)
+
+
+    def _ingest_one(self, source, destination, prewarm_display):
+        """Worker thread: copy one file, then render its renditions ([(kind, size, image), ...], empty on failure)."""
+        try:
+            shutil.copy(source, destination)
+        except Exception:
+            if os.path.exists(destination):
+                os.remove(destination)  # Don't leave a partial copy behind
+            raise
+
+        try:
+            thumbnail, display_image = make_renditions(destination, THUMBNAIL_SIZE, DISPLAY_SIZE)
+        except Exception as e:
+            print(f"Could not render previews for {destination}: {e}")  # The copy itself succeeded
+            return destination, []
+
+        if prewarm_display and self.image_cache:
+            self._post(self.image_cache.cache_display_image, destination, display_image)
+        return destination, [(THUMBNAIL, THUMBNAIL_SIZE, thumbnail), (DISPLAY, DISPLAY_SIZE, display_image)]
+
+
+    def _insert_rows(self, imported):
+        if not imported:
+            return
+
+        client_id, appointment_id, appt_date, appt_type = self.photo_row
+        with get_connection(self.db_path) as conn:  # One transaction for the whole batch
+            conn.executemany(
+                "INSERT INTO photos (client_id, appointment_id, appt_date, file_path, type) VALUES (?, ?, ?, ?, ?)",
+                [(client_id, appointment_id, appt_date, path, appt_type) for path in imported]
+            )
+            conn.execute("UPDATE appointments SET photos_taken = 'Yes' WHERE id = ?", (appointment_id,))
+
+
+    def _post(self, callback, *args):
+        if callback is None:
+            return
+        try:
+            self.widget.after(0, callback, *args)
+        except RuntimeError:
+            pass  # Main loop is gone (app closing)
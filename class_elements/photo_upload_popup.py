@@ -1,15 +1,17 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import shutil
 import os
 from upload_server.qr_helper import generate_upload_qr
 from PIL import Image
 from customtkinter import CTkImage
 import subprocess
 import sys
-import sqlite3
-import datetime
+from class_elements.database import get_connection
+from class_elements.event_bus import event_bus, PHOTO_UPLOADED, PROFILE_UPDATED
+from class_elements.photo_ingest import PhotoIngestJob
+from utils.image_ingest import save_profile_picture
 from utils.path_utils import resource_path
+from utils.date_utils import to_iso_date
 import tempfile
 import threading
 import time
@@ -22,7 +24,7 @@ class PhotoUploadPopup(ctk.CTkToplevel):
         self.geometry("300x150")
         self.resizable(False, False)
 
-        self._polling_task = None
+        self._listening = False
         self.profile_card = profile_card
         self.is_profile_upload = profile_card is not None
         self.qr_mode_enabled = False
@@ -34,7 +36,6 @@ class PhotoUploadPopup(ctk.CTkToplevel):
         self.parent = parent
         self.main_app = main_app
         self._launch_settings_after_close = False
-        self.start_time = datetime.datetime.now().timestamp()
 
         self.qr_icon = CTkImage(light_image=Image.open(resource_path("icons/qr_code.png")), size=(20, 20))
         self.upload_icon = CTkImage(light_image=Image.open(resource_path("icons/upload.png")), size=(20, 20))
@@ -73,24 +74,27 @@ class PhotoUploadPopup(ctk.CTkToplevel):
         inner_button_row.columnconfigure((0, 1), weight=0)
 
         # Enable QR Button (Left)
-        ctk.CTkButton(
+        qr_button = ctk.CTkButton(
             inner_button_row,
             text="QR",
             image=self.qr_icon,
             compound="left",
             command=self.enable_qr_mode,
             width=90  # slightly wider for better icon+text layout
-        ).grid(row=0, column=0, padx=(0, 5))
+        )
+        qr_button.grid(row=0, column=0, padx=(0, 5))
 
         # Upload Local Button (Right)
-        ctk.CTkButton(
+        local_button = ctk.CTkButton(
             inner_button_row,
             text="Local",
             image=self.upload_icon,
             compound="left",
             command=self.upload_local_photos,
             width=90
-        ).grid(row=0, column=1, padx=(5, 0))
+        )
+        local_button.grid(row=0, column=1, padx=(5, 0))
+        self.upload_buttons = (qr_button, local_button)
 
         self.center_frame = None
         self.qr_label = None
@@ -104,7 +108,7 @@ class PhotoUploadPopup(ctk.CTkToplevel):
 
         self.qr_mode_enabled = True
         self.generate_qr()
-        self.start_polling()
+        self.start_listening()
 
 
     def upload_local_photos(self):
@@ -118,18 +122,16 @@ class PhotoUploadPopup(ctk.CTkToplevel):
                     return
 
                 safe_name = self.client_name.replace(" ", "_")
-                filename = f"{safe_name}_id_{self.client_id}.png"
-                save_path = os.path.join(self.main_app.data_manager.profile_pics_dir, filename)
 
                 try:
-                    image = Image.open(file_path)
-                    image.save(save_path)
+                    # Copy the original bytes (named for their real format; orientation is applied on display)
+                    save_path = save_profile_picture(file_path, self.main_app.data_manager.profile_pics_dir, f"{safe_name}_id_{self.client_id}")
                 except Exception as e:
                     print(f"Error saving image: {e}")
                     messagebox.showerror("Error", "The selected image could not be processed.")
                     return
 
-                with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+                with get_connection(self.main_app.data_manager.db_path) as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         UPDATE clients SET profile_picture = ? WHERE id = ?
@@ -172,34 +174,62 @@ class PhotoUploadPopup(ctk.CTkToplevel):
             if not file_paths:
                 return
 
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                for file_path in file_paths:
-                    filename = os.path.basename(file_path)
-                    new_path = os.path.join(client_folder, filename)
-                    counter = 1
-                    while os.path.exists(new_path):
-                        name, ext = os.path.splitext(filename)
-                        new_path = os.path.join(client_folder, f"{name}_{counter}{ext}")
-                        counter += 1
-                    shutil.copy(file_path, new_path)
-                    cursor.execute(
-                        "INSERT INTO photos (client_id, appointment_id, appt_date, file_path, type) VALUES (?, ?, ?, ?, ?)",
-                        (self.client_id, self.appointment_id, self.appointment_date, new_path, self.appt_type)
-                    )
+            # Copy, render previews and insert in the background; the popup only shows progress
+            self.show_import_progress(len(file_paths))
+            PhotoIngestJob(
+                self.main_app, file_paths, client_folder, self.main_app.data_manager.db_path,
+                (self.client_id, self.appointment_id, to_iso_date(self.appointment_date), self.appt_type),
+                thumbnail_store=self.main_app.image_loader.store,
+                image_cache=self.main_app.image_cache,
+                on_progress=self.update_import_progress,
+                on_done=self.finish_import,
+            ).start()
 
-                cursor.execute("UPDATE appointments SET photos_taken = 'Yes' WHERE id = ?", (self.appointment_id,))
+        except Exception as e:
+            print(f"Failed to upload photos: {e}")
+            messagebox.showerror("Error", "Failed to upload photos. Please try again.")
 
-            if "Photos" in self.main_app.tabs:
-                self.main_app.tabs["Photos"].refresh_photos_list(self.client_id)
 
-            self.main_app.tabs["Appointments"].load_client_appointments(self.client_id)
+    def show_import_progress(self, total):
+        """Replace the upload buttons' action area with a progress bar while photos import."""
+        for button in self.upload_buttons:
+            button.configure(state="disabled")
+        self.protocol("WM_DELETE_WINDOW", lambda: None)  # Keep the popup open until the import finishes
+        self.geometry("300x210")
 
-            self.after(100, lambda: self._show_success_and_close(len(file_paths)))
+        self.progress_frame = ctk.CTkFrame(self.nametowidget(self.winfo_children()[0]), fg_color="transparent")
+        self.progress_frame.grid(row=3, column=0, pady=(10, 0), sticky="ew")
+        self.progress_frame.columnconfigure(0, weight=1)
 
-        except Exception as e:
-            print(f"Failed to upload photos: {e}")
-            messagebox.showerror("Error", "Failed to upload photos. Please try again.")
+        self.import_progress_bar = ctk.CTkProgressBar(self.progress_frame)
+        self.import_progress_bar.grid(row=0, column=0, padx=10, sticky="ew")
+        self.import_progress_bar.set(0)
+
+        self.import_progress_label = ctk.CTkLabel(self.progress_frame, text=f"Importing 0/{total}...")
+        self.import_progress_label.grid(row=1, column=0)
+
+
+    def update_import_progress(self, done, total):
+        if not self.winfo_exists():
+            return
+        self.import_progress_bar.set(done / total)
+        self.import_progress_label.configure(text=f"Importing {done}/{total}...")
+
+
+    def finish_import(self, imported, failures):
+        self.main_app.refresh_tab("Photos")
+        self.main_app.refresh_tab("Appointments")
+
+        if not self.winfo_exists():
+            return
+
+        if failures:
+            names = "\n".join(os.path.basename(path) for path in failures[:10])
+            more = f"\n...and {len(failures) - 10} more" if len(failures) > 10 else ""
+            messagebox.showwarning("Upload Incomplete", f"{len(imported)} photo(s) uploaded.\n\nThese could not be imported:\n{names}{more}")
+            self._cleanup_and_close()
+        else:
+            self._show_success_and_close(len(imported))
 
 
     def _show_success_and_close(self, num_uploaded):
@@ -208,9 +238,7 @@ class PhotoUploadPopup(ctk.CTkToplevel):
 
 
     def _cleanup_and_close(self):
-        if self._polling_task:
-            self.after_cancel(self._polling_task)
-            self._polling_task = None
+        self.stop_listening()
 
         # Delay destruction and trigger the next popup after
         self.after(100, self._delayed_close)
@@ -224,18 +252,13 @@ class PhotoUploadPopup(ctk.CTkToplevel):
 
 
     def _delayed_profile_success(self):
-        if self._polling_task:
-            self.after_cancel(self._polling_task)
-            self._polling_task = None
+        self.stop_listening()
 
         print("Closing popup — final success handler.")
 
-        should_launch_editor = False
-        if self.profile_card:
-            print("Loaded profile_card — refreshing client data")
-            self.profile_card.load_client(self.client_id)
-            should_launch_editor = True
-        else:
+        # The profile card already reloaded: ClientApp handles profile_updated before this popup
+        should_launch_editor = self.profile_card is not None
+        if not should_launch_editor:
             print("No profile_card available. Skipping editor popup.")
 
         self.destroy()
@@ -304,96 +327,54 @@ class PhotoUploadPopup(ctk.CTkToplevel):
             sys._flask_thread = t
 
 
-    def start_polling(self):
-        if self._polling_task is not None:
-            self.after_cancel(self._polling_task)
-        self._polling_task = self.after(3000, self.check_for_uploaded_photos)
-
-
-    def check_for_uploaded_photos(self):
-        if not self.qr_mode_enabled:
-            return  # Exit immediately if QR mode isn't active
-
-        try:
-            conn = sqlite3.connect(self.main_app.data_manager.db_path, check_same_thread=False)
-            cursor = conn.cursor()
-
-            if getattr(self, "is_profile_upload", False):
-                # === Profile Picture Upload Mode ===
-                cursor.execute("SELECT profile_picture FROM clients WHERE id = ?", (self.client_id,))
-                result = cursor.fetchone()
-                conn.close()
-
-                if not result or not result[0] or not os.path.exists(result[0]):
-                    self._polling_task = self.after(3000, self.check_for_uploaded_photos)
-                    return
-
-                modified_time = os.path.getmtime(result[0])
-                if modified_time < self.start_time:
-                    print("File exists but not newly modified. Waiting...")
-                    self._polling_task = self.after(3000, self.check_for_uploaded_photos)
-                    return
-
-                self.status_label.configure(text="Profile Picture Uploaded")
+    def start_listening(self):
+        """Wait for the upload server's event for this client (delivered on the Tk thread, no DB polling)."""
+        if self._listening:
+            return
+        self._listening = True
+        if self.is_profile_upload:
+            event_bus.subscribe(PROFILE_UPDATED, self.on_profile_updated)
+        else:
+            event_bus.subscribe(PHOTO_UPLOADED, self.on_photos_uploaded)
 
-                if self._polling_task:
-                    self.after_cancel(self._polling_task)
-                    self._polling_task = None
 
-                print("Upload complete. Waiting briefly before closing and opening popup...")
-                self.after(400, self._delayed_profile_success)
-                return
+    def stop_listening(self):
+        if not self._listening:
+            return
+        self._listening = False
+        event_bus.unsubscribe(PROFILE_UPDATED, self.on_profile_updated)
+        event_bus.unsubscribe(PHOTO_UPLOADED, self.on_photos_uploaded)
 
-            # === Appointment Photo Upload Mode ===
-            cursor.execute("""
-                SELECT COUNT(*) FROM photos
-                WHERE client_id = ? AND appointment_id = ?
-            """, (self.client_id, self.appointment_id))
-            count = cursor.fetchone()[0]
-            conn.close()
-
-            if not hasattr(self, "initial_photo_count"):
-                self.initial_photo_count = count
-                self.last_seen_count = count
-                self.stable_count_checks = 0
-                self._polling_task = self.after(2000, self.check_for_uploaded_photos)
-                return
 
-            if count > self.initial_photo_count:
-                if not getattr(self, "_uploading_started", False):
-                    self._uploading_started = True
-                    self.status_label.configure(text="Uploading... Please wait")
+    def on_photos_uploaded(self, client_id, appointment_id, file_paths):
+        if client_id != self.client_id or appointment_id != self.appointment_id:
+            return  # Another appointment's upload
 
-                if count == self.last_seen_count:
-                    self.stable_count_checks += 1
-                else:
-                    self.stable_count_checks = 1
+        print(f"Received {len(file_paths)} photo(s) from the upload server")
+        self.status_label.configure(image="")
+        self.finish_success_popup(len(file_paths))
 
-                self.last_seen_count = count
 
-                if self.stable_count_checks >= 2:
-                    print(f"Final photo count stabilized at {count}")
-                    self.status_label.configure(image="")
-                    self.finish_success_popup(count - self.initial_photo_count)
-                    return
-            else:
-                self.stable_count_checks = 0
-                self.last_seen_count = count
+    def on_profile_updated(self, client_id, file_path):
+        if client_id != self.client_id:
+            return
 
-            self._polling_task = self.after(2000, self.check_for_uploaded_photos)
+        self.stop_listening()
+        self.status_label.configure(text="Profile Picture Uploaded")
 
-        except Exception as e:
-            print(f"Error checking for uploaded photos: {e}")
-            self._polling_task = self.after(3000, self.check_for_uploaded_photos)
+        print("Upload complete. Waiting briefly before closing and opening popup...")
+        self.after(400, self._delayed_profile_success)
 
 
     def finish_success_popup(self, num_uploaded):
-        if self._polling_task:
-            self.after_cancel(self._polling_task)
-            self._polling_task = None
+        self.stop_listening()
 
+        # ClientApp already refreshed the Photos/Appointments tabs for this event
         self.status_label.configure(text="Upload Complete!")
         messagebox.showinfo("Upload Complete", f"{num_uploaded} photo(s) uploaded successfully!")
-        self.main_app.tabs["Photos"].refresh_photos_list(self.client_id)
-        self.main_app.tabs["Appointments"].load_client_appointments(self.client_id)
         self.destroy()
+
+
+    def destroy(self):
+        self.stop_listening()  # Closed with the window's X while waiting for an upload
+        super().destroy()
@@ -3,9 +3,10 @@ import customtkinter as ctk
 from PIL import Image, ImageOps, ImageDraw, ImageFile
 from tkinter import filedialog
 from utils.path_utils import resource_path
+from utils.image_utils import open_upright
 from class_elements.photo_upload_popup import PhotoUploadPopup
 ImageFile.LOAD_TRUNCATED_IMAGES = True
-import sqlite3
+from class_elements.database import get_connection
 
 
 # Image size
@@ -60,20 +61,9 @@ class ProfileCard:
             self.name_label.configure(text=self.full_name)
             return
 
-        # --- Fetch from database ---
-        try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT c.full_name, c.profile_picture, COALESCE(ci.zoom, 100), COALESCE(ci.shift, 0)
-                    FROM clients c
-                    LEFT JOIN client_images ci ON c.id = ci.client_id
-                    WHERE c.id = ?
-                """, (client_id,))
-                client_data = cursor.fetchone()
-        except Exception as e:
-            print(f"Error loading client from database: {e}")
-            client_data = None
+        # --- Fetch from the shared client record (cached per client) ---
+        record = self.main_app.client_data.fetch(client_id)
+        client_data = record["profile"] if record else None
 
         if not client_data:
             print(f"⚠ No saved client found for ID: {client_id}. Using default.")
@@ -97,7 +87,7 @@ class ProfileCard:
             if os.path.abspath(self.profile_path) == os.path.abspath(default_path):
                 self.profile_image = ctk.CTkImage(Image.open(default_path), size=(w, h))
             else:
-                processed_image = self.create_circular_image(Image.open(self.profile_path))
+                processed_image = self.create_circular_image(open_upright(self.profile_path))
                 self.profile_image = ctk.CTkImage(processed_image, size=(w, h))
         except Exception as e:
             print(f"Error processing image: {e}")
@@ -119,7 +109,7 @@ class ProfileCard:
             save_path = os.path.join(self.data_manager.profile_pics_dir, "temp_profile.png")
         else:
             try:
-                with sqlite3.connect(self.data_manager.db_path) as conn:
+                with get_connection(self.data_manager.db_path) as conn:
                     cursor = conn.cursor()
                     cursor.execute("SELECT full_name FROM clients WHERE id = ?", (self.client_id,))
                     result = cursor.fetchone()
@@ -141,7 +131,7 @@ class ProfileCard:
                 return
 
         # **Step 2: Process and Save Image**
-        edited_image = self.create_circular_image(Image.open(self.profile_path))
+        edited_image = self.create_circular_image(open_upright(self.profile_path))
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
         edited_image.save(save_path)
 
@@ -156,7 +146,7 @@ class ProfileCard:
 
         # **Step 4 + 5: Update clients and client_images tables**
         try:
-            with sqlite3.connect(self.data_manager.db_path) as conn:
+            with get_connection(self.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 # Update profile picture path
@@ -287,7 +277,7 @@ class ProfileCard:
 
     def load_circular_image(self, image_path):
         """Load and convert an image to a circular format."""
-        image = Image.open(image_path)
+        image = open_upright(image_path)
         circular_image = self.create_circular_image(image)
         return ctk.CTkImage(circular_image, size=(w, h))  # Convert to Tkinter-compatible format
 
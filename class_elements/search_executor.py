@@ -0,0 +1,110 @@
+import threading
+
+
+DEFAULT_DEBOUNCE_MS = 150   # Wait this long after the last keystroke before searching
+
+
+class SearchExecutor:
+    """
+    Debounced, latest-wins background search for one type-ahead widget.
+
+    submit() restarts the debounce timer. When it fires, the search runs on the shared
+    search worker thread and its result is posted back to the Tk thread with after().
+    Every submit()/cancel() bumps a generation counter; a search whose generation is no
+    longer current is dropped before it runs, and its result is dropped if it finishes late.
+    """
+    def __init__(self, widget, on_result, debounce_ms=DEFAULT_DEBOUNCE_MS):
+        self.widget = widget                # Any Tk widget (used for after())
+        self.on_result = on_result          # Called on the Tk thread with the latest search's result
+        self.debounce_ms = debounce_ms
+        self._generation = 0
+        self._after_id = None
+
+
+    def submit(self, search_func):
+        """Schedule `search_func()` to run in the background, superseding any pending search."""
+        generation = self._next_generation()
+        self._after_id = self.widget.after(self.debounce_ms, lambda: self._dispatch(generation, search_func))
+
+
+    def cancel(self):
+        """Drop any pending or running search (e.g. the search box was cleared)."""
+        self._next_generation()
+
+
+    def _next_generation(self):
+        self._generation += 1
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        return self._generation
+
+
+    def _dispatch(self, generation, search_func):
+        """Debounce window elapsed (Tk thread): hand the search to the worker."""
+        self._after_id = None
+        if generation == self._generation:
+            _get_search_worker().post(self, generation, search_func)
+
+
+    def _run(self, generation, search_func):
+        """Run a search on the worker thread and post its result back to the Tk thread."""
+        if generation != self._generation:
+            return  # Superseded while waiting for the worker
+
+        try:
+            result = search_func()
+        except Exception as e:
+            print(f"Background search failed: {e}")
+            return
+
+        if generation != self._generation:
+            return  # Superseded while running
+
+        try:
+            self.widget.after(0, lambda: self._deliver(generation, result))
+        except RuntimeError:
+            pass  # Main loop is gone (app closing)
+
+
+    def _deliver(self, generation, result):
+        if generation == self._generation:
+            self.on_result(result)
+
+
+class _SearchWorker(threading.Thread):
+    """Single background thread shared by every SearchExecutor. Keeps only the latest job per executor."""
+    def __init__(self):
+        super().__init__(daemon=True, name="SearchWorker")  # Daemon thread stops when the app closes
+        self._jobs = {}                     # {SearchExecutor: (generation, search_func)}
+        self._condition = threading.Condition()
+
+
+    def post(self, executor, generation, search_func):
+        with self._condition:
+            self._jobs[executor] = (generation, search_func)  # Replaces any queued job from the same widget
+            self._condition.notify()
+
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._jobs:
+                    self._condition.wait()
+                executor, (generation, search_func) = self._jobs.popitem()
+
+            executor._run(generation, search_func)
+
+
+_search_worker = None
+_search_worker_lock = threading.Lock()
+
+
+def _get_search_worker():
+    """Return the shared search worker, starting it on first use."""
+    global _search_worker
+    with _search_worker_lock:
+        if _search_worker is None:
+            _search_worker = _SearchWorker()
+            _search_worker.start()
+        return _search_worker
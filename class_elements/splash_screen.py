@@ -2,6 +2,7 @@ import customtkinter as ctk
 from PIL import Image
 import time
 from utils.path_utils import resource_path
+from utils import startup_timing
 
 
 class SplashScreen(ctk.CTkToplevel):
@@ -43,8 +44,8 @@ class SplashScreen(ctk.CTkToplevel):
         self.progress_bar.place(x=0, rely=1.0, relwidth=1.0, anchor="sw")
         self.progress_bar.set(0)
 
-        # Timer Logic
-        self.start_time = time.time()
+        # Timer Logic (counts from process launch, not from when the splash appeared)
+        self.start_time = startup_timing.PROCESS_START
         self.timer_running = True
         self.update_timer()
 
@@ -68,7 +69,7 @@ class SplashScreen(ctk.CTkToplevel):
         if not hasattr(self, 'timer_running') or not self.timer_running:
             return  # Prevent AttributeError if called after destruction
 
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.perf_counter() - self.start_time
         self.timer_label.configure(text=f"Elapsed Time: {elapsed_time:.0f}s")
         self.after(100, self.update_timer)  # Update every 100ms
 
@@ -76,5 +77,5 @@ class SplashScreen(ctk.CTkToplevel):
     def stop_timer(self):
         """Stops the timer when loading completes."""
         self.timer_running = False  # Prevent further updates
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.perf_counter() - self.start_time
         self.timer_label.configure(text=f"Total Time: {elapsed_time:.0f}s")
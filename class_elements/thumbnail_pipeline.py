@@ -0,0 +1,137 @@
+import itertools
+import os
+import queue
+import threading
+from PIL import ImageTk
+from class_elements.thumbnail_store import THUMBNAIL, DISPLAY, THUMBNAIL_SIZE, DISPLAY_SIZE
+from utils.image_utils import make_square_thumbnail, make_renditions, square_thumbnail
+
+
+THUMBNAIL_WORKERS = max(2, min(4, os.cpu_count() or 2))   # PIL releases the GIL while decoding/resizing
+
+# Task priorities (lower runs first). Photo list rows use their row index, so the top of the list fills in first.
+PRIORITY_VISIBLE = 0
+PRIORITY_PRELOAD = 1_000_000
+
+
+class ThumbnailPipeline:
+    """
+    Pool of worker threads that decode and resize photo thumbnails in parallel.
+    With a ThumbnailStore, workers read the stored pre-encoded thumbnail first. On a miss they
+    crop it from the stored display rendition if there is one; only otherwise is the original
+    decoded, once, for both renditions (stored so the before/after preview doesn't decode it again).
+
+    Tasks are taken in priority order. cancel_pending() (called on a client switch) bumps a
+    generation counter, so queued tasks for the previous client are skipped and results
+    that finish late are dropped. Only the ImageTk.PhotoImage construction, caching and
+    Treeview update happen on the Tk thread, posted there with after().
+    """
+    def __init__(self, image_cache, update_ui_callback, store=None, max_workers=THUMBNAIL_WORKERS):
+        self.image_cache = image_cache                  # Reference to shared image cache
+        self.store = store                              # Optional persistent ThumbnailStore
+        self.update_ui_callback = update_ui_callback    # Called on the Tk thread with (photo_id, PhotoImage)
+        self.tk_root = None                             # Set by set_ui() once the main window exists
+        self.max_workers = max_workers
+
+        self.task_queue = queue.PriorityQueue()         # (priority, sequence, generation, file_path, photo_id)
+        self._sequence = itertools.count()              # FIFO order within a priority
+        self._generation = 0
+        self._workers = []
+
+
+    def start(self):
+        """Start the worker threads."""
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._work, daemon=True, name=f"ThumbnailWorker-{index}")  # Daemon threads stop when the app closes
+            worker.start()
+            self._workers.append(worker)
+        print(f"Thumbnail pipeline started with {self.max_workers} workers...")
+
+        if self.store:
+            threading.Thread(target=self._prune_store, daemon=True, name="ThumbnailStorePrune").start()
+
+
+    def _prune_store(self):
+        try:
+            self.store.prune_missing()
+        finally:
+            self.store.release_thread()
+
+
+    def set_ui(self, tk_root, update_ui_callback):
+        """Connect the pipeline to the Tk main window and the Photos tab's thumbnail callback."""
+        self.tk_root = tk_root
+        self.update_ui_callback = update_ui_callback
+
+
+    def add_task(self, file_path, photo_id, priority=PRIORITY_VISIBLE):
+        """Queue a thumbnail for generation. With photo_id None it is only cached (startup warm-up)."""
+        self.task_queue.put((priority, next(self._sequence), self._generation, file_path, photo_id))
+
+
+    def cancel_pending(self):
+        """Drop every queued task and any in-flight result (e.g. the selected client changed)."""
+        self._generation += 1
+
+
+    def stop(self):
+        """Stop the worker threads once they finish their current task."""
+        self.cancel_pending()
+        for _ in self._workers:
+            self.task_queue.put((-1, next(self._sequence), None, None, None))  # Sentinel, sorted ahead of real tasks
+        self._workers.clear()
+
+
+    def _work(self):
+        while True:
+            _, _, generation, file_path, photo_id = self.task_queue.get()
+            if generation is None:
+                return  # Stop sentinel
+            if generation != self._generation:
+                continue  # Cancelled by a client switch
+
+            try:
+                image = self._load_thumbnail(file_path)
+            except Exception as e:
+                print(f"Error generating thumbnail for {file_path}: {e}")
+                continue
+
+            if image is None or generation != self._generation or self.tk_root is None:
+                continue
+
+            try:
+                self.tk_root.after(0, self._finish, generation, file_path, photo_id, image)
+            except RuntimeError:
+                return  # Main loop is gone (app closing)
+
+
+    def _load_thumbnail(self, file_path):
+        """Read the stored thumbnail, or render it from the smallest source that covers it (and store it) on a miss."""
+        key = self.store.source_key(file_path) if self.store else None
+        if not key:
+            return make_square_thumbnail(file_path, THUMBNAIL_SIZE)
+
+        image = self.store.load(key, THUMBNAIL_SIZE, kind=THUMBNAIL)
+        if image is not None:
+            return image
+
+        display_image = self.store.load(key, DISPLAY_SIZE, kind=DISPLAY)
+        if display_image is not None and min(display_image.size) >= max(THUMBNAIL_SIZE):
+            image = square_thumbnail(display_image, THUMBNAIL_SIZE)
+            self.store.save(key, image, THUMBNAIL_SIZE, kind=THUMBNAIL)
+            return image
+
+        image, display_image = make_renditions(file_path, THUMBNAIL_SIZE, DISPLAY_SIZE)
+        self.store.save_all(key, [(THUMBNAIL, THUMBNAIL_SIZE, image), (DISPLAY, DISPLAY_SIZE, display_image)])
+        return image
+
+
+    def _finish(self, generation, file_path, photo_id, image):
+        """Tk thread: wrap the decoded thumbnail, cache it and hand it to the Photos tab."""
+        if generation != self._generation:
+            return
+
+        thumbnail = ImageTk.PhotoImage(image)  # Must be PhotoImage for ttk.Treeview
+        self.image_cache.add_thumbnail_to_cache(file_path, thumbnail)
+        if photo_id is not None:
+            self.update_ui_callback(photo_id, thumbnail)
@@ -0,0 +1,144 @@
+import io
+import os
+from PIL import Image
+from class_elements.database import get_connection, get_pool
+
+
+# Renditions kept per photo (the original is only decoded when neither fits)
+THUMBNAIL = "thumbnail"     # Center-square crop (Photos tab list)
+DISPLAY = "display"         # Fits the before/after preview box, aspect ratio kept
+PDF_PREVIEW = "pdf_preview" # First page of a prescription PDF (Prescriptions tab preview)
+PDF_PAGE = "pdf_page"       # Same page at full render resolution (full-size preview popup)
+
+THUMBNAIL_SIZE = (100, 100)
+DISPLAY_SIZE = (300, 400)   # Before/after preview size
+
+RENDITION_FORMAT = "JPEG"
+RENDITION_FORMATS = {PDF_PREVIEW: "PNG", PDF_PAGE: "PNG"}   # Kinds not stored as RENDITION_FORMAT (PNG keeps text edges sharp)
+RENDITION_QUALITY = {THUMBNAIL: 85, DISPLAY: 90}
+RENDER_VERSION = 2          # Bump when renditions start rendering differently (1: EXIF orientation, 2: display renditions)
+
+
+class ThumbnailStore:
+    """
+    Persistent rendition store: pre-encoded thumbnail and display-size images, plus prescription
+    PDF preview rasters, in a SQLite blob table (SkinProData/thumbnails.db, kept out of skinpro.db
+    and its backups). Renditions are written once at ingest (server and local uploads) or on the
+    first miss, so browsing photos never decodes the multi-MB originals again, and browsing
+    prescriptions never runs poppler again.
+
+    An entry is keyed by the source path and rendition kind, and is only valid for the source's
+    current mtime + size and the requested size (thumbnail size / display box), so an edited or
+    replaced photo misses and gets re-rendered, overwriting the stale entry. Safe to use from
+    several worker threads (pooled per-thread connections).
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+        with get_connection(db_path) as conn:
+            # Renditions rendered by an older version would still pass the mtime/size check
+            if conn.execute("PRAGMA user_version").fetchone()[0] < RENDER_VERSION:
+                conn.execute("DROP TABLE IF EXISTS thumbnails")
+                conn.execute("DROP TABLE IF EXISTS renditions")
+                conn.execute(f"PRAGMA user_version = {RENDER_VERSION}")
+
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS renditions (
+                file_path TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                file_size INTEGER NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (file_path, kind)
+            )
+            """)
+
+
+    @staticmethod
+    def source_key(file_path):
+        """Return (normalized path, mtime_ns, size) for a source image, or None if it doesn't exist."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size
+
+
+    def load(self, key, size, kind=THUMBNAIL):
+        """
+        Return the stored rendition for `key` as a PIL image, or None on a miss (absent, stale or other
+        size). A size of (width, None) matches any height (PDF previews keep the page's aspect ratio),
+        and (None, None) any size at all.
+        """
+        file_path, mtime_ns, file_size = key
+        with get_connection(self.db_path) as conn:
+            row = conn.execute("""
+                SELECT data FROM renditions
+                WHERE file_path = ? AND kind = ? AND mtime_ns = ? AND file_size = ? AND width = COALESCE(?, width) AND height = COALESCE(?, height)
+            """, (file_path, kind, mtime_ns, file_size, size[0], size[1])).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            image = Image.open(io.BytesIO(row[0]))
+            image.load()
+            return image
+        except Exception as e:
+            print(f"Discarding unreadable stored {kind} for {file_path}: {e}")
+            self.discard(file_path)
+            return None
+
+
+    def save(self, key, image, size=None, kind=THUMBNAIL):
+        """Encode and store one rendition (rendered for `size`, default the image's own size)."""
+        self.save_all(key, [(kind, size or image.size, image)])
+
+
+    def save_all(self, key, renditions):
+        """Encode and store several renditions of one source in one transaction: [(kind, size, image), ...]."""
+        file_path, mtime_ns, file_size = key
+        rows = []
+        for kind, size, image in renditions:
+            buffer = io.BytesIO()
+            image_format = RENDITION_FORMATS.get(kind, RENDITION_FORMAT)
+            if image_format == "JPEG":
+                image.save(buffer, image_format, quality=RENDITION_QUALITY[kind])
+            else:
+                image.save(buffer, image_format, optimize=True)
+            rows.append((file_path, kind, mtime_ns, file_size, size[0], size[1], buffer.getvalue()))
+
+        with get_connection(self.db_path) as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO renditions (file_path, kind, mtime_ns, file_size, width, height, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+
+    def discard(self, file_path):
+        """Remove every rendition of a source image (e.g. the photo was deleted)."""
+        with get_connection(self.db_path) as conn:
+            conn.execute("DELETE FROM renditions WHERE file_path = ?", (os.path.normcase(os.path.abspath(file_path)),))
+
+
+    def release_thread(self):
+        """Close the calling thread's connection (call at the end of a short-lived worker thread)."""
+        get_pool(self.db_path).release()
+
+
+    def prune_missing(self):
+        """Remove entries whose source image no longer exists (deleted photos or clients). Returns the count."""
+        try:
+            with get_connection(self.db_path) as conn:
+                paths = [row[0] for row in conn.execute("SELECT DISTINCT file_path FROM renditions")]
+                missing = [(path,) for path in paths if not os.path.exists(path)]
+                conn.executemany("DELETE FROM renditions WHERE file_path = ?", missing)
+        except Exception as e:
+            print(f"Error pruning thumbnail store: {e}")
+            return 0
+
+        if missing:
+            print(f"Pruned {len(missing)} stale image(s) from the thumbnail store.")
+        return len(missing)
@@ -1,24 +1,47 @@
+from utils import startup_timing  # First import: starts the launch-to-interactive clock
+import sys
+
+# `python main.py --profile-startup` also times every import (see utils/startup_timing.py)
+if "--profile-startup" in sys.argv:
+    startup_timing.enable_import_profile()
+
 import customtkinter as ctk
 from tabs.client_app import ClientApp
-from class_elements.database import init_database
+from class_elements.database import init_database, close_all_pools
 from class_elements.image_cache import ImageCache
 from class_elements.splash_screen import SplashScreen
-from class_elements.img_load_threading import ImageLoaderThread
+from class_elements.thumbnail_pipeline import ThumbnailPipeline
+from class_elements.thumbnail_store import ThumbnailStore
 from utils.data_manager import DataDirectoryManager
 from utils.path_utils import resource_path
-import sys
 import threading
-from upload_server import server
 import os
 
+startup_timing.mark("Imports loaded")
+
 
 # Store server thread globally for health checks or shutdown logic
 flask_thread = None
 
+def run_upload_server():
+    # Flask/Werkzeug are imported on the server thread, off the UI's startup path
+    from upload_server import server
+    server.start_flask_server()
+
+def stop_upload_server(timeout=5):
+    """Shut the upload server down cleanly; returns True once its thread has exited."""
+    server = sys.modules.get("upload_server.server")  # Imported lazily by run_upload_server
+    if server is not None:
+        server.stop_flask_server(timeout)
+    if flask_thread is not None:
+        flask_thread.join(timeout)
+        return not flask_thread.is_alive()
+    return True
+
 def start_server_in_thread():
     global flask_thread
     if flask_thread is None or not flask_thread.is_alive():
-        flask_thread = threading.Thread(target=server.start_flask_server, daemon=False)
+        flask_thread = threading.Thread(target=run_upload_server, daemon=False)
         flask_thread.start()
         sys._flask_server_started = True
         print("Flask server launched from main.py")
@@ -31,16 +54,18 @@ if __name__ == "__main__":
     data_manager = DataDirectoryManager()
     start_server_in_thread()
     
-    # Initialize database & image cache
+    # Initialize database & image cache (display images come from the rendition store when available)
     conn = init_database(data_manager.db_path, data_manager.backups_dir)
-    image_cache = ImageCache(data_manager)
+    thumbnail_store = ThumbnailStore(data_manager.thumbnail_store_path)
+    image_cache = ImageCache(data_manager, store=thumbnail_store)
+    startup_timing.mark("Database ready")
 
     # Define a temporary function that will be overridden
     def update_ui_stub(photo_id, thumbnail):
         print(f"⚠ Warning: `update_ui_with_thumbnail` called before UI initialized. Skipping update.")
 
-    # Start Image Loader Thread once at startup
-    image_loader = ImageLoaderThread(image_cache, update_ui_stub)
+    # Start the thumbnail worker pool once at startup
+    image_loader = ThumbnailPipeline(image_cache, update_ui_stub, store=thumbnail_store)
     image_loader.start()
 
     # Create the main application but keep it hidden
@@ -52,20 +77,22 @@ if __name__ == "__main__":
     splash_screen = SplashScreen(app)  # Attach to main UI
     splash_screen.update_idletasks()
 
-    # 🔹 Start loading assets **after** splash screen is drawn
-    splash_screen.after(2000, lambda: app.preload_assets(splash_screen))
+    # 🔹 Start building the UI as soon as the splash screen is drawn (image caches warm in the background)
+    splash_screen.after_idle(lambda: app.preload_assets(splash_screen))
 
     def on_close():
         print("🔻 App is closing — attempting to clean up...")
-        # Gracefully stop the server if needed
-        # (e.g., set a flag or shut down Flask with shutdown route if implemented)
+        server_stopped = stop_upload_server()  # Finishes in-flight uploads before the pools close
+        image_cache.log_stats()  # Hit/miss/eviction counters, for sizing the cache budgets
+        prescriptions_page = app.tabs.get("Prescriptions")  # Only if the tab was built
+        if prescriptions_page:
+            print(f"PDF preview renders: {prescriptions_page.pdf_render_worker.stats()}")
+        image_cache.save_cache_to_disk()  # Startup preload list (must run here: os._exit skips anything after mainloop)
+        close_all_pools()  # Flush WAL + release pooled DB connections
         app.quit()
-        os._exit(0)  # Force shutdown if needed to stop Flask thread
+        if not server_stopped:
+            os._exit(0)  # Server thread is stuck (e.g. waiting for a missing SkinProData folder)
     app.protocol("WM_DELETE_WINDOW", on_close)
 
     # 🔹 Start Tkinter main loop for splash screen (ensures it's visible)
     splash_screen.mainloop()
-
-    # 🔹 Save caches before exit
-    image_cache.save_cache_to_disk()
-    image_cache.save_thumbnail_cache()
@@ -7,7 +7,12 @@ from class_elements.ctk_popup import ConfirmationPopup
 import os
 import shutil
 from utils.path_utils import resource_path
-import sqlite3
+from class_elements.database import get_connection
+from class_elements.client_list_model import ClientListModel
+from class_elements.search_executor import SearchExecutor
+
+
+WHEEL_SCROLL_ROWS = 3       # Rows scrolled per mouse wheel notch
 
 
 class ClientsPage:
@@ -17,6 +22,14 @@ class ClientsPage:
         self.client_id = None
         self.data_manager = data_manager
 
+        # Paged client list: the Treeview only holds the rows currently on screen
+        self.client_model = ClientListModel(data_manager.db_path)
+        self.offset = 0                     # List position of the first visible row
+        self.visible_rows = 20              # Recalculated from the Treeview height on resize
+        self.selected_client_id = None      # Kept across scrolling, since off-screen rows have no item
+        self.sort_column = None
+        self.sort_descending = False
+
         # Frame for Search/Treeview
         main_frame = ctk.CTkFrame(parent)
         main_frame.pack(fill="both", expand=True, padx=10)
@@ -32,6 +45,7 @@ class ClientsPage:
         # Search Entry
         self.name_entry = ctk.CTkEntry(search_frame, width=300, placeholder_text="Enter client name")
         self.name_entry.grid(row=0, column=1, sticky="ew")
+        self.client_search = SearchExecutor(self.name_entry, self.show_search_results)
 
         # Add Client Button
         add_client_icon = ctk.CTkImage(light_image=Image.open(resource_path("icons/add_client.png")), size=(24, 24))
@@ -69,9 +83,9 @@ class ClientsPage:
         self.client_list.heading("Email", text="Email")
         self.client_list.heading("Address", text="Address")
 
-        # Bind all column headers to sorting function
+        # Bind all column headers to sorting function (sorted in SQL by the list model)
         for col in columns:
-            self.client_list.heading(col, text=col, command=lambda c=col: self.sort_treeview(c, False))
+            self.client_list.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
 
         # Set initial column widths
         self.set_column_widths()
@@ -79,10 +93,9 @@ class ClientsPage:
         # Pack the Treeview
         self.client_list.pack(side="left", fill="both", expand=True)
 
-        # Add vertical scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.client_list.yview, style="Vertical.TScrollbar")
-        scrollbar.pack(side="right", fill="y")
-        self.client_list.configure(yscrollcommand=scrollbar.set)
+        # Add vertical scrollbar (drives the list window, not the Treeview's own yview)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.on_scrollbar, style="Vertical.TScrollbar")
+        self.scrollbar.pack(side="right", fill="y")
 
         # No Results label (initially hidden)
         self.no_results_label = ctk.CTkLabel(
@@ -99,7 +112,7 @@ class ClientsPage:
         self.load_clients()
 
         # Bind the Treeview's parent to a resize event
-        self.client_list.bind("<Configure>", lambda event: self.set_column_widths())
+        self.client_list.bind("<Configure>", self.on_treeview_resize)
 
         # Key "bind" configurations for quick functionality
         self.name_entry. bind("<KeyRelease>", lambda event: (self.search_client(), "break"))    # Prevent default behavior
@@ -109,6 +122,15 @@ class ClientsPage:
         self.client_list.bind_all("<Control-Return>", lambda event: self.add_client_button())   # Bind globally for Ctrl+Enter
         self.client_list.bind("<Delete>", self.confirm_delete_client)                           # Deletes client
         self.client_list.bind("<BackSpace>", self.confirm_delete_client)                        # Deletes client
+        self.client_list.bind("<MouseWheel>", self.on_mousewheel)                               # Scroll the list window
+        self.client_list.bind("<Button-4>", self.on_mousewheel)                                 # X11 wheel up
+        self.client_list.bind("<Button-5>", self.on_mousewheel)                                 # X11 wheel down
+        self.client_list.bind("<Up>", lambda event: self.move_selection(-1))                    # Keyboard navigation
+        self.client_list.bind("<Down>", lambda event: self.move_selection(1))
+        self.client_list.bind("<Prior>", lambda event: self.move_selection(-self.visible_rows))
+        self.client_list.bind("<Next>", lambda event: self.move_selection(self.visible_rows))
+        self.client_list.bind("<Home>", lambda event: self.move_selection(-self.client_model.total))
+        self.client_list.bind("<End>", lambda event: self.move_selection(self.client_model.total))
             
 
     def set_column_widths(self):
@@ -124,44 +146,27 @@ class ClientsPage:
         self.client_list.column("Address", width=int(total_width * 0.40), minwidth=200)
 
 
-    def update_alternating_colors(self):
-        """Reassign even/odd row tags based on visual order."""
-        for index, item in enumerate(self.client_list.get_children()):
-            tag = "even" if index % 2 == 0 else "odd"
-            self.client_list.item(item, tags=(tag,))
-
-
     def load_clients(self):
-        """Load all clients from the database and insert them into the Treeview."""
+        """List all clients. Only the visible window of rows is fetched and inserted."""
         print("Reloading all clients...")  # Debugging
 
-        self.client_list.delete(*self.client_list.get_children())  # Clear existing rows
-
+        self.client_search.cancel()  # A late search result must not replace the full list
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, full_name, gender, birthdate, primary_phone, email, address1 || ' ' || address2 FROM clients
-                """)
-                results = cursor.fetchall()
+            total = self.client_model.reset(None, self.sort_column, self.sort_descending)
         except Exception as e:
             print(f"Error loading clients: {e}")
             return
 
-        if not results:
+        self.offset = 0
+        self.render_window()
+
+        if not total:
             print("⚠ No clients found in the database!")  # Debugging
             self.no_results_label.configure(text="No clients found in the database.")
             self.no_results_label.lift()  # Show the label if the DB is empty
             return
-        
-        for index, row in enumerate(results):
-            client_id = row[0]
-            client_values = row[1:]
-            self.client_list.insert("", "end", iid=str(client_id), values=client_values)
-
-        self.update_alternating_colors()
 
-        print(f"Loaded {len(results)} clients.")  # Debugging
+        print(f"Listing {total} clients.")  # Debugging
         self.no_results_label.lower()  # Hide "No Results" label
 
 
@@ -170,41 +175,187 @@ class ClientsPage:
         query = self.name_entry.get().strip()   # Get and trim the search query
 
         if query:
-            self.client_list.delete(*self.client_list.get_children())  # Clear existing rows
-            try:
-                with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT id, full_name, gender, birthdate, primary_phone, email, address1 || ' ' || address2 
-                        FROM clients 
-                        WHERE full_name LIKE ?
-                    """, (f"%{query}%",))
-                    results = cursor.fetchall()
-            except Exception as e:
-                print(f"Error searching clients: {e}")
-                return
-            
-            if results:
-                for row in results:
-                    client_id = row[0]  # Extract client_id
-                    client_values = row[1:]  # Everything except client_id
-
-                    # Insert using client_id as the TreeView iid
-                    self.client_list.insert("", "end", iid=str(client_id), values=client_values)
-                
-                self.update_alternating_colors()
-                self.no_results_label.lower()  # Hide the "No Results" label
-            
-            else:
-                # Show "No Results" label
-                self.no_results_label.configure(text=f"No results for '{query}'\n\nPress Ctrl + Enter to add.")
-                self.no_results_label.lift()  # Bring the label to the front
+            db_path = self.main_app.data_manager.db_path
+
+            def run_search():  # Runs on the search worker thread
+                try:
+                    # Prefix match over name, phone, email & address (clients_fts), ranked unless a column is sorted
+                    model = ClientListModel(db_path)
+                    model.reset(query, self.sort_column, self.sort_descending)
+                    model.get_rows(0, self.visible_rows)  # Prefetch the first window off the Tk thread
+                    return query, model
+                except Exception as e:
+                    print(f"Error searching clients: {e}")
+                    return None
+
+            self.client_search.submit(run_search)
 
         else:
             self.load_clients()  # Reload all clients if no search query is provided
             self.no_results_label.lower()  # Hide the "No Results" label
 
 
+    def show_search_results(self, result):
+        """Swap in the latest search's list model (called on the Tk thread)."""
+        if result is None:
+            return
+
+        query, self.client_model = result
+        self.offset = 0
+        self.render_window()
+
+        if self.client_model.total:
+            self.no_results_label.lower()  # Hide the "No Results" label
+        else:
+            # Show "No Results" label
+            self.no_results_label.configure(text=f"No results for '{query}'\n\nPress Ctrl + Enter to add.")
+            self.no_results_label.lift()  # Bring the label to the front
+
+
+    ### --- Windowed List --- ###
+    def render_window(self):
+        """
+        Replace the Treeview items with the rows at [offset, offset + visible_rows).
+        Only the visible rows become items, so the Treeview never scrolls on its own; the buffer
+        around the window is the model's page cache (scrolling a few rows doesn't query the DB).
+        """
+        total = self.client_model.total
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+
+        try:
+            rows = self.client_model.get_rows(self.offset, self.visible_rows)
+        except Exception as e:
+            print(f"Error loading client rows: {e}")
+            rows = []
+
+        self.client_list.delete(*self.client_list.get_children())
+        for position, row in enumerate(rows, start=self.offset):
+            tag = "even" if position % 2 == 0 else "odd"  # Stripe by list position so colors don't shift while scrolling
+            self.client_list.insert("", "end", iid=str(row[0]), values=row[1:7], tags=(tag,))
+
+        # Restore the selection when the selected client scrolls back into view
+        if self.selected_client_id is not None and self.client_list.exists(str(self.selected_client_id)):
+            self.client_list.selection_set(str(self.selected_client_id))
+            self.client_list.focus(str(self.selected_client_id))
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(rows)) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
+    def scroll_rows(self, step):
+        """Move the visible window by `step` rows."""
+        self.offset += step
+        self.render_window()
+
+
+    def on_scrollbar(self, action, value, unit=None):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"/"pages")."""
+        if action == "moveto":
+            self.offset = int(float(value) * self.client_model.total)
+            self.render_window()
+        elif action == "scroll":
+            self.scroll_rows(int(value) * (self.visible_rows if unit == "pages" else 1))
+
+
+    def on_mousewheel(self, event):
+        """Scroll WHEEL_SCROLL_ROWS per wheel event, whatever its delta (macOS and touchpads send small ones)."""
+        if event.num == 4:
+            direction = -1
+        elif event.num == 5:
+            direction = 1
+        elif event.delta:
+            direction = -1 if event.delta > 0 else 1
+        else:
+            return "break"
+        self.scroll_rows(direction * WHEEL_SCROLL_ROWS)
+        return "break"
+
+
+    def on_treeview_resize(self, event):
+        """Resize columns and refill the window when the number of rows that fit changes."""
+        self.set_column_widths()
+
+        row_height = int(ttk.Style().lookup("Clients.Treeview", "rowheight") or 40)
+        children = self.client_list.get_children()
+        bbox = self.client_list.bbox(children[0]) if children else ""
+        header_height = bbox[1] if bbox else row_height
+
+        visible_rows = max(1, (event.height - header_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render_window()
+
+
+    def move_selection(self, step):
+        """Keyboard navigation: move the selection by `step` rows, scrolling the window at its edges."""
+        total = self.client_model.total
+        if not total:
+            return "break"
+
+        children = self.client_list.get_children()
+        selected = self.client_list.selection()
+        if selected and selected[0] in children:
+            position = self.offset + children.index(selected[0]) + step
+        else:
+            position = self.offset  # Nothing selected on screen: start at the top of the window
+        position = max(0, min(position, total - 1))
+
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible_rows:
+            self.offset = position - self.visible_rows + 1
+        self.render_window()
+
+        children = self.client_list.get_children()
+        index = position - self.offset
+        if 0 <= index < len(children):
+            self.selected_client_id = int(children[index])
+            self.client_list.selection_set(children[index])
+            self.client_list.focus(children[index])
+        return "break"
+
+
+    def show_client(self, client_id):
+        """Scroll a client into view and select it. Clears the search if the client isn't in the results."""
+        try:
+            position = self.client_model.position_of(client_id)
+            if position is None and self.client_model.search_text:
+                self.restore_placeholder()
+                self.load_clients()
+                position = self.client_model.position_of(client_id)
+        except Exception as e:
+            print(f"Error locating client {client_id}: {e}")
+            return
+
+        if position is None:
+            print(f"⚠ Client ID {client_id} not found in the client list.")
+            return
+
+        if not self.offset <= position < self.offset + self.visible_rows:
+            self.offset = position - self.visible_rows // 2  # Center it
+        self.selected_client_id = int(client_id)
+        self.render_window()
+
+
+    def sort_by_column(self, column):
+        """Sort the list by a column (in SQL); clicking the same column again reverses the order."""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+
+        try:
+            self.client_model.reset(self.client_model.search_text, self.sort_column, self.sort_descending)
+        except Exception as e:
+            print(f"Error sorting clients: {e}")
+            return
+
+        self.offset = 0
+        self.render_window()
+
+
     def jump_to_appt_tab(self, event):
         """Switch to the Appointments tab when a client is selected."""
     
@@ -231,13 +382,14 @@ class ClientsPage:
             return
         
         client_id = int(selected[0])
+        self.selected_client_id = client_id
         self.select_client_by_id(client_id)  # Reusable logic
 
 
     def select_client_by_id(self, client_id):
         """Update the profile card when a client is single-clicked in the treeview."""
         self.client_id = client_id       # Store the selected client ID
-        self.client_list.see(client_id)  # Scroll to selected client
+        self.show_client(client_id)      # Scroll to selected client
         
         # Update ProfileCard's client_id
         if hasattr(self.main_app, "profile_card"):
@@ -266,20 +418,9 @@ class ClientsPage:
         print(f"Retrieved Email:         {email}") 
         print(f"Retrieved Address:       {address}")  # Debugging
 
-        # Update Other Tabs
-        print(f"\nPopulating Info & Appointments tabs for Client ID: {self.client_id}")
-        self.main_app.tabs["Info"].populate_client_info(self.client_id)
-        self.main_app.tabs["Appointments"].load_client_appointments(self.client_id)
-        self.main_app.tabs["Photos"].refresh_photos_list(self.client_id)
-        self.main_app.tabs["Prescriptions"].load_prescriptions_for_client(self.client_id)
-        self.main_app.tabs["Alerts"].update_client_id(self.client_id)
-
-        # Update Profile Card if it exists
-        if hasattr(self.main_app, "profile_card"):
-            print("Updating Profile Card for Client ID:", self.client_id)
-            self.main_app.profile_card.load_client(self.client_id)
-        else:
-            print("ProfileCard instance not found.\n")
+        # Update Other Tabs (the visible one now, hidden ones when next shown)
+        print(f"\nSelecting Client ID {self.client_id} in the other tabs")
+        self.main_app.set_selected_client(self.client_id)  # Also updates the Profile Card once loaded
 
 
     def add_client_button(self):
@@ -292,7 +433,7 @@ class ClientsPage:
 
         # Check for duplicate name in the database
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM clients WHERE LOWER(full_name) = LOWER(?)", (full_name,))
                 existing_count = cursor.fetchone()[0]
@@ -315,8 +456,7 @@ class ClientsPage:
             # Ensure a valid client ID before selecting in TreeView
             if self.main_app.current_client_id != -1:
                 print(f"🔄 Selecting Client ID: {self.main_app.current_client_id} in TreeView...")
-                self.main_app.tabs["Clients"].client_list.selection_set(str(self.main_app.current_client_id))
-                self.main_app.tabs["Clients"].client_list.see(str(self.main_app.current_client_id))  # Bring into view
+                self.show_client(self.main_app.current_client_id)  # Bring into view
             else:
                 print("⚠ Skipping TreeView selection: Client ID is -1 (new client).")
 
@@ -333,14 +473,12 @@ class ClientsPage:
 
     def proceed_with_new_client(self, full_name):
         """Handles adding a new client after confirmation."""
-        self.main_app.tabs["Info"].clear_info()
-        self.main_app.tabs["Appointments"].clear_appointments()
-        self.main_app.tabs["Photos"].clear_photos_list()
-        self.main_app.tabs["Prescriptions"].clear_prescriptions_list()
+        self.main_app.set_selected_client(None)  # Clears the client tabs
 
         self.main_app.current_client_id = -1  # Placeholder for new clients
 
-        # Populate the full name entry in the Info tab
+        # Show the (cleared) Info tab first, then populate its full name entry
+        self.main_app.switch_to_tab("Info")
         info_tab = self.main_app.tabs["Info"]
         info_tab.full_name_entry.insert(0, full_name)
         
@@ -351,9 +489,6 @@ class ClientsPage:
 
         self.main_app.profile_card.set_default_profile_picture()
 
-        # Switch to the Info tab
-        self.main_app.switch_to_tab("Info")
-
         print(f"Proceeding to add a new client: {full_name}")
 
 
@@ -369,7 +504,7 @@ class ClientsPage:
         client_name = None
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
                 result = cursor.fetchone()
@@ -428,7 +563,7 @@ class ClientsPage:
         print(f"🗑️ Attempting to delete client ID: {client_id}")
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 # Fetch profile picture path
@@ -466,16 +601,9 @@ class ClientsPage:
             # Reset app state
             try:
                 self.load_clients()
-                self.main_app.tabs["Info"].clear_info()
-                self.main_app.tabs["Appointments"].clear_appointments()
-                self.main_app.tabs["Photos"].clear_photos_list()
-                self.main_app.tabs["Prescriptions"].clear_prescriptions_list()
-                self.main_app.tabs["Alerts"].load_alerts()
-
-                if hasattr(self.main_app, "profile_card"):
-                    self.main_app.profile_card.load_client(None)
+                self.main_app.set_selected_client(None)  # Clears the Profile Card and client tabs, reloads Alerts
 
-                if hasattr(self.main_app.tabs["Photos"], "preview_label"):
+                if "Photos" in self.main_app.tabs and hasattr(self.main_app.tabs["Photos"], "preview_label"):
                     self.main_app.tabs["Photos"].preview_label.configure(image=None)
                     self.main_app.tabs["Photos"].preview_label.image = None
 
@@ -506,27 +634,6 @@ class ClientsPage:
         print(f"Deleted all assets associated with Client ID: {client_id}")
         
 
-    def sort_treeview(self, column, reverse):
-        """Sort the Treeview column when clicked."""
-        # Get all rows from the treeview
-        data = [(self.client_list.set(item, column), item) for item in self.client_list.get_children("")]
-
-        # Detect if the column contains numbers or text
-        try:
-            data.sort(key=lambda x: float(x[0]) if x[0].isdigit() else x[0].lower(), reverse=reverse)
-        except ValueError:
-            data.sort(key=lambda x: x[0].lower(), reverse=reverse)
-
-        # Rearrange items in sorted order
-        for index, (val, item) in enumerate(data):
-            self.client_list.move(item, "", index)
-
-        self.update_alternating_colors()
-
-        # Toggle sorting order on next click
-        self.client_list.heading(column, command=lambda: self.sort_treeview(column, not reverse))
-               
-
     def restore_placeholder(self):
         self.name_entry.delete(0, "end")
         self.name_entry.configure(placeholder_text="Enter client name")
@@ -6,6 +6,8 @@ import re
 from datetime import datetime
 from utils.path_utils import resource_path
 import sqlite3
+from class_elements.database import get_connection, search_clients
+from class_elements.search_executor import SearchExecutor
 
 
 # Placeholder phrases
@@ -122,6 +124,7 @@ class InfoPage:
         self.referred_by_combobox.configure(text_color="#797e82")
         self.referred_by_combobox.set("Referred by...")
         self.referred_by_combobox.bind("<KeyRelease>", lambda event: self.update_referred_by_suggestions())
+        self.referral_search = SearchExecutor(self.referred_by_combobox, self.show_referred_by_suggestions)
         self.referred_by_combobox.bind("<FocusIn>", self.clear_referred_placeholder)
         self.referred_by_combobox.bind("<FocusOut>", self.restore_referred_placeholder)
 
@@ -293,24 +296,14 @@ class InfoPage:
         except IndexError:
             pass  # In case no trace exists yet  
 
-        try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT full_name, gender, birthdate, address1, address2, city, state, zip, primary_phone, secondary_phone, email, referred_by
-                    FROM clients WHERE id = ?
-                """, (client_id,))
-                client_result = cursor.fetchone()
-
-                cursor.execute("""
-                    SELECT allergies, health_conditions, health_risks, medications, treatment_areas, current_products, skin_conditions, other_notes, desired_improvement
-                    FROM client_health_info WHERE client_id = ?
-                """, (client_id,))
-                health_result = cursor.fetchone()
-        except Exception as e:
-            print(f"Error loading client info: {e}")
+        record = self.main_app.client_data.fetch(client_id)  # Shared, cached client record
+        if record is None:
+            print(f"Error loading client info: no client with ID {client_id}")
             return
 
+        client_result = record["client"]
+        health_result = record["health"]
+
         if client_result:
             (
                 full_name, gender, birthdate, 
@@ -517,19 +510,27 @@ class InfoPage:
         query = self.referred_by_combobox.get().strip()
 
         if not query:
+            self.referral_search.cancel()
             self.referred_by_combobox.configure(values=[])
             self.referred_by_combobox.focus()
             return
 
-        try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT full_name FROM clients WHERE full_name LIKE ? LIMIT 10", (f"%{query}%",))
-                matches = [row[0] for row in cursor.fetchall()]
-        except Exception as e:
-            print(f"Error fetching referral suggestions: {e}")
-            matches = []
+        db_path = self.main_app.data_manager.db_path
+
+        def run_search():  # Runs on the search worker thread
+            try:
+                with get_connection(db_path) as conn:
+                    rows = search_clients(conn, query, fields="c.full_name", name_only=True, limit=10)
+                    return [row[0] for row in rows]
+            except Exception as e:
+                print(f"Error fetching referral suggestions: {e}")
+                return []
+
+        self.referral_search.submit(run_search)
 
+
+    def show_referred_by_suggestions(self, matches):
+        """Show the latest referral search results (called on the Tk thread)."""
         self.referred_by_combobox.configure(values=matches if matches else ["No matches found"])
         self.referred_by_combobox.focus()
 
@@ -579,7 +580,7 @@ class InfoPage:
             return
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 if self.client_id == -1:
@@ -629,8 +630,7 @@ class InfoPage:
 
         if hasattr(self.main_app, "tabs") and "Clients" in self.main_app.tabs:
             self.main_app.tabs["Clients"].load_clients()
-            self.main_app.tabs["Clients"].client_list.selection_set(str(self.client_id))
-            self.main_app.tabs["Clients"].client_list.see(str(self.client_id))
+            self.main_app.tabs["Clients"].show_client(self.client_id)
             self.main_app.tabs["Clients"].restore_placeholder()
 
         if hasattr(self.main_app, "profile_card"):
@@ -644,6 +644,8 @@ class InfoPage:
         if hasattr(self.main_app, "tabs") and "Alerts" in self.main_app.tabs:
             self.main_app.tabs["Alerts"].client_id = self.client_id
 
+        self.main_app.selected_client_id = self.client_id  # Tabs built or shown later load the saved client
+
         self.save_button.configure(state="disabled", text="Saved!", fg_color="#696969", text_color="#ebebeb")
         
 
@@ -6,12 +6,14 @@ from class_elements.treeview_styling_light import style_treeview_light
 from class_elements.photo_upload_popup import PhotoUploadPopup
 from upload_server.qr_helper import generate_upload_qr
 from utils.path_utils import resource_path
+from utils.date_utils import to_iso_date, to_display_date
 from datetime import datetime
 from PIL import Image
 import re
 import os
 import shutil
-import sqlite3
+from class_elements.database import get_connection, search_clients
+from class_elements.search_executor import SearchExecutor
 
 
 class AppointmentsPage:
@@ -57,6 +59,7 @@ class AppointmentsPage:
 
         # Keybinds for combobox functionality
         self.client_combobox.bind("<KeyRelease>", self.filter_clients)
+        self.client_search = SearchExecutor(self.client_combobox, self.show_client_matches)
         self.client_combobox.bind("<FocusOut>", self.restore_placeholder)
         self.client_combobox.bind("<Button-1>", self.clear_placeholder)  # Click event
         self.client_combobox.bind("<FocusIn>", self.clear_placeholder)  # Keyboard focus
@@ -177,7 +180,7 @@ class AppointmentsPage:
             self.client_combobox.set("Select a client...")  # Restore placeholder
             return  # Exit early, don't process selection
 
-        with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+        with get_connection(self.main_app.data_manager.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id FROM clients WHERE full_name = ?", (selected_client,))
             result = cursor.fetchone()
@@ -186,7 +189,7 @@ class AppointmentsPage:
             self.client_id = result[0]  # Store the client ID
             print(f"Selected Client: {selected_client} (ID: {self.client_id})")
 
-            self.main_app.tabs["Clients"].select_client_by_id(self.client_id)
+            self.main_app.get_tab("Clients").select_client_by_id(self.client_id)
 
 
     def set_column_widths(self):
@@ -206,14 +209,27 @@ class AppointmentsPage:
         query = self.client_combobox.get().strip()
         if query:
             self.client_combobox.configure(text_color="#000000")
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT full_name FROM clients WHERE full_name LIKE ? LIMIT 10", (f"%{query}%",))
-                matches = [row[0] for row in cursor.fetchall()]
+            db_path = self.main_app.data_manager.db_path
+
+            def run_search():  # Runs on the search worker thread
+                try:
+                    with get_connection(db_path) as conn:
+                        rows = search_clients(conn, query, fields="c.full_name", name_only=True, limit=10)
+                        return [row[0] for row in rows]
+                except Exception as e:
+                    print(f"Error searching clients: {e}")
+                    return []
 
-            self.client_combobox.configure(values=matches if matches else ["No matches found"])
+            self.client_search.submit(run_search)
         else:
+            self.client_search.cancel()
             self.client_combobox.configure(values=[])
+            self.client_combobox.focus()
+
+
+    def show_client_matches(self, matches):
+        """Show the latest client search results in the dropdown (called on the Tk thread)."""
+        self.client_combobox.configure(values=matches if matches else ["No matches found"])
         self.client_combobox.focus()
 
 
@@ -247,19 +263,12 @@ class AppointmentsPage:
         self.all_notes_textbox.configure(state="disabled")
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, date, type, treatment, price, photos_taken, treatment_notes 
-                    FROM appointments 
-                    WHERE client_id = ?
-                    ORDER BY date DESC
-                """, (client_id,))
-                appointments = cursor.fetchall()
+            record = self.main_app.client_data.fetch(client_id)  # Shared, cached client record
+            appointments = record["appointments"] if record else []
 
             for index, row in enumerate(appointments):
                 appointment_id, date, type, treatment, price, photos_taken, treatment_notes = row
-                self.appointments_table.insert("", "end", iid=str(appointment_id), values=(date, type, treatment, price, photos_taken))
+                self.appointments_table.insert("", "end", iid=str(appointment_id), values=(to_display_date(date), type, treatment, price, photos_taken))
 
             self.update_alternating_colors()
             self.load_all_treatment_notes()
@@ -315,16 +324,10 @@ class AppointmentsPage:
                 appointment_id = int(self.get_selected_appointment_id(item))  # Ensure correct ID type
                 print(f"Fetching notes for appointment_id: {appointment_id}")
 
-                # Fetch from DB
-                try:
-                    with sqlite3.connect(self.data_manager.db_path) as conn:
-                        cursor = conn.cursor()
-                        cursor.execute("SELECT treatment_notes FROM appointments WHERE id = ?", (appointment_id,))
-                        result = cursor.fetchone()
-                        treatment_notes = result[0] if result and result[0] else "(No notes found)"
-                except Exception as e:
-                    print(f"Failed to fetch notes for ID {appointment_id}: {e}")
-                    treatment_notes = "(Error retrieving notes)"
+                # Look up the notes in the shared client record
+                record = self.main_app.client_data.fetch(self.client_id)
+                notes_by_id = {row[0]: row[6] for row in record["appointments"]} if record else {}
+                treatment_notes = notes_by_id.get(appointment_id) or "(No notes found)"
 
                 # Dynamic Divider Logic (Match longest text)
                 max_length = max(len(date), len(treatment) - 2)
@@ -381,17 +384,13 @@ class AppointmentsPage:
             print("No client selected. Cannot load notes.")
             return
 
-        with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT date, treatment, treatment_notes 
-                FROM appointments 
-                WHERE client_id = ? 
-                AND treatment_notes IS NOT NULL 
-                AND treatment_notes != ''
-                ORDER BY date DESC
-            """, (self.client_id,))
-            all_notes = cursor.fetchall()
+        # Appointments are already newest first in the shared client record
+        record = self.main_app.client_data.fetch(self.client_id)
+        all_notes = [
+            (date, treatment, treatment_notes)
+            for _, date, _, treatment, _, _, treatment_notes in (record["appointments"] if record else [])
+            if treatment_notes
+        ]
 
         # Clear existing notes
         self.all_notes_textbox.configure(state="normal")  # Enable Editing
@@ -404,6 +403,7 @@ class AppointmentsPage:
 
         # Compile formatted notes with dynamic dividers
         for date, treatment, notes in all_notes:
+            date = to_display_date(date)
             max_length = max(len(date), len(treatment) - 2)
             if max_length > 35:
                 max_length = 35
@@ -579,12 +579,12 @@ class AppointmentsPage:
         print(f"Creating Appointment for Client ID {self.client_id}: {date}, {type}, {treatment}, {price}, {treatment_notes}")
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO appointments (client_id, date, type, treatment, price, photos_taken, treatment_notes)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (self.client_id, date, type, treatment, price, "No", treatment_notes if treatment_notes else "<No notes added>"))
+                """, (self.client_id, to_iso_date(date), type, treatment, price, "No", treatment_notes if treatment_notes else "<No notes added>"))
                 conn.commit()
 
             print(f"New appointment created for Client ID {self.client_id} on {date} at {type}.")
@@ -612,7 +612,7 @@ class AppointmentsPage:
             print("Unable to determine appointment ID.")
             return
 
-        with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+        with get_connection(self.main_app.data_manager.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT treatment_notes FROM appointments WHERE id = ?", (appointment_id,))
             treatment_notes_result = cursor.fetchone()
@@ -731,13 +731,13 @@ class AppointmentsPage:
         print(f"Updating Appointment ID {appointment_id}: {date}, {type}, {treatment}, {price}, {treatment_notes}")
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE appointments 
                     SET date = ?, type = ?, treatment = ?, price = ?, treatment_notes = ?
                     WHERE id = ?
-                """, (date, type, treatment, price, treatment_notes if treatment_notes else "<No notes added>", appointment_id))
+                """, (to_iso_date(date), type, treatment, price, treatment_notes if treatment_notes else "<No notes added>", appointment_id))
                 conn.commit()
                 print(f"Appointment {appointment_id} updated successfully.")
 
@@ -750,17 +750,17 @@ class AppointmentsPage:
 
         # Update photos table to sync with the edited appointment
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE photos
                     SET appt_date = ?, type = ?
                     WHERE appointment_id = ?
-                """, (date, type, appointment_id))
+                """, (to_iso_date(date), type, appointment_id))
                 conn.commit()
                 print(f"Synced photos with updated appointment {appointment_id}")
 
-            self.main_app.tabs["Photos"].refresh_photos_list(self.client_id)
+            self.main_app.refresh_tab("Photos")
 
         except Exception as e:
             print(f"Failed to update photos for appointment {appointment_id}: {e}")
@@ -778,7 +778,7 @@ class AppointmentsPage:
     def get_treatment_notes(self, appointment_id):
         """Fetch treatment notes for an appointment."""
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT treatment_notes 
@@ -949,7 +949,7 @@ class AppointmentsPage:
         """Executes appointment deletion and closes the confirmation pop-up."""
         try:
             # --- Fetch and delete photo files associated with this appointment ---
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT file_path FROM photos WHERE appointment_id = ?", (appointment_id,))
                 photo_rows = cursor.fetchall()
@@ -981,7 +981,7 @@ class AppointmentsPage:
                     print(f"Failed to delete folder {folder}: {e}")
 
             # --- Delete from database ---
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM photos WHERE appointment_id = ?", (appointment_id,))
                 print(f"Deleted {len(photo_rows)} photo record(s) from database.")
@@ -992,8 +992,7 @@ class AppointmentsPage:
 
             # --- Refresh UI ---
             self.load_client_appointments(self.client_id)
-            if "Photos" in self.main_app.tabs:
-                self.main_app.tabs["Photos"].refresh_photos_list(self.client_id)
+            self.main_app.refresh_tab("Photos")
 
         except Exception as e:
             print(f"Error deleting appointment: {e}")
@@ -1022,7 +1021,7 @@ class AppointmentsPage:
 
         # Fetch full name of client using client id
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT full_name FROM clients WHERE id = ?", (self.client_id,))
                 result = cursor.fetchone()
@@ -4,8 +4,9 @@ from PIL import Image, ImageTk
 from customtkinter import CTkImage
 from class_elements.treeview_styling_light import style_treeview_light
 from utils.path_utils import resource_path
+from utils.date_utils import to_display_date
 import os
-import sqlite3
+from class_elements.database import get_connection
 
 
 class PhotosPage:
@@ -216,7 +217,7 @@ class PhotosPage:
         new_description = self.before_desc_textbox.get("1.0", "end").strip()
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("SELECT id FROM photos WHERE file_path = ?", (file_path,))
@@ -250,7 +251,7 @@ class PhotosPage:
         new_description = self.after_desc_textbox.get("1.0", "end").strip()
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("SELECT id FROM photos WHERE file_path = ?", (file_path,))
@@ -338,13 +339,14 @@ class PhotosPage:
             return
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT appt_date, description FROM photos WHERE file_path = ?", (file_path,))
                 result = cursor.fetchone()
 
             if result:
                 appointment_date, description = result
+                appointment_date = to_display_date(appointment_date)
 
                 print(f"Retrieved metadata → Date: {appointment_date}, Description: {description}")
 
@@ -431,19 +433,13 @@ class PhotosPage:
         self.before_image_index = -1
         self.after_image_index = -1
 
-        # Clear previous photos
+        # Clear previous photos and drop the previous client's queued thumbnails
         self.clear_photos_list()
+        self.image_loader.cancel_pending()
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, appt_date, type, file_path 
-                    FROM photos 
-                    WHERE client_id = ? 
-                    ORDER BY appt_date DESC
-                """, (client_id,))
-                photos = cursor.fetchall()
+            record = self.main_app.client_data.fetch(client_id)  # Shared, cached client record
+            photos = record["photos"] if record else []
 
             print(f"Debug: Fetched {len(photos)} photos for Client ID {client_id}")
             if not photos:
@@ -461,13 +457,13 @@ class PhotosPage:
 
                 self.photo_list.insert(
                     "", "end", iid=str(photo_id),
-                    values=(appt_date, type)
+                    values=(to_display_date(appt_date), type)
                 )
 
                 thumbnail = self.image_cache.get_thumbnail(file_path)
 
                 if thumbnail is None:
-                    self.image_loader.add_task(file_path, photo_id)
+                    self.image_loader.add_task(file_path, photo_id, priority=index)  # Top rows first
                 else:
                     self.thumbnails[str(photo_id)] = thumbnail
                     self.photo_list.item(str(photo_id), image=thumbnail)
@@ -497,7 +493,7 @@ class PhotosPage:
             return
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
 
                 for iid in selected:
@@ -511,6 +507,10 @@ class PhotosPage:
                         except Exception as e:
                             print(f"Failed to delete file {file_path}: {e}")
 
+                    # Drop its stored thumbnail
+                    if file_path and self.image_loader.store:
+                        self.image_loader.store.discard(file_path)
+
                     # Delete from DB
                     cursor.execute("DELETE FROM photos WHERE id = ?", (photo_id,))
                     print(f"Deleted: {file_path}")
@@ -586,14 +586,10 @@ class PhotosPage:
 
 
     def update_ui_with_thumbnail(self, photo_id, thumbnail):
-        """Update the Treeview with the new thumbnail and store the reference to prevent GC."""
+        """Update the Treeview with the new thumbnail and store the reference to prevent GC (called on the Tk thread)."""
         if self.photo_list.exists(str(photo_id)):
             self.thumbnails[str(photo_id)] = thumbnail  # Store the reference
-            # Wrap in a function to bind thumbnail by default
-            def set_item_image():
-                self.photo_list.item(str(photo_id), image=self.thumbnails[str(photo_id)])
-
-            self.main_app.after(0, set_item_image)
+            self.photo_list.item(str(photo_id), image=thumbnail)
 
         else:
             print(f"Skipping UI update: Treeview item {photo_id} not found.")
@@ -4,19 +4,16 @@ from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 from class_elements.treeview_styling_light import style_treeview_light
 import os
-from pdf2image import convert_from_path
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 from datetime import datetime
 import textwrap
 from utils.path_utils import resource_path
-from class_elements.pdf_generators.pdf_2col import Pdf2ColGenerator
-from class_elements.pdf_generators.pdf_3col import Pdf3ColGenerator
-from class_elements.pdf_generators.pdf_4col import Pdf4ColGenerator
+from utils.date_utils import to_iso_date, to_display_date
 from class_elements.pdf_generators.prescription_entry_popup import PrescriptionEntryPopup
 from class_elements.PdfRenderThread import PdfRenderWorker
+from class_elements.pdf_preview_cache import PdfPreviewCache
+from class_elements.thumbnail_store import PDF_PAGE
 import json
-import sqlite3
+from class_elements.database import get_connection
 
 
 class PrescriptionsPage:
@@ -25,10 +22,8 @@ class PrescriptionsPage:
         self.data_manager = data_manager
         self.appointment_id = None
         self.current_prescription_id = None
-        self.pdf_render_worker = PdfRenderWorker(self.display_rendered_pdf)
-        self.pdf_2col = Pdf2ColGenerator(data_manager)
-        self.pdf_3col = Pdf3ColGenerator(data_manager)
-        self.pdf_4col = Pdf4ColGenerator(data_manager)
+        self.preview_cache = PdfPreviewCache(store=main_app.image_cache.store)  # First-page rasters, kept across selections and runs
+        self.pdf_render_worker = PdfRenderWorker(self.display_rendered_pdf, self.preview_cache)
 
         self.prescription_paths = {}  # {iid: filepath}
 
@@ -165,7 +160,7 @@ class PrescriptionsPage:
             return
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO prescriptions (client_id, form_type, file_path, data_json, start_date)
@@ -175,7 +170,7 @@ class PrescriptionsPage:
                     form_type,
                     pdf_path,
                     json.dumps(data),
-                    start_date
+                    to_iso_date(start_date)
                 ))
 
                 prescription_id = cursor.lastrowid
@@ -189,7 +184,7 @@ class PrescriptionsPage:
             )
             self.prescription_paths[str(prescription_id)] = pdf_path
             self.prescription_list.selection_set(iid)
-            self.render_pdf_to_preview(pdf_path)
+            self.render_pdf_to_preview(pdf_path)  # Renders and stores the new PDF's preview
 
         except Exception as e:
             print(f"Failed to save prescription: {e}")
@@ -199,20 +194,14 @@ class PrescriptionsPage:
         self.clear_prescriptions_list()
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, form_type, file_path, start_date FROM prescriptions
-                    WHERE client_id = ?
-                    ORDER BY start_date DESC
-                """, (client_id,))
-                prescriptions = cursor.fetchall()
+            record = self.main_app.client_data.fetch(client_id)  # Shared, cached client record
+            prescriptions = record["prescriptions"] if record else []
 
             for index, pres in enumerate(prescriptions):
                 pres_id, form_type, file_path, start_date = pres
 
                 tag = 'alternate' if index % 2 == 1 else None
-                created_date = start_date if os.path.exists(file_path) else "Unknown"
+                created_date = to_display_date(start_date) if os.path.exists(file_path) else "Unknown"
 
                 iid = self.prescription_list.insert(
                     "", "end",
@@ -261,7 +250,7 @@ class PrescriptionsPage:
         prescription_id = int(iid)
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT data_json, file_path, form_type
@@ -296,7 +285,7 @@ class PrescriptionsPage:
             form_type = f"{sum(1 for key in updated_data if key.startswith('Col') and '_Header' in key)}-column"
             start_date = updated_data.get("start_date")
 
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE prescriptions
@@ -306,7 +295,7 @@ class PrescriptionsPage:
                     form_type,
                     updated_path,
                     json.dumps(updated_data),
-                    start_date,
+                    to_iso_date(start_date),
                     prescription_id
                 ))
                 conn.commit()
@@ -319,6 +308,8 @@ class PrescriptionsPage:
                 ))
                 self.prescription_paths[str(prescription_id)] = updated_path
                 self.render_pdf_to_preview(updated_path)
+            else:
+                self.preview_cache.prerender_async(updated_path)  # Ready for when it's selected
 
             print("Prescription updated successfully.")
 
@@ -379,6 +370,7 @@ class PrescriptionsPage:
             # Delete the PDF file
             if pdf_path and os.path.exists(pdf_path):
                 os.remove(pdf_path)
+                self.preview_cache.discard(pdf_path)
                 print(f"🗑️ Deleted PDF file: {pdf_path}")
 
                 # Delete folder if empty
@@ -388,7 +380,7 @@ class PrescriptionsPage:
                     print(f"🗑️ Deleted empty folder: {folder}")
 
             # Delete from database
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM prescriptions WHERE file_path = ?", (pdf_path,))
                 conn.commit()
@@ -439,29 +431,30 @@ class PrescriptionsPage:
         # Lock interaction to this window only
         popup.grab_set()
 
-        try:
-            pages = convert_from_path(pdf_path, dpi=150, first_page=1, last_page=1)
-
-            if pages:
-                image = pages[0]
+        label = ctk.CTkLabel(popup, text="Loading preview...", text_color="#555555")
+        label.pack(fill="both", expand=True, padx=0, pady=0)
 
-                # Resize the image to exactly match popup size
-                resized_image = image.resize((popup_width, popup_height), Image.LANCZOS)
-
-                # Properly use CTkImage here
-                ctk_image = CTkImage(light_image=resized_image, dark_image=resized_image, size=(popup_width, popup_height))
-
-                # Use CTkLabel with CTkImage
-                label = ctk.CTkLabel(popup, image=ctk_image, text="")
-                label.image = ctk_image  # Keep a reference to prevent garbage collection
-                label.pack(fill="both", expand=True, padx=0, pady=0)
-
-                print(f"PDF displayed at {popup_width}x{popup_height}px.")
-            else:
-                print("No pages found in PDF.")
+        def show_page(image):
+            if not popup.winfo_exists():
+                return  # Closed before the page was ready
+            if image is None:
+                label.configure(text="Could not load the PDF preview.")
+                return
 
-        except Exception as e:
-            print(f"Failed to load PDF for popup: {e}")
+            # The full-resolution page, downsampled once to the popup size
+            ctk_image = CTkImage(light_image=image, dark_image=image, size=(popup_width, popup_height))
+            label.configure(image=ctk_image, text="")
+            label.image = ctk_image  # Keep a reference to prevent garbage collection
+            print(f"PDF displayed at {popup_width}x{popup_height}px.")
+
+        # Shown at once from memory; otherwise loaded (or rendered) off the Tk thread
+        image = self.preview_cache.peek(pdf_path, kind=PDF_PAGE)
+        if image is not None:
+            show_page(image)
+        else:
+            self.preview_cache.prerender_async(
+                pdf_path, lambda image: self.main_app.after(0, show_page, image), kind=PDF_PAGE
+            )
 
 
     def print_prescription(self):
@@ -493,30 +486,38 @@ class PrescriptionsPage:
 
     def set_alert(self):
         current_client_id = self.main_app.profile_card.client_id  # or however you store it
-        self.main_app.tabs["Alerts"].create_proxy_alert(current_client_id)
+        self.main_app.get_tab("Alerts").create_proxy_alert(current_client_id)
   
 
     def render_pdf_to_preview(self, pdf_path):
-        # Launch threaded PDF rendering to keep UI responsive
-        self.pdf_render_worker.render_async(pdf_path)
+        # Cached previews show at once; otherwise render on a thread to keep UI responsive
+        image = self.preview_cache.peek(pdf_path)
+        if image is not None:
+            self.pdf_render_worker.cancel_pending()  # An earlier selection's render must not replace this one
+            self.show_pdf_preview(image)
+        else:
+            self.pdf_render_worker.render_async(pdf_path)
 
 
-    def display_rendered_pdf(self, image):
-        # Must run UI updates on main thread
+    def display_rendered_pdf(self, image, request_id):
+        # Must run UI updates on main thread; results for an earlier selection are dropped there
         def update():
-            ctk_image = CTkImage(light_image=image, size=image.size)
+            if self.pdf_render_worker.is_current(request_id):
+                self.show_pdf_preview(image)
 
-            # Clear previous image
-            for widget in self.preview_inner_frame.winfo_children():
-                widget.destroy()
+        self.main_app.after(0, update)
 
-            label = ctk.CTkLabel(self.preview_inner_frame, image=ctk_image, text="", fg_color="#ebebeb")
-            label.image = ctk_image
-            label.pack()
 
-            print("PDF rendered in background and updated UI.")
+    def show_pdf_preview(self, image):
+        ctk_image = CTkImage(light_image=image, size=image.size)
 
-        self.main_app.after(0, update)
+        # Clear previous image
+        for widget in self.preview_inner_frame.winfo_children():
+            widget.destroy()
+
+        label = ctk.CTkLabel(self.preview_inner_frame, image=ctk_image, text="", fg_color="#ebebeb")
+        label.image = ctk_image
+        label.pack()
 
 
     def on_prescription_select(self, event):
@@ -525,7 +526,7 @@ class PrescriptionsPage:
             iid = selected[0]
             path = self.prescription_paths.get(iid)
             if path and os.path.exists(path):
-                self.pdf_render_worker.render_async(path)
+                self.render_pdf_to_preview(path)
 
 
     def _update_scroll_region(self, event):
@@ -3,10 +3,14 @@ from tkinter import ttk, filedialog, messagebox
 import tkinter as tk
 from PIL import Image
 from utils.path_utils import resource_path
+from utils.date_utils import to_iso_date, to_display_date, parse_date
 from class_elements.treeview_styling_light import style_treeview_light
 from datetime import datetime, timedelta
 import re
-import sqlite3
+from class_elements.database import get_connection
+
+
+INVALID_DATE_STATUS = "Invalid date"    # Status shown for a deadline that can't be parsed
 
 
 class AlertsPage:
@@ -119,22 +123,28 @@ class AlertsPage:
             for item in self.alerts_list.get_children():
                 self.alerts_list.delete(item)
 
-            # Query the database for all alerts with client details
+            # Query the database for all alerts with client details.
+            # ISO deadlines sort chronologically (idx_alerts_deadline) and SQLite computes days remaining.
             query = """
-            SELECT a.id, a.client_id, c.full_name, c.primary_phone, a.deadline, a.notes
+            SELECT a.id, a.client_id, c.full_name, c.primary_phone, a.deadline, a.notes,
+                   CAST(julianday(a.deadline) - julianday('now', 'localtime', 'start of day') AS INTEGER)
             FROM alerts a
             JOIN clients c ON a.client_id = c.id
             ORDER BY a.deadline ASC
             """
 
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 alerts = cursor.execute(query).fetchall()
 
             # Populate the Treeview with the alerts
             for alert in alerts:
-                alert_id, client_id, client_name, phone_number, deadline, notes = alert
-                status = self.calculate_status(deadline)  # Calculate status based on the deadline
+                alert_id, client_id, client_name, phone_number, deadline, notes, days_difference = alert
+                deadline = to_display_date(deadline)
+                if days_difference is None:
+                    status = self.calculate_status(deadline)  # Deadline SQLite can't read (legacy format or invalid)
+                else:
+                    status = self.status_from_days(days_difference)
                 self.alerts_list.insert("", "end", iid=str(alert_id), values=(client_name, status, deadline, phone_number, notes))
             
             # Update the alert colors based on their status
@@ -156,7 +166,7 @@ class AlertsPage:
         alert_id = selected_item[0]
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT deadline, notes FROM alerts WHERE id = ?", (alert_id,))
                 alert_data = cursor.fetchone()
@@ -184,7 +194,7 @@ class AlertsPage:
         # Deadline
         ctk.CTkLabel(frame, text="Deadline", anchor="w").pack(anchor="w", padx=5, pady=(10, 2))
         self.popup_deadline_entry = ctk.CTkEntry(frame, placeholder_text="MM/DD/YYYY")
-        self.popup_deadline_entry.insert(0, deadline)
+        self.popup_deadline_entry.insert(0, to_display_date(deadline))
         self.popup_deadline_entry.pack(fill="x", padx=5)
         self.popup_deadline_entry.bind("<FocusOut>", lambda e: self.format_date_popup())
         self.popup_deadline_entry.bind("<Return>", lambda e: self.format_date_popup())
@@ -224,11 +234,11 @@ class AlertsPage:
             return
 
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE alerts SET deadline = ?, notes = ? WHERE id = ?
-                """, (new_deadline, new_notes, alert_id))
+                """, (to_iso_date(new_deadline), new_notes, alert_id))
                 print(f"Alert {alert_id} updated.")
 
             self.load_alerts()
@@ -282,7 +292,7 @@ class AlertsPage:
     def _execute_delete_alert(self, alert_id, popup):
         """Delete the alert from the database and refresh the view."""
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
 
@@ -415,8 +425,12 @@ class AlertsPage:
     def sort_treeview(self):
         items = [(self.alerts_list.item(iid, 'values'), iid) for iid in self.alerts_list.get_children()]
 
-        # Sort items based on the deadline (third value in the tuple)
-        items.sort(key=lambda item: datetime.strptime(item[0][2], "%m/%d/%Y"))
+        # Sort items based on the deadline (third value in the tuple); unparseable deadlines go last
+        def deadline_key(item):
+            deadline_date = parse_date(item[0][2])
+            return (deadline_date is None, deadline_date or datetime.min.date())
+
+        items.sort(key=deadline_key)
 
         # Clear the existing entries in the Treeview
         self.alerts_list.delete(*self.alerts_list.get_children())
@@ -431,10 +445,15 @@ class AlertsPage:
 
     def calculate_status(self, deadline):
         """Calculate the status based on the deadline, including the exact number of days in the status."""
-        deadline_date = datetime.strptime(deadline, "%m/%d/%Y").date()  # Convert to date to avoid time part
+        deadline_date = parse_date(deadline)
+        if deadline_date is None:
+            return INVALID_DATE_STATUS  # Only this row is affected; the rest of the list still loads
         today = datetime.now().date()  # Already a date object, no time part
-        days_difference = (deadline_date - today).days
+        return self.status_from_days((deadline_date - today).days)
+
 
+    def status_from_days(self, days_difference):
+        """Build the status label from the number of days until the deadline."""
         if days_difference > 3:
             status = f"{days_difference} days"  # More than 3 days ahead
         elif days_difference == 3:
@@ -452,15 +471,12 @@ class AlertsPage:
 
 
     def get_client_details(self, client_id):
-        try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT full_name, primary_phone FROM clients WHERE id = ?", (client_id,))
-                result = cursor.fetchone()
-                return result if result else (None, None)
-        except Exception as e:
-            print(f"Error fetching client details: {e}")
+        record = self.main_app.client_data.fetch(client_id)  # Shared, cached client record
+        if record is None:
             return None, None
+        full_name = record["client"][0]
+        primary_phone = record["client"][8]
+        return full_name, primary_phone
 
 
     def save_alert_to_database(self, client_id, deadline, notes):
@@ -469,9 +485,9 @@ class AlertsPage:
         VALUES (?, ?, ?)
         """
         try:
-            with sqlite3.connect(self.main_app.data_manager.db_path) as conn:
+            with get_connection(self.main_app.data_manager.db_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute(query, (client_id, deadline, notes))
+                cursor.execute(query, (client_id, to_iso_date(deadline), notes))
                 return cursor.lastrowid
         
         except Exception as e:
@@ -482,11 +498,12 @@ class AlertsPage:
     def update_alert_colors(self):
         for item in self.alerts_list.get_children():
             alert_data = self.alerts_list.item(item, 'values')
-            deadline = alert_data[2]  # Assuming this is where the deadline date is stored
-            status = self.calculate_status(deadline)
+            status = alert_data[1]  # Status column is already computed on insert
             
             # Determine the color based on the status string
-            if "Overdue" in status:
+            if status == INVALID_DATE_STATUS:
+                color = 'gray'
+            elif "Overdue" in status:
                 color = 'red'
             elif "Due Today" in status:
                 color = 'orange'
@@ -503,6 +520,7 @@ class AlertsPage:
             self.alerts_list.tag_configure('yellow', background='#FFFF99')  # Light yellow
             self.alerts_list.tag_configure('orange', background='#ff9900')  # Orange
             self.alerts_list.tag_configure('red', background='#FF6347')  # Tomato red
+            self.alerts_list.tag_configure('gray', background='#D3D3D3')  # Light gray (deadline can't be read)
 
 
     def format_date(self):
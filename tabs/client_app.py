@@ -6,9 +6,18 @@ from tabs._4_photos_page import PhotosPage
 from tabs._5_prescriptions_page import PrescriptionsPage
 from tabs._6_alerts_page import AlertsPage
 from class_elements.profile_card import ProfileCard
+from class_elements.client_data_loader import ClientDataLoader
+from class_elements.event_bus import event_bus, PHOTO_UPLOADED, PROFILE_UPDATED
 from class_elements.splash_screen import SplashScreen
-from class_elements.img_load_threading import ImageLoaderThread
+from class_elements.thumbnail_pipeline import PRIORITY_PRELOAD
 from utils.path_utils import resource_path
+from utils import startup_timing
+import time
+
+
+# Tabs that show the selected client's data (reloaded by set_selected_client)
+CLIENT_TABS = ("Info", "Appointments", "Photos", "Prescriptions", "Alerts")
+
 
 class ClientApp(ctk.CTk):
     def __init__(self, image_cache, image_loader, data_manager):
@@ -22,103 +31,30 @@ class ClientApp(ctk.CTk):
         self.image_loader = image_loader  # Now `self.image_loader` exists in ClientApp
         self.data_manager= data_manager
         self.selected_client_id = None  # Store selected client ID
+        self.client_data = ClientDataLoader(self, data_manager.db_path)  # Cached per-client records for every tab
+
+        # Phone uploads (upload server threads) arrive as events on the Tk thread
+        event_bus.attach(self)
+        event_bus.subscribe(PHOTO_UPLOADED, self.on_photos_uploaded)
+        event_bus.subscribe(PROFILE_UPDATED, self.on_profile_updated)
 
         # Hide the UI until everything is preloaded
         self.withdraw()
 
 
     def preload_assets(self, splash_screen):
-        """Load full images & thumbnails while updating splash screen progress."""
-        splash_screen.update_progress(0, "Initializing UI...")
-
-        # First, initialize the UI BEFORE loading images
-        self.init_ui()
-
-        # Now that the UI is set up, start loading cached images
-        splash_screen.update_progress(0.00, "Loading cached images...")
-
-        # Load image caches
-        self.image_cache.load_image_cache(splash_screen)  # Load full-size images
-        self.image_cache.load_thumbnail_cache()  # Load cached thumbnail paths
-
-        # Prepare lists
-        full_images = list(self.image_cache.image_cache.keys())
-        thumbnails = list(self.image_cache.thumbnail_cache.keys())
-
-        total_full_images = len(full_images)
-        total_thumbnails = len(thumbnails)
-        total_items = total_full_images + total_thumbnails
-
-        if total_items == 0:
-            print("⚠ Warning: No cached images or thumbnails found!")
-            return self.finish_loading(splash_screen)
-
-        # Allocate exact progress range:
-        full_start = 0.05  # Start at 5%
-        full_end = 0.50    # Full images end at 50%
-        thumb_start = 0.50   # Thumbnails start at 50%
-        thumb_end = 1.00     # End at 100%
-
-        # Calculate step sizes based on counts
-        step_full_images = (full_end - full_start) / total_full_images if total_full_images > 0 else 0
-        step_thumbnails = (thumb_end - thumb_start) / total_thumbnails if total_thumbnails > 0 else 0
-
-        # Process full-size images one by one asynchronously
-        self.load_full_images(full_images, thumbnails, splash_screen, 0, step_full_images, step_thumbnails)
-
+        """Build the UI with progress on the splash screen, show the window, then warm the image caches in the background."""
+        self.init_ui(progress=lambda fraction, tab_name: splash_screen.update_progress(fraction, f"Building {tab_name} tab..."))
+        startup_timing.mark("UI built")
 
-    def load_full_images(self, full_images, thumbnails, splash_screen, index, step_full, step_thumb):
-        """Recursively load full-size images while updating the progress bar."""
-        if index >= len(full_images):
-            print("Finished loading full-size images, moving to thumbnails...")
-            return self.after(10, lambda: self.load_thumbnails(thumbnails, splash_screen, 0.50, step_thumb))
-
-        file_path = full_images[index]
-
-        self.image_cache.get_image(file_path)  # Load image
-
-        progress = 0.05 + (index + 1) * step_full  # Smoothly increments between 5% and 50%
-        splash_screen.update_progress(progress, f"Loading images... ({index + 1:02}/{len(full_images)})")
-
-        # Schedule the next image load asynchronously
-        self.after(10, lambda: self.load_full_images(full_images, thumbnails, splash_screen, index + 1, step_full, step_thumb))
-
-
-    def load_thumbnails(self, thumbnails, splash_screen, start_progress, step_thumb):
-        """Load thumbnails while updating splash screen progress."""
-        total_thumbnails = len(thumbnails)
-        # print(f"Skipping thumbnail generation during splash screen. Total: {len(thumbnails)}")
-        # return self.finish_loading(splash_screen)
-
-        if total_thumbnails == 0:
-            print("Warning: No thumbnails found to load!")
-            return self.finish_loading(splash_screen)  # Handle case where no thumbnails exist
-
-        print(f"Loading {total_thumbnails} thumbnails...")
-
-        def process_thumbnail(i):
-            if i >= total_thumbnails:
-                return self.finish_loading(splash_screen)  # All thumbnails done → Finish loading
-
-            file_path = thumbnails[i]
-            print(f"Loading thumbnail {i+1}/{total_thumbnails}: {file_path}")
-
-            thumbnail = self.image_cache.get_thumbnail(file_path)  # Load thumbnail
-
-            if thumbnail is None:
-                # Add task to worker thread to generate the thumbnail asynchronously
-                self.image_loader.add_task(file_path, i)  # Use `i` as temporary ID
-            else:
-                # Use cached thumbnail immediately in UI
-                self.main_app.after(0, lambda: self.update_ui_with_thumbnail(i, thumbnail))
+        # Startup images decode on a background thread and thumbnails go to the worker pool;
+        # both are cached as they arrive, so nothing here waits for them
+        self.image_cache.preload_images_async(self, self.image_cache.read_startup_paths())
+        self.image_cache.load_thumbnail_cache()
+        for file_path in self.image_cache.startup_thumbnail_paths:
+            self.image_loader.add_task(file_path, None, priority=PRIORITY_PRELOAD)  # Cache only, no Treeview row
 
-            progress = start_progress + ((i + 1) * step_thumb)
-            splash_screen.update_progress(progress, f"Loading thumbnails... ({i+1:02}/{total_thumbnails})")
-            
-            # Schedule the next thumbnail to load asynchronously
-            self.after(10, lambda: process_thumbnail(i + 1))
-
-        process_thumbnail(0)  # Start thumbnail loading asynchronously
+        self.finish_loading(splash_screen)
 
 
     def finish_loading(self, splash_screen):
@@ -126,36 +62,56 @@ class ClientApp(ctk.CTk):
         splash_screen.stop_timer()  # Stop the timer before destroying the screen
         splash_screen.destroy()  # Now it's safe to destroy
         self.deiconify()  # Show main application
+        self.after_idle(self.report_startup_time)  # Runs once the window has been mapped and drawn
+
 
+    def report_startup_time(self):
+        startup_timing.mark("Window interactive")
+        startup_timing.report()
 
-    def init_ui(self):
-        """Initialize the UI components after Tkinter is ready."""
+
+    def init_ui(self, progress=None):
+        """Initialize the UI components after Tkinter is ready. progress(fraction, tab_name) is called before the startup tab is built."""
         # Now it's safe to create UI components
         self.profile_card = ProfileCard(self, self.data_manager, self)  
 
         # Main Tab View
-        self.tab_view = ctk.CTkTabview(self, anchor="nw")
+        self.tab_view = ctk.CTkTabview(self, anchor="nw", command=self.on_tab_changed)
         self.tab_view.pack(fill="both", expand=True, padx=(10, 10), pady=(0, 10))
 
-        # Add Tabs
-        self.tab_view.add("Alerts")
-        self.tab_view.add("Clients")
-        self.tab_view.add("Info")
-        self.tab_view.add("Appointments")
-        self.tab_view.add("Photos")
-        self.tab_view.add("Prescriptions")
+        # Tabs are added up front, but each page is only built on first activation (get_tab)
+        self.tab_builders = {
+            "Alerts": self.init_alerts_tab,
+            "Clients": self.init_clients_tab,
+            "Info": self.init_info_tab,
+            "Appointments": self.init_appointments_tab,
+            "Photos": self.init_photos_tab,
+            "Prescriptions": self.init_prescriptions_tab,
+        }
+        for tab_name in self.tab_builders:
+            self.tab_view.add(tab_name)
+
+        # Tabs dictionary to store references (built pages only)
+        self.tabs = {}
+        self.dirty_tabs = set()  # Built but hidden tabs that still show a previously selected client
 
+        # Only the tab visible at startup is built now
+        current_tab = self.tab_view.get()
+        if progress:
+            progress(0.5, current_tab)
+        self.get_tab(current_tab)
 
-        # Tabs dictionary to store references
-        self.tabs = {}
 
-        # Add Content to Each Tab
-        self.init_alerts_tab()
-        self.init_clients_tab()
-        self.init_info_tab()
-        self.init_appointments_tab()
-        self.init_photos_tab()
-        self.init_prescriptions_tab()
+    def get_tab(self, tab_name):
+        """Return the page for a tab, building it on first use."""
+        if tab_name not in self.tabs:
+            start = time.perf_counter()
+            self.tab_builders[tab_name]()
+            print(f"Built {tab_name} tab in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+            if tab_name in CLIENT_TABS and self.selected_client_id:
+                self.dirty_tabs.add(tab_name)  # New pages start empty; load the selected client when shown
+        return self.tabs[tab_name]
 
 
     def init_clients_tab(self):
@@ -175,7 +131,7 @@ class ClientApp(ctk.CTk):
         photos_page = PhotosPage(photos_tab, self, self.image_cache, self.image_loader, self.data_manager)
         self.tabs["Photos"] = photos_page
 
-        self.image_loader.update_ui_callback = photos_page.update_ui_with_thumbnail
+        self.image_loader.set_ui(self, photos_page.update_ui_with_thumbnail)
     
     def init_prescriptions_tab(self):
         prescriptions_tab = self.tab_view.tab("Prescriptions")
@@ -189,26 +145,101 @@ class ClientApp(ctk.CTk):
         """Switch to the specified tab by name."""
         try:
             self.tab_view.set(tab_name)  # Switch to the specified tab
+            self.on_tab_changed()  # set() doesn't fire the tabview command
             if data and tab_name == "Info":
                 self.tabs["Info"].populate_full_name(data)  # Call method in Info tab to populate data
         except Exception as e:
             print(f"Error switching to tab '{tab_name}': {e}")
-    
+
+
+    def on_tab_changed(self):
+        """Build the newly shown tab if needed and bring it up to date with the selected client."""
+        tab_name = self.tab_view.get()
+        self.get_tab(tab_name)
+
+        if tab_name in self.dirty_tabs:
+            self.dirty_tabs.discard(tab_name)
+            self.load_selected_client(tab_name)
+
 
     def set_selected_client(self, client_id):
-        """Set the currently selected client and update relevant tabs."""
+        """
+        Set the selected client (None clears it). The client's record is loaded in the background
+        (or taken from the cache), then the profile card and visible tab update; the rest when next shown.
+        """
         self.selected_client_id = client_id
-        self.update_info_tab()
-        self.update_appointments_tab()
+        if client_id:
+            self.client_data.load_async(client_id, self.on_client_data_loaded)
+            return
+
+        self.client_data.cancel()
+        self.profile_card.load_client(None)
+        for tab_name in CLIENT_TABS:
+            self.refresh_tab(tab_name)
+
 
+    def on_client_data_loaded(self, client_id, record):
+        """Fan a loaded client record out to the profile card and tabs (Tk thread)."""
+        if client_id != self.selected_client_id:
+            return  # Another client was selected meanwhile
 
-    def update_info_tab(self):
-        """Update the Info Tab with data for the selected client."""
-        if self.selected_client_id:
-            self.tabs["Info"].load_client_data(self.selected_client_id)
+        self.profile_card.load_client(client_id)
+        for tab_name in CLIENT_TABS:
+            self.refresh_tab(tab_name)
 
 
-    def update_appointments_tab(self):
-        """Update the Appointments Tab with data for the selected client."""
-        if self.selected_client_id:
-            self.tabs["Appointments"].load_client_appointments(self.selected_client_id)
+    def on_photos_uploaded(self, client_id, appointment_id, file_paths):
+        """photo_uploaded event: show the new photos if their client is selected."""
+        if client_id != self.selected_client_id:
+            return
+
+        self.refresh_tab("Photos")
+        self.refresh_tab("Appointments")  # photos_taken flag
+
+
+    def on_profile_updated(self, client_id, file_path):
+        """profile_updated event: redraw the profile card if its client is selected."""
+        if client_id == self.selected_client_id:
+            self.profile_card.load_client(client_id)
+
+
+    def refresh_tab(self, tab_name):
+        """Reload a client tab now if it's visible, otherwise mark it dirty. Unbuilt tabs load when first shown."""
+        if tab_name not in self.tabs:
+            return
+
+        if tab_name == self.tab_view.get():
+            self.dirty_tabs.discard(tab_name)
+            self.load_selected_client(tab_name)
+        else:
+            self.dirty_tabs.add(tab_name)
+
+
+    def load_selected_client(self, tab_name):
+        """Show the selected client's data in a built tab, or clear it when no client is selected."""
+        page = self.tabs[tab_name]
+        client_id = self.selected_client_id
+
+        if tab_name == "Info":
+            if client_id:
+                page.populate_client_info(client_id)
+            else:
+                page.clear_info()
+        elif tab_name == "Appointments":
+            if client_id:
+                page.load_client_appointments(client_id)
+            else:
+                page.clear_appointments()
+        elif tab_name == "Photos":
+            if client_id:
+                page.refresh_photos_list(client_id)
+            else:
+                page.clear_photos_list()
+        elif tab_name == "Prescriptions":
+            if client_id:
+                page.load_prescriptions_for_client(client_id)
+            else:
+                page.clear_prescriptions_list()
+        elif tab_name == "Alerts":
+            page.update_client_id(client_id)
+            page.load_alerts()  # Lists every client's alerts; reload in case one was added, renamed or deleted
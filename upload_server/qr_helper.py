@@ -1,5 +1,4 @@
 import socket
-import qrcode
 import os
 from datetime import datetime
 
@@ -39,7 +38,8 @@ def generate_upload_qr(client_id: int, appointment_id: int = None, data_manager=
     filename = "temp_qr_code.png"
     filepath = os.path.join(output_dir, filename)
 
-    # Generate QR code
+    # Generate QR code (qrcode is imported on first use; most sessions never show a QR code)
+    import qrcode
     img = qrcode.make(url)
     img.save(filepath)
 
@@ -1,15 +1,21 @@
 from flask import Flask, request, render_template, jsonify
 import os
-import sqlite3
+from class_elements.database import get_connection, get_pool
+from class_elements.event_bus import event_bus, PHOTO_UPLOADED, PROFILE_UPDATED
+from class_elements.thumbnail_store import ThumbnailStore, THUMBNAIL, DISPLAY, THUMBNAIL_SIZE, DISPLAY_SIZE
+from utils.date_utils import to_display_date
+from utils.image_ingest import store_upload_unique, save_profile_picture
+from utils.image_utils import make_renditions
+from utils.path_utils import unique_destinations
 from werkzeug.utils import secure_filename
 from datetime import datetime
-from PIL import Image, ExifTags
 import json
 import sys
 import logging
 from tkinter import Tk, messagebox
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 
 DB_PATH = None
@@ -17,6 +23,25 @@ UPLOAD_BASE_DIR = None
 PROFILE_PIC_DIR = None
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+POSTPROCESS_WORKERS = max(2, min(4, os.cpu_count() or 2))   # PIL releases the GIL while decoding/encoding
+
+_postprocess_pool = None
+_thumbnail_store = None
+_postprocess_lock = threading.Lock()
+
+# Serving mode. "auto" picks the first installed of waitress / cheroot, then Flask's dev server.
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+SERVER_BACKEND = "auto"
+SERVER_THREADS = 6                  # Concurrent requests (several phones uploading at once)
+MAX_UPLOAD_MB = 500                 # Whole request body: a batch of full-resolution phone photos
+KEEP_ALIVE_S = 30                   # Idle seconds before a kept-alive connection is closed
+SHUTDOWN_TIMEOUT_S = 5              # stop_flask_server(): wait this long for in-flight uploads
+
+_server_lock = threading.Lock()
+_server_stop = None                 # Stops the running server (set by start_flask_server)
+_thread_per_request = False         # Request threads exit after one request (dev server)
+
 def load_data_paths():
     """Load SkinProData paths from user's selected config location."""
     # Step 1: Look for the global pointer config in the user's home directory
@@ -67,6 +92,99 @@ def load_data_paths():
 
 
 app = Flask(__name__)
+
+
+@app.teardown_request
+def release_db_connection(exc=None):
+    """
+    Close this request thread's pooled connection when the backend runs a thread per request
+    (the dev server). waitress and cheroot reuse a fixed set of `threads` workers, which keep
+    their connection (the pool's cap budgets for SERVER_THREADS of them).
+    """
+    if DB_PATH and _thread_per_request:
+        get_pool(DB_PATH).release()
+
+
+######################################
+### --- Upload Post-Processing --- ###
+######################################
+def get_postprocess_pool():
+    """Shared worker pool for orientation fixes and thumbnails (created on the first upload)."""
+    global _postprocess_pool
+    with _postprocess_lock:
+        if _postprocess_pool is None:
+            _postprocess_pool = ThreadPoolExecutor(max_workers=POSTPROCESS_WORKERS, thread_name_prefix="UploadWorker")
+        return _postprocess_pool
+
+
+def get_thumbnail_store():
+    """The app's ThumbnailStore (SkinProData/thumbnails.db, next to the database), or None if unavailable."""
+    global _thumbnail_store
+    with _postprocess_lock:
+        if _thumbnail_store is None:
+            try:
+                _thumbnail_store = ThumbnailStore(os.path.join(os.path.dirname(DB_PATH), "thumbnails.db"))
+            except Exception as e:
+                print(f"Thumbnail store unavailable: {e}")
+        return _thumbnail_store
+
+
+def log_uploaded_photos(saved_paths, photo_row):
+    """Insert the photo rows of one upload request in a single transaction and mark the appointment's photos taken."""
+    client_id, appointment_id, appt_date, appt_type = photo_row
+    with get_connection(DB_PATH) as conn:
+        conn.executemany(
+            "INSERT INTO photos (client_id, appointment_id, appt_date, file_path, type) VALUES (?, ?, ?, ?, ?)",
+            [(client_id, appointment_id, appt_date, path, appt_type) for path in saved_paths]
+        )
+        conn.execute("UPDATE appointments SET photos_taken = 'Yes' WHERE id = ?", (appointment_id,))
+    print(f"📸 Logged {len(saved_paths)} photo(s) for appointment {appointment_id}")
+
+
+class UploadBatch:
+    """
+    Rendition work for one upload request, run on the shared worker pool after the response is sent
+    (the photo rows are already in the database by then). Every photo gets its (upright) thumbnail
+    and display renditions stored; when the last one is done, a photo_uploaded event tells the UI,
+    whose thumbnails then come straight from the store. The photos keep their original bytes.
+    """
+    def __init__(self, saved_paths, client_id, appointment_id):
+        self.saved_paths = list(saved_paths)
+        self.client_id = int(client_id)
+        self.appointment_id = int(appointment_id)
+        self._remaining = len(self.saved_paths)
+        self._lock = threading.Lock()
+
+
+    def start(self):
+        pool = get_postprocess_pool()
+        for save_path in self.saved_paths:
+            pool.submit(self._process_one, save_path).add_done_callback(self._file_done)
+
+
+    def _process_one(self, save_path):
+        store = get_thumbnail_store()
+        if store is None:
+            return
+        try:
+            key = store.source_key(save_path)
+            if key:
+                thumbnail, display_image = make_renditions(save_path, THUMBNAIL_SIZE, DISPLAY_SIZE)
+                store.save_all(key, [(THUMBNAIL, THUMBNAIL_SIZE, thumbnail), (DISPLAY, DISPLAY_SIZE, display_image)])
+        except Exception as e:
+            print(f"Could not store renditions for {save_path}: {e}")
+        finally:
+            get_pool(store.db_path).release()  # Uploads are occasional: don't hold a slot between them
+
+
+    def _file_done(self, future):
+        with self._lock:
+            self._remaining -= 1
+            if self._remaining:
+                return
+        event_bus.publish(PHOTO_UPLOADED, client_id=self.client_id, appointment_id=self.appointment_id, file_paths=list(self.saved_paths))
+
+
 @app.route('/upload', methods=['GET', 'POST'])
 def upload_photos():
     client_id = request.args.get('cid')
@@ -77,33 +195,31 @@ def upload_photos():
 
     if request.method == 'POST':
         files = request.files.getlist('photos')
-        saved_files = []
 
         # Fetch client name and appointment date
         try:
-            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
-            result = cursor.fetchone()
-            if not result:
-                return jsonify({"status": "error", "message": "Client not found"}), 404
-            full_name = result[0]
+            with get_connection(DB_PATH) as conn:
+                cursor = conn.cursor()
 
-            cursor.execute("SELECT date, type FROM appointments WHERE id = ?", (appointment_id,))
-            result = cursor.fetchone()
-            if not result:
-                return jsonify({"status": "error", "message": "Appointment not found"}), 404
-            raw_date, appt_type = result
+                cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
+                result = cursor.fetchone()
+                if not result:
+                    return jsonify({"status": "error", "message": "Client not found"}), 404
+                full_name = result[0]
 
-            conn.close()
+                cursor.execute("SELECT date, type FROM appointments WHERE id = ?", (appointment_id,))
+                result = cursor.fetchone()
+                if not result:
+                    return jsonify({"status": "error", "message": "Appointment not found"}), 404
+                raw_date, appt_type = result
 
         except Exception as e:
             return jsonify({"status": "error", "message": f"Database error: {e}"}), 500
 
-        # Format folder names
+        # Format folder names (folders keep the MM-DD-YYYY display convention; the DB stores ISO)
         safe_name = "".join(c if c.isalnum() or c in " _-" else "_" for c in full_name).replace(" ", "_")
-        formatted_date = raw_date.replace("/", "-")
+        display_date = to_display_date(raw_date)
+        formatted_date = display_date.replace("/", "-")
 
         # Create upload directory
         target_dir = os.path.join(
@@ -113,104 +229,54 @@ def upload_photos():
         )
         os.makedirs(target_dir, exist_ok=True)
 
-        successful_upload = False
-
-        for file in files:
-            if not file:
-                continue
-
-            filename = secure_filename(file.filename)
-            save_path = os.path.join(target_dir, filename)
-
-            # Ensure unique filename
-            counter = 1
-            while os.path.exists(save_path):
-                name, ext = os.path.splitext(filename)
-                save_path = os.path.join(target_dir, f"{name}_{counter}{ext}")
-                counter += 1
+        # Save each upload unchanged under its final name; thumbnails are
+        # rendered by the worker pool after the phone gets its response
+        files = [file for file in files if file and file.filename]
+        filenames = [secure_filename(file.filename) or "photo.jpg" for file in files]
+        saved_files = []
 
+        for file, save_path in zip(files, unique_destinations(filenames, target_dir)):
             try:
-                # Save original file
-                file.save(save_path)
-
-                # Open with PIL and check for EXIF orientation
-                try:
-                    image = Image.open(save_path)
-                    for orientation in ExifTags.TAGS.keys():
-                        if ExifTags.TAGS[orientation] == 'Orientation':
-                            break
-
-                    exif = image._getexif()
-                    if exif is not None:
-                        orientation_value = exif.get(orientation, None)
-                        if orientation_value == 3:
-                            image = image.rotate(180, expand=True)
-                        elif orientation_value == 6:
-                            image = image.rotate(270, expand=True)
-                        elif orientation_value == 8:
-                            image = image.rotate(90, expand=True)
-                        image.save(save_path)
-                        print(f"Orientation fixed for: {save_path}")
-                    else:
-                        print(f"ℹ No EXIF orientation found for: {save_path}")
-                except Exception as e:
-                    print(f"Could not fix orientation for {filename}: {e}")
-
-                # Insert into DB
-                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO photos (client_id, appointment_id, appt_date, file_path, type)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (client_id, appointment_id, raw_date, save_path, appt_type))
-                conn.commit()
-                conn.close()
-
-                # Mark as successful only if everything worked
-                saved_files.append(save_path)
-                successful_upload = True
-                print(f"Photo saved and logged: {save_path}")
-
+                saved_files.append(store_upload_unique(file, save_path))  # Names can race with other requests
             except Exception as e:
-                print(f"Failed to process photo {filename}: {e}")
+                print(f"Failed to save photo {file.filename}: {e}")
 
-        # Update appointment flag
-        if successful_upload:
+        if saved_files:
+            # Log the photos before answering, so a shutdown right after can't lose them
             try:
-                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-                cursor = conn.cursor()
-                cursor.execute("UPDATE appointments SET photos_taken = 'Yes' WHERE id = ?", (appointment_id,))
-                conn.commit()
-                conn.close()
-                print(f"📸 Updated photos_taken = 'Yes' for appointment {appointment_id}")
+                log_uploaded_photos(saved_files, (client_id, appointment_id, raw_date, appt_type))
             except Exception as e:
-                print(f"Failed to update photos_taken: {e}")
+                print(f"Failed to log uploaded photos: {e}")
+                for save_path in saved_files:
+                    os.remove(save_path)  # Unlogged files would never show up; the phone can retry
+                return jsonify({"status": "error", "message": f"Database error: {e}"}), 500
+
+            UploadBatch(saved_files, client_id, appointment_id).start()
+            print(f"Saved {len(saved_files)} photo(s) to {target_dir}; rendering thumbnails in the background.")
 
         return render_template(
             'upload_success.html',
             uploaded=len(saved_files),
             full_name=full_name,
-            appointment_date=raw_date,
+            appointment_date=display_date,
             appt_type=appt_type
         )
 
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
-        result = cursor.fetchone()
-        if not result:
-            return "Client not found", 404
-        full_name = result[0]
+        with get_connection(DB_PATH) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT date, type FROM appointments WHERE id = ?", (appointment_id,))
-        result = cursor.fetchone()
-        if not result:
-            return "Appointment not found", 404
-        appointment_date, appt_type = result
+            cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
+            result = cursor.fetchone()
+            if not result:
+                return "Client not found", 404
+            full_name = result[0]
 
-        conn.close()
+            cursor.execute("SELECT date, type FROM appointments WHERE id = ?", (appointment_id,))
+            result = cursor.fetchone()
+            if not result:
+                return "Appointment not found", 404
+            appointment_date, appt_type = result
 
     except Exception as e:
         return f"Database error: {e}", 500
@@ -218,7 +284,7 @@ def upload_photos():
     return render_template(
         'upload.html',
         full_name=full_name,
-        appointment_date=appointment_date,
+        appointment_date=to_display_date(appointment_date),
         appt_type=appt_type
     )
 
@@ -241,52 +307,29 @@ def upload_profile_pic():
 
         # Get client name
         try:
-            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-            cursor = conn.cursor()
-            cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
-            result = cursor.fetchone()
-            if not result:
-                return jsonify({"status": "error", "message": "Client not found."}), 404
-            full_name = result[0]
-            conn.close()
+            with get_connection(DB_PATH) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
+                result = cursor.fetchone()
+                if not result:
+                    return jsonify({"status": "error", "message": "Client not found."}), 404
+                full_name = result[0]
         except Exception as e:
             return jsonify({"status": "error", "message": f"DB error: {e}"}), 500
 
-        # Create save path
         safe_name = "".join(c if c.isalnum() or c in " _-" else "_" for c in full_name).replace(" ", "_")
-        filename = f"{safe_name}_id_{client_id}.png"
-        save_path = os.path.join(PROFILE_PIC_DIR, filename)
 
         try:
-            # Save image
-            file.save(save_path)
-
-            # Fix orientation if needed
+            # Save the original bytes, named for their real format (orientation is applied on display)
             try:
-                image = Image.open(save_path)
-                for orientation in ExifTags.TAGS:
-                    if ExifTags.TAGS[orientation] == "Orientation":
-                        break
-                exif = image._getexif()
-                if exif is not None:
-                    orientation_value = exif.get(orientation)
-                    if orientation_value == 3:
-                        image = image.rotate(180, expand=True)
-                    elif orientation_value == 6:
-                        image = image.rotate(270, expand=True)
-                    elif orientation_value == 8:
-                        image = image.rotate(90, expand=True)
-                    image.save(save_path)
-                    print(f"Orientation fixed for: {save_path}")
-            except Exception as e:
-                print(f"Could not fix EXIF orientation: {e}")
+                save_path = save_profile_picture(file, PROFILE_PIC_DIR, f"{safe_name}_id_{client_id}")
+            except ValueError as e:
+                return jsonify({"status": "error", "message": f"Invalid image: {e}"}), 400
 
             # Update database
-            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE clients SET profile_picture = ? WHERE id = ?", (save_path, client_id))
-            conn.commit()
-            conn.close()
+            with get_connection(DB_PATH) as conn:
+                conn.execute("UPDATE clients SET profile_picture = ? WHERE id = ?", (save_path, client_id))
+            event_bus.publish(PROFILE_UPDATED, client_id=int(client_id), file_path=save_path)
 
             return render_template(
                 "upload_success.html",
@@ -300,11 +343,10 @@ def upload_profile_pic():
 
     # For GET request, show upload form
     try:
-        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
-        result = cursor.fetchone()
-        conn.close()
+        with get_connection(DB_PATH) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT full_name FROM clients WHERE id = ?", (client_id,))
+            result = cursor.fetchone()
         if not result:
             return "Client not found", 404
         full_name = result[0]
@@ -319,7 +361,8 @@ def upload_profile_pic():
     )
 
 
-def start_flask_server():
+def start_flask_server(backend=SERVER_BACKEND, threads=SERVER_THREADS, max_upload_mb=MAX_UPLOAD_MB, keep_alive_s=KEEP_ALIVE_S):
+    """Load the SkinProData paths (retrying until the folder is available), then serve() until stopped."""
     global DB_PATH, UPLOAD_BASE_DIR, PROFILE_PIC_DIR
 
     pointer_path = os.path.join(os.path.expanduser("~"), ".skinpro_config_location.json")
@@ -370,8 +413,121 @@ def start_flask_server():
         format="%(asctime)s [%(levelname)s] %(message)s"
     )
 
+    serve(backend, threads, max_upload_mb, keep_alive_s)
+
+
+############################
+### --- WSGI Serving --- ###
+############################
+def serve(backend=SERVER_BACKEND, threads=SERVER_THREADS, max_upload_mb=MAX_UPLOAD_MB, keep_alive_s=KEEP_ALIVE_S):
+    """Serve the app with the chosen backend until stop_flask_server() is called (blocks)."""
+    global _server_stop
+
+    with _server_lock:
+        if _server_stop is not None:
+            print("Upload server is already running.")  # e.g. the upload popup's restart check
+            return
+
+    max_body_bytes = int(max_upload_mb * 1024 * 1024)
+    app.config["MAX_CONTENT_LENGTH"] = max_body_bytes  # Flask answers 413 for larger requests
+
+    if backend != "auto" and backend not in SERVER_BACKENDS:
+        raise ValueError(f"Unknown upload server backend: {backend}")
+
+    names = list(SERVER_BACKENDS) if backend == "auto" else [backend]
+    for name in names:
+        try:
+            run, stop = SERVER_BACKENDS[name](threads, max_body_bytes, keep_alive_s)
+            break
+        except ImportError:
+            print(f"Upload server backend '{name}' is not installed.")
+    else:
+        raise RuntimeError(f"No upload server backend available (tried: {', '.join(names)})")
+
+    with _server_lock:
+        _server_stop = stop
+
     try:
-        logging.info("Starting Flask server on port 8000...")
-        app.run(host="0.0.0.0", port=8000, debug=False, use_reloader=False)
+        logging.info(f"Starting upload server ({name}, {threads} threads) on port {SERVER_PORT}...")
+        print(f"Upload server ({name}) listening on port {SERVER_PORT}")
+        run()
     except Exception as e:
-        logging.error(f"Flask server crashed unexpectedly: {e}")
+        logging.error(f"Upload server crashed unexpectedly: {e}")
+    finally:
+        with _server_lock:
+            _server_stop = None
+
+
+def stop_flask_server(timeout=SHUTDOWN_TIMEOUT_S):
+    """
+    Stop accepting connections, let in-flight requests finish and wait (up to `timeout` seconds)
+    for queued photo post-processing. Safe to call from any thread, and when no server is running.
+    """
+    with _server_lock:
+        stop = _server_stop
+
+    if stop is not None:
+        try:
+            stop()
+        except Exception as e:
+            print(f"Error stopping upload server: {e}")
+
+    with _postprocess_lock:
+        pool = _postprocess_pool
+    if pool is not None:
+        # shutdown() has no timeout of its own: wait for it on a helper thread
+        waiter = threading.Thread(target=pool.shutdown, daemon=True, name="UploadPoolShutdown")
+        waiter.start()
+        waiter.join(timeout)
+        if waiter.is_alive():
+            print("Upload post-processing still running at shutdown.")
+
+
+def make_waitress_server(threads, max_body_bytes, keep_alive_s):
+    from waitress.server import create_server
+
+    server = create_server(
+        app, host=SERVER_HOST, port=SERVER_PORT,
+        threads=threads,
+        max_request_body_size=max_body_bytes,
+        channel_timeout=keep_alive_s,               # Idle keep-alive connections close after this
+        ident="SkinPro",
+    )
+
+    def stop():
+        server.close()                              # Stop listening; run() returns once the loop drains
+        server.task_dispatcher.shutdown(timeout=SHUTDOWN_TIMEOUT_S)
+
+    return server.run, stop
+
+
+def make_cheroot_server(threads, max_body_bytes, keep_alive_s):
+    from cheroot import wsgi
+
+    server = wsgi.Server(
+        (SERVER_HOST, SERVER_PORT), app,
+        numthreads=threads,
+        timeout=keep_alive_s,                       # Socket timeout, which also ends idle keep-alives
+        shutdown_timeout=SHUTDOWN_TIMEOUT_S,
+        server_name="SkinPro",
+    )
+    server.max_request_body_size = max_body_bytes
+
+    return server.start, server.stop
+
+
+def make_dev_server(threads, max_body_bytes, keep_alive_s):
+    """Werkzeug's development server (thread per request; no keep-alive). Fallback when nothing else is installed."""
+    from werkzeug.serving import make_server
+    global _thread_per_request
+
+    _thread_per_request = True
+    server = make_server(SERVER_HOST, SERVER_PORT, app, threaded=True)
+    return server.serve_forever, server.shutdown
+
+
+SERVER_BACKENDS = {
+    "waitress": make_waitress_server,
+    "cheroot": make_cheroot_server,
+    "dev": make_dev_server,
+}
@@ -143,6 +143,10 @@ class DataDirectoryManager:
     def db_path(self):
         return os.path.join(self.data_dir, "skinpro.db")
 
+    @property
+    def thumbnail_store_path(self):
+        return os.path.join(self.data_dir, "thumbnails.db")
+
     @property
     def images_dir(self):
         return os.path.join(self.data_dir, "images")
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+
+# Dates are stored as ISO-8601 (sortable, range-indexable) and shown as MM/DD/YYYY in the UI
+ISO_DATE_FORMAT = "%Y-%m-%d"
+DISPLAY_DATE_FORMAT = "%m/%d/%Y"
+_ACCEPTED_FORMATS = (ISO_DATE_FORMAT, DISPLAY_DATE_FORMAT, "%m-%d-%Y", "%m.%d.%Y")
+
+
+def parse_date(value):
+    """Parse a stored or user-entered date string into a `date`, or None if it can't be parsed."""
+    if not value:
+        return None
+
+    value = str(value).strip()
+    for fmt in _ACCEPTED_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def to_iso_date(value):
+    """Convert a UI date (MM/DD/YYYY) to the ISO storage format. Unparseable values pass through unchanged."""
+    parsed = parse_date(value)
+    return parsed.strftime(ISO_DATE_FORMAT) if parsed else value
+
+
+def to_display_date(value):
+    """Convert a stored ISO date to MM/DD/YYYY for display. Unparseable values pass through unchanged."""
+    parsed = parse_date(value)
+    return parsed.strftime(DISPLAY_DATE_FORMAT) if parsed else value
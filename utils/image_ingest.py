@@ -0,0 +1,94 @@
+import os
+import shutil
+from PIL import Image
+
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024     # Bytes per read when copying an upload to its destination
+
+# Pillow format -> file extension for the formats accepted as photos / profile pictures
+IMAGE_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "MPO": ".jpg",      # Multi-picture JPEG (many phone cameras); readable as a plain JPEG
+    "PNG": ".png",
+    "GIF": ".gif",
+    "BMP": ".bmp",
+    "WEBP": ".webp",
+}
+
+
+def store_upload(upload, save_path):
+    """
+    Save an uploaded file (werkzeug FileStorage, already received by the server) to `save_path`
+    with its bytes unchanged. Raises FileExistsError rather than overwrite.
+    """
+    with open(save_path, "xb") as out:  # "x": never overwrite a name another request just took
+        try:
+            upload.save(out, UPLOAD_CHUNK_SIZE)
+        except Exception:
+            out.close()
+            os.remove(save_path)  # Don't leave a partial upload behind
+            raise
+
+
+def store_upload_unique(upload, save_path):
+    """
+    store_upload() under `save_path`, or under the next free "name_1.ext", "name_2.ext", ... if
+    another request took that name first (phones name every photo "image.jpg"). Returns the path used.
+    """
+    folder, filename = os.path.split(save_path)
+    name, ext = os.path.splitext(filename)
+    counter = 1
+    while True:
+        try:
+            store_upload(upload, save_path)  # Nothing is read from the upload when the name is taken
+            return save_path
+        except FileExistsError:
+            save_path = os.path.join(folder, f"{name}_{counter}{ext}")
+            counter += 1
+
+
+def image_extension(file_path):
+    """The extension matching the file's actual image format (".jpg", ".png", ...). Raises ValueError if it isn't one."""
+    try:
+        with Image.open(file_path) as img:  # Reads the header only
+            image_format = img.format
+    except Exception as e:
+        raise ValueError(f"Not a readable image: {e}")
+
+    if image_format not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    return IMAGE_EXTENSIONS[image_format]
+
+
+def save_profile_picture(source, folder, base_name):
+    """
+    Store a profile picture's original bytes as `folder/base_name.<ext>`, the extension matching
+    its real format, and remove the client's previous picture saved under another extension.
+    `source` is a file path or an uploaded file (werkzeug FileStorage). EXIF orientation is left in the file and applied
+    when the picture is displayed (utils/image_utils.py). Returns the saved path.
+    """
+    os.makedirs(folder, exist_ok=True)
+    partial_path = os.path.join(folder, f"{base_name}.part")
+    if os.path.exists(partial_path):
+        os.remove(partial_path)  # Left over from an interrupted upload
+
+    if isinstance(source, (str, os.PathLike)):
+        shutil.copyfile(source, partial_path)
+    else:
+        store_upload(source, partial_path)
+
+    try:
+        extension = image_extension(partial_path)
+    except ValueError:
+        os.remove(partial_path)
+        raise
+
+    save_path = os.path.join(folder, base_name + extension)
+    os.replace(partial_path, save_path)
+
+    for old_extension in set(IMAGE_EXTENSIONS.values()) - {extension}:
+        old_path = os.path.join(folder, base_name + old_extension)
+        if os.path.exists(old_path):
+            os.remove(old_path)
+
+    return save_path
@@ -0,0 +1,131 @@
+import math
+import os
+from PIL import Image
+
+
+# Decode/pre-reduce to at least this multiple of the output size before the final LANCZOS pass
+# (keeps the resampling quality of a full decode while skipping most of the pixels).
+REDUCING_GAP = 2.0
+
+ORIENTATION_TAG = 0x0112    # EXIF "Orientation"
+
+# EXIF orientation -> transpose that turns the stored pixels upright (1, or no tag, is already upright)
+ORIENTATION_TRANSPOSES = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def exif_orientation(img):
+    """EXIF orientation of an opened image (1 when absent or unreadable)."""
+    try:
+        return img.getexif().get(ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+
+
+def upright_size(img):
+    """(width, height) of an opened image once its EXIF orientation is applied."""
+    if exif_orientation(img) in (5, 6, 7, 8):
+        return img.height, img.width  # Stored sideways
+    return img.size
+
+
+def apply_orientation(img, orientation):
+    """Return `img` transposed upright for the given EXIF orientation."""
+    transpose = ORIENTATION_TRANSPOSES.get(orientation)
+    if transpose is None:
+        return img
+    return img.transpose(transpose)
+
+
+def open_upright(file_path):
+    """Fully decode an image with its EXIF orientation applied (uploads keep their original, unrotated bytes)."""
+    with Image.open(file_path) as img:
+        orientation = exif_orientation(img)
+        img.load()
+        return apply_orientation(img, orientation)
+
+
+def decode_reduced(img, min_size):
+    """
+    Decode an opened (not yet loaded) image to upright RGB, at reduced scale when possible.
+    JPEGs use draft mode: the decoder scales by 1/2, 1/4 or 1/8 in the DCT and stops at the
+    smallest scale that still covers `min_size` (upright width, height). Other formats decode in full.
+    EXIF orientation is applied to the decoded pixels, so the file itself never needs rewriting.
+    """
+    orientation = exif_orientation(img)
+    if img.format == "JPEG":
+        if orientation in (5, 6, 7, 8):
+            min_size = (min_size[1], min_size[0])  # draft() works on the stored, sideways pixels
+        img.draft("RGB", (math.ceil(min_size[0]), math.ceil(min_size[1])))
+    return apply_orientation(img.convert("RGB"), orientation)
+
+
+def make_square_thumbnail(file_path, size=(100, 100)):
+    """Center-cropped square thumbnail (Photos tab list). Returns a PIL image, or None if the file is missing."""
+    if not os.path.exists(file_path):
+        print(f"File does not exist: {file_path}")
+        return None
+
+    # The crop keeps the short side, so both sides only need to cover the target after decoding
+    side = max(size) * REDUCING_GAP
+    with Image.open(file_path) as img:
+        img = decode_reduced(img, (side, side))
+
+    return square_thumbnail(img, size)
+
+
+def make_display_image(file_path, box=(300, 400)):
+    """Image scaled to fit inside `box` with its aspect ratio kept (before/after previews). Returns a PIL image."""
+    with Image.open(file_path) as img:
+        width, height = upright_size(img)
+        scale = min(box[0] / width, box[1] / height) * REDUCING_GAP
+        img = decode_reduced(img, (width * scale, height * scale))
+
+    return fit_to_box(img, box)
+
+
+def make_renditions(file_path, thumbnail_size=(100, 100), box=(300, 400)):
+    """
+    Thumbnail and display image from a single reduced decode (ingest renders both at once).
+    Returns (thumbnail, display_image) as PIL images.
+    """
+    with Image.open(file_path) as img:
+        width, height = upright_size(img)
+        # Cover both the fitted display size and the thumbnail's crop (the short side)
+        scale = max(min(box[0] / width, box[1] / height), max(thumbnail_size) / min(width, height)) * REDUCING_GAP
+        img = decode_reduced(img, (width * scale, height * scale))
+
+    thumbnail = square_thumbnail(img, thumbnail_size)  # Works on a cropped copy
+    return thumbnail, fit_to_box(img, box)
+
+
+def square_thumbnail(img, size):
+    """Center-crop a decoded image to a square and scale it to `size`."""
+    width, height = img.size
+    min_side = min(width, height)
+    left = (width - min_side) // 2
+    top = (height - min_side) // 2
+    img = img.crop((left, top, left + min_side, top + min_side))
+
+    # Integer-factor reduce() down to ~2x the target, then LANCZOS
+    img.thumbnail(size, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+    if img.size != tuple(size):
+        img = img.resize(size, Image.LANCZOS)  # Source smaller than the thumbnail (thumbnail() never upscales)
+    return img
+
+
+def fit_to_box(img, box):
+    """Scale a decoded image (in place when shrinking) to fit inside `box`, keeping its aspect ratio."""
+    img.thumbnail(box, Image.LANCZOS, reducing_gap=REDUCING_GAP)
+    if img.width < box[0] and img.height < box[1]:
+        # Source smaller than the box (thumbnail() never upscales): scale up to fit
+        fit = min(box[0] / img.width, box[1] / img.height)
+        img = img.resize((int(img.width * fit), int(img.height * fit)), Image.LANCZOS)
+    return img
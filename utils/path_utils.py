@@ -12,3 +12,24 @@ def resource_path(relative_path):
         # Running in a normal Python environment
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
+
+
+def unique_destinations(file_paths, folder):
+    """
+    Pick a free name in `folder` for every source file ("name.jpg", "name_1.jpg", ...).
+    One directory listing replaces an os.path.exists() probe per candidate name, and names
+    picked for earlier files in the same batch count as taken.
+    """
+    taken = {name.lower() for name in os.listdir(folder)}  # Lower-case: Windows names are case-insensitive
+    destinations = []
+    for file_path in file_paths:
+        filename = os.path.basename(file_path)
+        name, ext = os.path.splitext(filename)
+        candidate = filename
+        counter = 1
+        while candidate.lower() in taken:
+            candidate = f"{name}_{counter}{ext}"
+            counter += 1
+        taken.add(candidate.lower())
+        destinations.append(os.path.join(folder, candidate))
+    return destinations
@@ -0,0 +1,85 @@
+import sys
+import threading
+import time
+
+
+# perf_counter() when this module was first imported. main.py imports it before anything else,
+# so this is as close to process launch as Python code can measure (interpreter start-up excluded).
+PROCESS_START = time.perf_counter()
+
+_marks = []
+_imports = []                       # (self_s, cumulative_s, depth, module) in completion order
+_import_stack = threading.local()   # Per thread: child-time accumulators of the imports in progress
+
+
+def mark(label):
+    """Record a startup milestone; returns seconds since PROCESS_START."""
+    elapsed = time.perf_counter() - PROCESS_START
+    _marks.append((label, elapsed))
+    return elapsed
+
+
+def enable_import_profile():
+    """
+    Time every module load from here on, like `python -X importtime` (which a frozen .exe can't be given).
+    Must run before the imports to be measured; report() then dumps the timings.
+    """
+    import builtins
+    original_import = builtins.__import__
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)  # Already loaded: nothing to time
+
+        if not hasattr(_import_stack, "frames"):
+            _import_stack.frames = []
+        stack = _import_stack.frames
+        stack.append(0.0)
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            if len(sys.modules) > modules_before:
+                _imports.append((cumulative - children, cumulative, len(stack), _absolute_name(name, globals, fromlist, level)))
+
+    builtins.__import__ = timed_import
+
+
+def _absolute_name(name, globals, fromlist, level):
+    """Resolve a relative import (`from . import x`, `from .y import x`) against the importing module's package."""
+    if not level:
+        return name
+    package = (globals or {}).get("__package__") or ""
+    base = package.rsplit(".", level - 1)[0] if level > 1 else package
+    if name:
+        return f"{base}.{name}"
+    return ", ".join(f"{base}.{item}" for item in fromlist or ()) or base
+
+
+def report():
+    """Print every milestone with the time since the previous one (plus import timings if profiling)."""
+    print("Startup timing:")
+    previous = 0.0
+    for label, elapsed in _marks:
+        print(f"  {elapsed:7.3f}s  (+{elapsed - previous:6.3f}s)  {label}")
+        previous = elapsed
+
+    if _imports:
+        report_imports()
+
+
+def report_imports(top=20):
+    """Dump the recorded imports in `-X importtime` format to stderr, then the slowest top-level ones."""
+    print("import time: self [us] | cumulative | imported package", file=sys.stderr)
+    for self_s, cumulative_s, depth, module in _imports:
+        print(f"import time: {self_s * 1e6:9.0f} | {cumulative_s * 1e6:10.0f} | {'  ' * depth}{module}", file=sys.stderr)
+
+    print(f"Slowest top-level imports ({len(_imports)} recorded):")
+    top_level = sorted((entry for entry in _imports if entry[2] == 0), key=lambda entry: entry[1], reverse=True)
+    for _, cumulative_s, _, module in top_level[:top]:
+        print(f"  {cumulative_s * 1000:8.1f} ms  {module}")